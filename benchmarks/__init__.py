@@ -0,0 +1,7 @@
+"""Benchmarks for the hot paths, run by hand rather than by CI.
+
+Each module is a script. Run it from the repository root, in the development
+environment scripts/setup creates, for example::
+
+    python -m benchmarks.parse_loop_blocking
+"""
@@ -0,0 +1,169 @@
+"""How long classifying a moment takes, before and after.
+
+The previous implementation branched on the hour and re-derived the season,
+building two dates, whenever the hour needed it. It is kept here verbatim as
+the baseline. The current one reads the peak from a compiled hourly table,
+looking up the holiday and season only for hours that depend on them. The
+speed-up is that of active_peak, one moment at a time, over the baseline.
+active_peaks, which resolves each date once for every moment on it, is timed
+alongside.
+
+Moments cover a whole year every 15 minutes, against Ontario's real holidays.
+Both must agree on every one of them before any time is reported.
+"""
+
+from collections.abc import Container
+from datetime import UTC, date, datetime, timedelta
+import time
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
+
+from custom_components.ontario_energy_board.const import (
+    SECTOR_ELECTRICITY,
+    STATE_MID_PEAK,
+    STATE_OFF_PEAK,
+    STATE_ON_PEAK,
+    STATE_ULO_MID_PEAK,
+    STATE_ULO_OFF_PEAK,
+    STATE_ULO_ON_PEAK,
+    STATE_ULO_OVERNIGHT,
+)
+from custom_components.ontario_energy_board.peaks import (
+    SUMMER_FIRST_DAY,
+    SUMMER_FIRST_MONTH,
+    SUMMER_LAST_DAY,
+    SUMMER_LAST_MONTH,
+    active_peak,
+    active_peaks,
+)
+
+ONTARIO = ZoneInfo("America/Toronto")
+YEAR = 2024
+STEP = timedelta(minutes=15)
+
+
+def is_summer(moment: datetime) -> bool:
+    day = moment.date()
+
+    return (
+        date(day.year, SUMMER_FIRST_MONTH, SUMMER_FIRST_DAY)
+        <= day
+        <= date(day.year, SUMMER_LAST_MONTH, SUMMER_LAST_DAY)
+    )
+
+
+def is_off_peak_day(moment: datetime, holidays: Container[date]) -> bool:
+    return moment.weekday() >= 5 or moment.date() in holidays
+
+
+def tou_active_peak(moment: datetime, holidays: Container[date]) -> str:
+    if is_off_peak_day(moment, holidays):
+        return STATE_OFF_PEAK
+
+    hour = moment.hour
+
+    if (7 <= hour < 11) or (17 <= hour < 19):
+        return STATE_MID_PEAK if is_summer(moment) else STATE_ON_PEAK
+    if 11 <= hour < 17:
+        return STATE_ON_PEAK if is_summer(moment) else STATE_MID_PEAK
+
+    return STATE_OFF_PEAK
+
+
+def ulo_active_peak(moment: datetime, holidays: Container[date]) -> str:
+    hour = moment.hour
+
+    if hour < 7 or hour >= 23:
+        return STATE_ULO_OVERNIGHT
+
+    if is_off_peak_day(moment, holidays):
+        return STATE_ULO_OFF_PEAK
+
+    if 16 <= hour < 21:
+        return STATE_ULO_ON_PEAK
+
+    return STATE_ULO_MID_PEAK
+
+
+def branching_active_peak(
+    moment: datetime, holidays: Container[date], *, ulo_enabled: bool
+) -> str:
+    """The classification active_peak used to do, for electricity."""
+    if ulo_enabled:
+        return ulo_active_peak(moment, holidays)
+
+    return tou_active_peak(moment, holidays)
+
+
+def moments() -> list[datetime]:
+    """Every 15 minutes of the year, as Ontario-local moments."""
+    moment = datetime(YEAR, 1, 1, tzinfo=ONTARIO).astimezone(UTC)
+    end = datetime(YEAR + 1, 1, 1, tzinfo=ONTARIO).astimezone(UTC)
+    result = []
+
+    while moment < end:
+        result.append(moment.astimezone(ONTARIO))
+        moment += STEP
+
+    return result
+
+
+def main() -> None:
+    holidays = country_holidays(
+        "CA",
+        subdiv="ON",
+        years=YEAR,
+        observed=True,
+        categories={"public", "optional"},
+    )
+    year = moments()
+
+    print(f"{len(year)} moments across {YEAR}")
+    print(f"{'plan':<8}{'branching':>14}{'table':>14}{'by date':>14}{'speed-up':>11}")
+
+    for plan, ulo_enabled in (("TOU", False), ("ULO", True)):
+        start = time.perf_counter()
+        expected = [
+            branching_active_peak(moment, holidays, ulo_enabled=ulo_enabled)
+            for moment in year
+        ]
+        branching_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [
+            active_peak(
+                moment,
+                holidays,
+                energy_sector=SECTOR_ELECTRICITY,
+                ulo_enabled=ulo_enabled,
+            )
+            for moment in year
+        ]
+        table_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk = active_peaks(
+            year,
+            holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=ulo_enabled,
+        )
+        bulk_time = time.perf_counter() - start
+
+        for moment, want, got, got_bulk in zip(
+            year, expected, actual, bulk, strict=True
+        ):
+            assert want == got == got_bulk, f"{plan} {moment}: {want} != {got}"
+
+        per_call = 1e6 / len(year)
+        print(
+            f"{plan:<8}{branching_time * per_call:>11.2f} us"
+            f"{table_time * per_call:>11.2f} us"
+            f"{bulk_time * per_call:>11.2f} us"
+            f"{branching_time / table_time:>10.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""How long pricing a million intervals takes, per interval and in bulk.
+
+A cost study prices years of 15-minute interval data, each interval at its
+period's all-in rate. Done per interval, that is a datetime, an active_peak and
+a marginal_rate for each one. ElectricityRates.price_intervals does the same
+as array arithmetic: classify_peaks once over the whole span, then a lookup of
+each period's rate and a multiply.
+
+The intervals are a million quarter hours from 2000 on, about 28 and a half
+years with every daylight saving change and real holiday in them, against a
+company from the captured document. Both must price every interval alike, to
+within rounding, before any time is reported.
+"""
+
+from datetime import datetime
+from pathlib import Path
+import time
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
+import numpy as np
+
+from custom_components.ontario_energy_board.billing import (
+    ElectricityRates,
+    marginal_rate,
+)
+from custom_components.ontario_energy_board.common import parse_rates_document
+from custom_components.ontario_energy_board.const import (
+    PEAK_KEY_MAPPINGS,
+    SECTOR_ELECTRICITY,
+)
+from custom_components.ontario_energy_board.peaks import active_peak
+
+ONTARIO = ZoneInfo("America/Toronto")
+INTERVALS = 1_000_000
+START = datetime(2000, 1, 1, tzinfo=ONTARIO)
+DOCUMENT = Path(__file__).parent.parent / "tests" / "fixtures" / "BillData.xml"
+COMPANY = "Alectra Utilities Corporation-Brampton Rate Zone (RESIDENTIAL) [Electricity]"
+ROUNDS = 5
+
+
+def per_interval(company_data, holidays, instants, kwh) -> list[float]:
+    """Each interval classified and priced on its own."""
+    return [
+        used
+        * marginal_rate(
+            company_data,
+            company_data[
+                PEAK_KEY_MAPPINGS[
+                    active_peak(
+                        datetime.fromtimestamp(instant, ONTARIO),
+                        holidays,
+                        energy_sector=SECTOR_ELECTRICITY,
+                        ulo_enabled=False,
+                    )
+                ]
+            ],
+        )
+        for instant, used in zip(instants, kwh, strict=True)
+    ]
+
+
+def in_bulk(rates: ElectricityRates, holidays, instants, kwh) -> np.ndarray:
+    """Every interval classified and priced at once."""
+    return rates.price_intervals(
+        instants, kwh, holidays, zone=ONTARIO, ulo_enabled=False
+    ).costs
+
+
+def main() -> None:
+    company_data = parse_rates_document(SECTOR_ELECTRICITY, DOCUMENT.read_bytes()).get(
+        COMPANY
+    )
+    rates = ElectricityRates.from_company_data(company_data)
+    start = int(START.timestamp())
+    instants = np.arange(start, start + INTERVALS * 15 * 60, 15 * 60)
+    kwh = np.random.default_rng(0).gamma(2.0, 0.1, INTERVALS)
+    holidays = frozenset(
+        country_holidays(
+            "CA",
+            subdiv="ON",
+            years=range(START.year, START.year + 30),
+            observed=True,
+            categories={"public", "optional"},
+        )
+    )
+
+    began = time.perf_counter()
+    expected = per_interval(company_data, holidays, instants.tolist(), kwh.tolist())
+    scalar = time.perf_counter() - began
+
+    assert np.allclose(
+        in_bulk(rates, holidays, instants, kwh), expected, rtol=1e-12, atol=0
+    )
+
+    began = time.perf_counter()
+    for _ in range(ROUNDS):
+        in_bulk(rates, holidays, instants, kwh)
+    bulk = (time.perf_counter() - began) / ROUNDS
+
+    print(f"{INTERVALS:,} quarter-hour intervals from {START.date()}")
+    print(f"{'per interval':>14}{'in bulk':>12}{'speed-up':>11}")
+    print(f"{scalar * 1e3:>11.0f} ms{bulk * 1e3:>9.1f} ms{scalar / bulk:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""How long finding the next peak change takes, before and after.
+
+The previous implementation probed each following hour boundary in turn, up to
+eight days ahead, converting through UTC and re-deriving the peak at every one.
+It is kept here verbatim as the baseline. The current one walks each day's
+schedule instead and passes over whole off-peak days in one step.
+
+Start times cover a whole year every 15 minutes, against Ontario's real
+holidays, so long weekends and the Christmas run are all included. Both must
+agree on every one of them before any time is reported.
+"""
+
+from collections.abc import Container
+from datetime import UTC, date, datetime, timedelta
+import time
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
+
+from custom_components.ontario_energy_board.const import SECTOR_ELECTRICITY
+from custom_components.ontario_energy_board.peaks import (
+    active_peak,
+    next_peak_change,
+)
+
+ONTARIO = ZoneInfo("America/Toronto")
+YEAR = 2024
+STEP = timedelta(minutes=15)
+MAX_LOOKAHEAD_HOURS = 8 * 24
+
+
+def probe_next_peak_change(
+    moment: datetime, holidays: Container[date], *, ulo_enabled: bool
+) -> tuple[datetime, str] | None:
+    """The hour-by-hour search next_peak_change used to do."""
+    current = active_peak(
+        moment, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=ulo_enabled
+    )
+    probe = moment.replace(minute=0, second=0, microsecond=0)
+
+    for _ in range(MAX_LOOKAHEAD_HOURS):
+        probe = (probe.astimezone(UTC) + timedelta(hours=1)).astimezone(ONTARIO)
+        upcoming = active_peak(
+            probe, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=ulo_enabled
+        )
+
+        if upcoming != current:
+            return probe, upcoming
+
+    return None
+
+
+def start_times() -> list[datetime]:
+    """Every 15 minutes of the year, as Ontario-local moments."""
+    moment = datetime(YEAR, 1, 1, tzinfo=ONTARIO).astimezone(UTC)
+    end = datetime(YEAR + 1, 1, 1, tzinfo=ONTARIO).astimezone(UTC)
+    moments = []
+
+    while moment < end:
+        moments.append(moment.astimezone(ONTARIO))
+        moment += STEP
+
+    return moments
+
+
+def main() -> None:
+    holidays = country_holidays(
+        "CA",
+        subdiv="ON",
+        years=(YEAR, YEAR + 1),
+        observed=True,
+        categories={"public", "optional"},
+    )
+    moments = start_times()
+
+    print(f"{len(moments)} start times across {YEAR}")
+    print(f"{'plan':<8}{'probe':>14}{'schedule':>14}{'speed-up':>11}")
+
+    for plan, ulo_enabled in (("TOU", False), ("ULO", True)):
+        timings = {}
+
+        for label, find in (
+            (
+                "probe",
+                lambda moment, ulo_enabled=ulo_enabled: probe_next_peak_change(
+                    moment, holidays, ulo_enabled=ulo_enabled
+                ),
+            ),
+            (
+                "schedule",
+                lambda moment, ulo_enabled=ulo_enabled: next_peak_change(
+                    moment,
+                    holidays,
+                    energy_sector=SECTOR_ELECTRICITY,
+                    ulo_enabled=ulo_enabled,
+                ),
+            ),
+        ):
+            start = time.perf_counter()
+            results = [find(moment) for moment in moments]
+            timings[label] = (time.perf_counter() - start, results)
+
+        probe_time, expected = timings["probe"]
+        schedule_time, actual = timings["schedule"]
+
+        for moment, want, got in zip(moments, expected, actual, strict=True):
+            assert want == got, f"{plan} {moment}: {want} != {got}"
+
+        per_call = 1e6 / len(moments)
+        print(
+            f"{plan:<8}{probe_time * per_call:>11.1f} us"
+            f"{schedule_time * per_call:>11.1f} us"
+            f"{probe_time / schedule_time:>10.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""How long parsing a rates document holds up the event loop.
+
+The bundled fixtures are trimmed to a handful of companies, so they are scaled
+up by repeating their rows under distinct names until they are the size of the
+live documents and beyond. Each is then parsed the way the coordinator used to,
+twice and inline on the loop, and the way it does now, once in the executor.
+
+A heartbeat task ticking every millisecond measures the longest the loop went
+without running it, which is what Home Assistant's stall warning sees.
+"""
+
+import asyncio
+from pathlib import Path
+import re
+import time
+
+from custom_components.ontario_energy_board.common import (
+    get_energy_sector_metadata,
+    parse_energy_companies,
+    parse_energy_company_data,
+    parse_rates_document,
+)
+from custom_components.ontario_energy_board.const import (
+    SECTOR_ELECTRICITY,
+    SECTOR_NATURAL_GAS,
+)
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+DOCUMENTS = {SECTOR_ELECTRICITY: "BillData.xml", SECTOR_NATURAL_GAS: "GasBillData.xml"}
+SCALES = (1, 50, 250, 1000)
+HEARTBEAT = 0.001
+
+
+def scaled_document(sector: str, copies: int) -> str:
+    """The fixture with every row repeated, each copy under its own name."""
+    root = get_energy_sector_metadata(sector)["xml_root_element"]
+    content = (FIXTURES / DOCUMENTS[sector]).read_text(encoding="utf-8")
+    rows = re.findall(rf"<{root}>.*?</{root}>", content, flags=re.DOTALL)
+    head = content[: content.index(f"<{root}>")]
+    tail = content[content.rindex(f"</{root}>") + len(f"</{root}>") :]
+
+    copied = [
+        re.sub(r"<Dist>(.*?)</Dist>", rf"<Dist>\1 {copy}</Dist>", row)
+        for copy in range(copies)
+        for row in rows
+    ]
+
+    return head + "".join(copied) + tail
+
+
+async def longest_stall(work) -> tuple[float, float]:
+    """Run ``work`` alongside a heartbeat; return (longest gap, elapsed)."""
+    longest = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal longest
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(HEARTBEAT)
+            now = time.perf_counter()
+            longest = max(longest, now - last - HEARTBEAT)
+            last = now
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(HEARTBEAT * 5)
+
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    await ticker
+
+    return longest, elapsed
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+
+    print(f"{'document':<28}{'rows':>7}{'inline stall':>15}{'executor stall':>17}")
+
+    for sector in DOCUMENTS:
+        for copies in SCALES:
+            content = scaled_document(sector, copies)
+            companies = parse_energy_companies(sector, content)
+            wanted = companies[len(companies) // 2]
+
+            async def inline(content=content, wanted=wanted, sector=sector) -> None:
+                # What the coordinator did before: a parse for the record and,
+                # when it was missing, a second one for the list.
+                parse_energy_company_data(sector, content, wanted)
+                parse_energy_companies(sector, content)
+
+            async def executor(content=content, sector=sector) -> None:
+                await loop.run_in_executor(None, parse_rates_document, sector, content)
+
+            before, _ = await longest_stall(inline)
+            after, _ = await longest_stall(executor)
+
+            label = f"{DOCUMENTS[sector]} x{copies}"
+            print(
+                f"{label:<28}{len(companies):>7}"
+                f"{before * 1000:>12.2f} ms{after * 1000:>14.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
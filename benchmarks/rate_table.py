@@ -0,0 +1,133 @@
+"""How long pricing a year of clock-driven renders takes, before and after.
+
+Every peak change re-renders the current and next rates, commodity and all-in.
+These used to be worked out from the company's record on each render: the
+field looked up by peak, then marginal_rate re-reading and re-summing ten
+fields. Now the sums are made once per daily refresh, as an ElectricityRates
+table, and a render is a lookup by peak.
+
+Renders are those of a Time-of-Use entry through 2024, with Ontario's real
+holidays, against a company from the captured document. Building the table
+happens once per refresh rather than per render, so it is timed on its own.
+Both must price every render alike, to within rounding, before any time is
+reported.
+"""
+
+from datetime import datetime
+from pathlib import Path
+import time
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
+import pytest
+
+from custom_components.ontario_energy_board.billing import (
+    ElectricityRates,
+    marginal_rate,
+)
+from custom_components.ontario_energy_board.common import parse_rates_document
+from custom_components.ontario_energy_board.const import (
+    PEAK_KEY_MAPPINGS,
+    SECTOR_ELECTRICITY,
+)
+from custom_components.ontario_energy_board.peaks import active_peak, next_peak_change
+
+ONTARIO = ZoneInfo("America/Toronto")
+YEAR = 2024
+DOCUMENT = Path(__file__).parent.parent / "tests" / "fixtures" / "BillData.xml"
+COMPANY = "Alectra Utilities Corporation-Brampton Rate Zone (RESIDENTIAL) [Electricity]"
+ROUNDS = 20
+
+
+def renders(holidays) -> list[tuple[str, str]]:
+    """The active and next peak at every peak change through the year."""
+    moment = datetime(YEAR, 1, 1, tzinfo=ONTARIO)
+    end = datetime(YEAR + 1, 1, 1, tzinfo=ONTARIO)
+    result = []
+
+    while moment < end:
+        peak = active_peak(
+            moment, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=False
+        )
+        change = next_peak_change(
+            moment, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=False
+        )
+        assert change is not None
+        result.append((peak, change[1]))
+        moment = change[0]
+
+    return result
+
+
+def from_record(company_data, peaks_at) -> list[tuple]:
+    """The old render: each rate read and summed from the record."""
+    result = []
+
+    for peak, next_peak in peaks_at:
+        current = company_data.get(PEAK_KEY_MAPPINGS[peak])
+        following = company_data.get(PEAK_KEY_MAPPINGS[next_peak])
+        result.append(
+            (
+                current,
+                marginal_rate(company_data, current),
+                following,
+                marginal_rate(company_data, following),
+            )
+        )
+
+    return result
+
+
+def from_table(rates: ElectricityRates, peaks_at) -> list[tuple]:
+    """The current render: lookups in the refresh's table."""
+    commodity, all_in = rates.commodity_rates, rates.all_in_rates
+
+    return [
+        (commodity[peak], all_in[peak], commodity[next_peak], all_in[next_peak])
+        for peak, next_peak in peaks_at
+    ]
+
+
+def main() -> None:
+    company_data = parse_rates_document(SECTOR_ELECTRICITY, DOCUMENT.read_bytes()).get(
+        COMPANY
+    )
+    holidays = country_holidays(
+        "CA", subdiv="ON", years=YEAR, observed=True, categories={"public", "optional"}
+    )
+    peaks_at = renders(holidays)
+
+    rates = ElectricityRates.from_company_data(company_data)
+
+    for before, after in zip(
+        from_record(company_data, peaks_at),
+        from_table(rates, peaks_at),
+        strict=True,
+    ):
+        assert before == pytest.approx(after, rel=1e-12), (before, after)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        from_record(company_data, peaks_at)
+    record = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        from_table(rates, peaks_at)
+    table = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        ElectricityRates.from_company_data(company_data)
+    build = (time.perf_counter() - start) / ROUNDS
+
+    print(f"{len(peaks_at)} peak changes in {YEAR}, four rates rendered at each")
+    print(f"{'record':>12}{'table':>12}{'speed-up':>11}{'table build':>15}")
+    print(
+        f"{record * 1e3:>9.2f} ms{table * 1e3:>9.2f} ms"
+        f"{record / table:>10.1f}x{build * 1e6:>12.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
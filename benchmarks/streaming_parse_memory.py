@@ -0,0 +1,83 @@
+"""How much memory parsing a rates document takes beyond what it keeps.
+
+Compares the whole-document parse the fetch used to do, decoding the body to a
+string and building a tree from it, with the streaming parse it does now, which
+is fed the body a chunk at a time as it arrives. Both keep the same parsed
+companies, so what differs is the peak above that: the transient cost of the
+parse itself.
+"""
+
+import tracemalloc
+
+import defusedxml.ElementTree as ET
+
+from custom_components.ontario_energy_board.common import (
+    RATES_DOCUMENT_CHUNK_SIZE,
+    RatesDocumentParser,
+    _company_record,
+    format_company_name,
+    get_energy_sector_metadata,
+)
+
+from .parse_loop_blocking import DOCUMENTS, SCALES, scaled_document
+
+
+def buffered(sector: str, body: bytes) -> dict:
+    """The old fetch: the body decoded whole, then a full tree built from it."""
+    metadata = get_energy_sector_metadata(sector)
+    tree = ET.fromstring(body.decode())
+    companies = {}
+
+    for company in tree.iterfind(metadata["xml_root_element"]):
+        fields = {element.tag: element.text for element in company}
+        name = format_company_name(
+            fields[metadata["name_key"]],
+            fields[metadata["class_key"]],
+            metadata["name"],
+        )
+        companies[name] = _company_record(sector, fields)
+
+    return companies
+
+
+def streamed(sector: str, body: bytes) -> dict:
+    """The current fetch: chunks fed to the parser as they would arrive."""
+    parser = RatesDocumentParser(sector)
+
+    for start in range(0, len(body), RATES_DOCUMENT_CHUNK_SIZE):
+        parser.feed(body[start : start + RATES_DOCUMENT_CHUNK_SIZE])
+
+    return dict(parser.close().companies)
+
+
+def overhead(parse, sector: str, body: bytes) -> int:
+    """Peak allocation during ``parse``, less what its result keeps."""
+    tracemalloc.start()
+    result = parse(sector, body)
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return peak - kept
+
+
+def main() -> None:
+    print(f"{'document':<28}{'body':>10}{'buffered':>12}{'streamed':>12}")
+
+    for sector in DOCUMENTS:
+        for copies in SCALES:
+            # The body itself is the network's, not the parse's, so it is made
+            # before tracing starts.
+            body = scaled_document(sector, copies).encode()
+            before = overhead(buffered, sector, body)
+            after = overhead(streamed, sector, body)
+
+            label = f"{DOCUMENTS[sector]} x{copies}"
+            print(
+                f"{label:<28}{len(body) / 1024:>7.0f} KB"
+                f"{before / 1024:>9.0f} KB{after / 1024:>9.0f} KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
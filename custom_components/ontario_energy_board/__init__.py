@@ -1,50 +1,73 @@
 """The Ontario Energy Board component."""
 
-from functools import partial
+from collections.abc import Mapping
 import logging
-from typing import Final
+from typing import Any, Final
 
-from holidays import country_holidays
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er, issue_registry as ir
+from homeassistant.helpers import (
+    config_validation as cv,
+    entity_registry as er,
+    issue_registry as ir,
+)
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import SetupPhases, async_pause_setup
-
-from .const import CONF_ULO_ENABLED, DOMAIN
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_RATE_PLAN,
+    CONF_ULO_ENABLED,
+    DOMAIN,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+)
 from .coordinator import (
     OntarioEnergyBoardDataUpdateCoordinator,
     company_missing_issue_id,
+    snapshot_store,
 )
+from .ontario_holidays import async_get_holiday_calendar
+from .services import async_setup_services
 
 _LOGGER: Final = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services, which serve every entry."""
+    async_setup_services(hass)
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up the Ontario Energy Board component."""
     hass.data.setdefault(DOMAIN, {})
 
-    # Importing `holidays` builds its data tables and is slow enough to block
-    # the event loop, so it is pushed to the import executor. Doing it here
-    # rather than in each platform keeps it to once per config entry.
+    # Building the holidays imports the `holidays` data tables, which is slow
+    # enough to block the event loop, so it happens in the import executor.
+    # The calendar is shared, so only the first entry to set up waits on it.
     with async_pause_setup(hass, SetupPhases.WAIT_IMPORT_PACKAGES):
-        ontario_holidays = await hass.async_add_import_executor_job(
-            partial(
-                country_holidays,
-                "CA",
-                subdiv="ON",
-                observed=True,
-                categories={"public", "optional"},
-            )
+        await async_get_holiday_calendar(hass).async_cover(dt_util.now().date())
+
+    coordinator = OntarioEnergyBoardDataUpdateCoordinator(hass, config_entry)
+
+    if await coordinator.async_restore_snapshot():
+        # The entities come up on the rates saved at the last good refresh, and
+        # the OEB host is asked for newer ones in the background, so a slow or
+        # unreachable host neither holds up setup nor fails it.
+        config_entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} refresh {config_entry.entry_id}",
         )
-
-    coordinator = OntarioEnergyBoardDataUpdateCoordinator(
-        hass, config_entry, ontario_holidays
-    )
-
-    await coordinator.async_config_entry_first_refresh()
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][config_entry.entry_id] = coordinator
 
@@ -77,12 +100,14 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
 
 async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    """Clear any repair raised for an entry that is being removed.
+    """Clear any repair and saved rates for an entry that is being removed.
 
-    Repairs are not tied to a config entry, so one raised for a company that
-    left the document would otherwise outlive the entry it refers to.
+    Neither is tied to a config entry, so a repair raised for a company that
+    left the document, or the rates saved for the next start, would otherwise
+    outlive the entry they refer to.
     """
     ir.async_delete_issue(hass, DOMAIN, company_missing_issue_id(config_entry.entry_id))
+    await snapshot_store(hass, config_entry.entry_id).async_remove()
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -100,6 +125,16 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     if config_entry.version == 2:
         await _async_migrate_to_stable_identity(hass, config_entry)
 
+    if config_entry.version == 3:
+        # Version 3 could only tell Ultra-Low Overnight from Time-of-Use. The
+        # plan is now chosen from a list, which has room for the tiered plan.
+        hass.config_entries.async_update_entry(
+            config_entry,
+            data=_with_rate_plan(config_entry.data),
+            options=_with_rate_plan(config_entry.options),
+            version=4,
+        )
+
     _LOGGER.debug("Migration to version %s successful", config_entry.version)
 
     return True
@@ -139,3 +174,17 @@ async def _async_migrate_to_stable_identity(
     # Duplicates are now detected from the company and rate plan an entry
     # currently holds, which its unique id can no longer speak for.
     hass.config_entries.async_update_entry(config_entry, unique_id=None, version=3)
+
+
+def _with_rate_plan(values: Mapping[str, Any]) -> dict[str, Any]:
+    """Replace the Ultra-Low Overnight switch with the plan it chose, if set."""
+    values = dict(values)
+
+    if CONF_ULO_ENABLED in values:
+        values[CONF_RATE_PLAN] = (
+            RATE_PLAN_ULTRA_LOW_OVERNIGHT
+            if values.pop(CONF_ULO_ENABLED)
+            else RATE_PLAN_TIME_OF_USE
+        )
+
+    return values
@@ -0,0 +1,330 @@
+"""What the last 30 days' electricity would have cost on each rate plan.
+
+Like `billing` and `peaks`, free of Home Assistant imports. The same kWh are
+counted once under each plan that follows the clock, in that plan's periods,
+so Time-of-Use, Ultra-Low Overnight and the tiered plan can be priced side by
+side from one meter.
+
+The window rolls, and is kept as a ring buffer of daily kWh totals for each
+period, with a running sum beside each one. A reading adds to today's slots
+and the sums; a new day subtracts the slots it is about to reuse. Either costs
+the same however much history there is, and the memory never grows.
+
+Hourly history, such as the recorder's long-term statistics, is shared out the
+same way, an hour at a time, and each plan billed in full for it.
+"""
+
+from collections.abc import Container, Iterable, Mapping
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any, Self
+
+from .billing import ElectricityBill, ElectricityRates
+from .const import (
+    RATE_PLAN_KEY_MAPPINGS,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    SECTOR_ELECTRICITY,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
+)
+from .peaks import active_peaks, peak_spans
+
+WINDOW_DAYS = 30
+
+# The plans priced by the clock, and the periods each one splits a day into.
+CLOCK_PLANS = {
+    RATE_PLAN_TIME_OF_USE: tuple(RATE_PLAN_KEY_MAPPINGS[RATE_PLAN_TIME_OF_USE]),
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT: tuple(
+        RATE_PLAN_KEY_MAPPINGS[RATE_PLAN_ULTRA_LOW_OVERNIGHT]
+    ),
+}
+PERIODS = tuple(period for periods in CLOCK_PLANS.values() for period in periods)
+
+
+def split_usage(
+    start: datetime, end: datetime, kwh: float, holidays: Container[date]
+) -> dict[str, float]:
+    """Share kWh used between two readings out to every clock plan's periods.
+
+    As with the energy cost, the kWh are spread evenly over the time between
+    the readings. Each plan's shares add up to ``kwh``.
+    """
+    usage = dict.fromkeys(PERIODS, 0.0)
+
+    for plan in CLOCK_PLANS:
+        spans = peak_spans(
+            start,
+            end,
+            holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=plan == RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        )
+        duration = sum(seconds for _, seconds in spans)
+
+        if not duration:
+            # Two readings at one instant: count the step where it happened.
+            usage[spans[-1][0]] += kwh
+            continue
+
+        for period, seconds in spans:
+            usage[period] += kwh * seconds / duration
+
+    return usage
+
+
+def hourly_usage(
+    hours: Iterable[tuple[datetime, float]], holidays: Container[date]
+) -> dict[str, float]:
+    """Share kWh used hour by hour out to every clock plan's periods.
+
+    ``hours`` are the local moments each hour starts at, with what was used
+    in it. Every period starts and ends on the hour, so a whole hour falls in
+    the period it starts in.
+    """
+    hours = list(hours)
+    usage = dict.fromkeys(PERIODS, 0.0)
+
+    for plan in CLOCK_PLANS:
+        peaks = active_peaks(
+            (start for start, _ in hours),
+            holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=plan == RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        )
+
+        for (_, kwh), peak in zip(hours, peaks, strict=True):
+            usage[peak] += kwh
+
+    return usage
+
+
+class RollingUsage:
+    """kWh per period over the last ``days`` days, ending with ``day``."""
+
+    def __init__(self, days: int = WINDOW_DAYS) -> None:
+        self.days = days
+        # The day the newest slots hold, and the first day anything was added.
+        self.day: date | None = None
+        self.first_day: date | None = None
+        self.totals = dict.fromkeys(PERIODS, 0.0)
+        self._slots = {period: [0.0] * days for period in PERIODS}
+        self._head = 0
+
+    @property
+    def days_covered(self) -> int:
+        """How many days of the window have been counted, up to all of them."""
+        if self.day is None or self.first_day is None:
+            return 0
+
+        return min((self.day - self.first_day).days + 1, self.days)
+
+    def advance(self, day: date) -> date:
+        """Roll the window on to end with ``day``, dropping what falls out.
+
+        Returns the day the window now ends with, which is ``day`` unless the
+        window already ends later.
+        """
+        if self.day is None:
+            self.day = self.first_day = day
+            return day
+
+        steps = (day - self.day).days
+
+        if steps <= 0:
+            return self.day
+
+        if steps >= self.days:
+            # Nothing in the window survives: start it again.
+            self.totals = dict.fromkeys(PERIODS, 0.0)
+            self._slots = {period: [0.0] * self.days for period in PERIODS}
+        else:
+            for _ in range(steps):
+                self._head = (self._head + 1) % self.days
+
+                for period, slots in self._slots.items():
+                    self.totals[period] -= slots[self._head]
+                    slots[self._head] = 0.0
+
+        self.day = day
+
+        return day
+
+    def add(self, day: date, usage: Mapping[str, float]) -> None:
+        """Count kWh used on ``day`` in each period.
+
+        A day older than the window is dropped; one within it, but before the
+        newest, goes to its own day's slots.
+        """
+        newest = self.advance(day)
+
+        if (age := (newest - day).days) >= self.days:
+            return
+
+        slot = (self._head - age) % self.days
+
+        for period, kwh in usage.items():
+            self._slots[period][slot] += kwh
+            self.totals[period] += kwh
+
+    def as_dict(self) -> dict[str, Any]:
+        """The newest day first, then each period's daily totals, newest first."""
+        return {
+            "day": None if self.day is None else self.day.isoformat(),
+            "first_day": None if self.first_day is None else self.first_day.isoformat(),
+            "daily": {
+                period: [
+                    slots[(self._head - age) % self.days] for age in range(self.days)
+                ]
+                for period, slots in self._slots.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, restored: Mapping[str, Any], days: int = WINDOW_DAYS) -> Self:
+        """Read back what as_dict saved. Raises KeyError, TypeError or
+        ValueError if it cannot be.
+        """
+        usage = cls(days)
+
+        if restored["day"] is None:
+            return usage
+
+        usage.day = date.fromisoformat(restored["day"])
+        usage.first_day = date.fromisoformat(restored["first_day"])
+
+        for period, daily in restored["daily"].items():
+            if period not in usage._slots:
+                continue
+
+            # Saved newest first, and laid out again with the newest at 0.
+            slots = [float(kwh) for kwh in daily[:days]]
+            slots += [0.0] * (days - len(slots))
+            usage._slots[period] = [slots[-slot % days] for slot in range(days)]
+            usage.totals[period] = sum(slots)
+
+        return usage
+
+
+@dataclass(frozen=True, slots=True)
+class PlanComparison:
+    """Each plan's all-in cost for the same kWh, fixed charges aside.
+
+    The fixed monthly charges are the same on every plan, so they cannot
+    change which is cheapest. A plan the company publishes no prices for is
+    left out.
+    """
+
+    costs: Mapping[str, float]
+    days: int
+
+    @property
+    def cheapest(self) -> str | None:
+        return min(self.costs, key=self.costs.__getitem__, default=None)
+
+    def savings(self, rate_plan: str) -> float | None:
+        """How much less the cheapest plan would have cost than ``rate_plan``."""
+        if (cheapest := self.cheapest) is None or rate_plan not in self.costs:
+            return None
+
+        return self.costs[rate_plan] - self.costs[cheapest]
+
+
+def compare_plans(
+    rates: ElectricityRates, usage: RollingUsage, moment: datetime
+) -> PlanComparison:
+    """Price the window's kWh on every plan, with the rates as of ``moment``.
+
+    The tiered threshold is monthly; the window stands in for a month, and a
+    window not yet full is allowed its share of the threshold.
+    """
+    all_in_rates = rates.all_in_rates
+    costs: dict[str, float] = {}
+
+    for plan, periods in CLOCK_PLANS.items():
+        if all(period in all_in_rates for period in periods):
+            costs[plan] = sum(
+                max(usage.totals[period], 0.0) * all_in_rates[period]
+                for period in periods
+            )
+
+    threshold = rates.tier_threshold_at(moment)
+    kwh = sum(
+        max(usage.totals[period], 0.0) for period in CLOCK_PLANS[RATE_PLAN_TIME_OF_USE]
+    )
+
+    if threshold is not None and usage.days_covered:
+        tiered = rates.tiered_cost(
+            0.0, kwh, threshold * usage.days_covered / usage.days
+        )
+
+        if tiered is not None:
+            costs[RATE_PLAN_TIERED] = tiered
+
+    return PlanComparison(costs=costs, days=usage.days_covered)
+
+
+@dataclass(frozen=True, slots=True)
+class PlanBill:
+    """One plan's bill: the kWh it charged in each period, and the lines.
+
+    Bills for consecutive stretches add up to the bill for all of them.
+    """
+
+    usage: Mapping[str, float]
+    bill: ElectricityBill
+
+    def __add__(self, other: Self) -> Self:
+        return type(self)(
+            usage={
+                period: self.usage.get(period, 0.0) + other.usage.get(period, 0.0)
+                for period in {**self.usage, **other.usage}
+            },
+            bill=ElectricityBill(
+                **{
+                    field.name: getattr(self.bill, field.name)
+                    + getattr(other.bill, field.name)
+                    for field in fields(ElectricityBill)
+                }
+            ),
+        )
+
+
+def bill_plans(
+    rates: ElectricityRates,
+    usage: Mapping[str, float],
+    *,
+    threshold: float | None,
+    months: float = 1.0,
+) -> dict[str, PlanBill]:
+    """Bill kWh shared out to every clock plan's periods on each plan.
+
+    ``threshold`` is the tiered plan's for the month the kWh were used in, and
+    ``months`` how many months of fixed charges the bills carry, and of the
+    threshold. A plan the company publishes no prices for is left out.
+    """
+    bills: dict[str, PlanBill] = {}
+
+    for plan, periods in CLOCK_PLANS.items():
+        plan_usage = {period: usage[period] for period in periods}
+
+        try:
+            bills[plan] = PlanBill(plan_usage, rates.bill(plan_usage, months=months))
+        except ValueError:
+            continue
+
+    if threshold is not None:
+        kwh = sum(usage[period] for period in CLOCK_PLANS[RATE_PLAN_TIME_OF_USE])
+        lower = min(kwh, threshold * months)
+
+        try:
+            bill = rates.tiered_bill(kwh, threshold=threshold, months=months)
+        except ValueError:
+            pass
+        else:
+            bills[RATE_PLAN_TIERED] = PlanBill(
+                {STATE_LOWER_TIER: lower, STATE_HIGHER_TIER: kwh - lower}, bill
+            )
+
+    return bills
@@ -28,15 +28,40 @@ the calculator rather than by reading the feed:
 
 The global adjustment fields are deliberately unused. PBGA and GA_RR_NONRPP
 apply to customers who are not on the regulated price plan, whose name they
-carry; for the Time-of-Use and Ultra-Low Overnight customers this integration
-serves, the global adjustment is already inside the regulated price.
+carry; for the Time-of-Use, Ultra-Low Overnight and tiered customers this
+integration serves, the global adjustment is already inside the regulated price.
+
+The inputs only change when the rates are refreshed, once a day, so the sums
+that do not depend on usage are worked out once per refresh as an
+ElectricityRates table, and everything priced between refreshes reads from it:
+the per-kWh rates the sensors show, whole bills, line by line, for any number
+of usage profiles, and the cost of every interval in years of interval data.
 """
 
-from collections.abc import Mapping
-from typing import Any
+from collections.abc import Container, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Self
+
+from .const import (
+    PEAK_KEY_MAPPINGS,
+    SECTOR_ELECTRICITY,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
+)
+from .peaks import PEAK_STATES, classify_peaks, is_summer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# The residential tier thresholds, in kWh a month. Only the summer one is
+# published, as ET1.
+RESIDENTIAL_SUMMER_THRESHOLD = 600.0
+RESIDENTIAL_WINTER_THRESHOLD = 1000.0
 
 
-def _number(company_data: Mapping[str, Any], key: str, default: float) -> float:
+def number(company_data: Mapping[str, Any], key: str, default: float) -> float:
     """Read a rate, treating an absent or empty OEB field as its default.
 
     Distributors that do not levy a charge ship an empty element for it.
@@ -46,6 +71,13 @@ def _number(company_data: Mapping[str, Any], key: str, default: float) -> float:
     return float(value) if isinstance(value, (int, float)) else default
 
 
+def optional_number(company_data: Mapping[str, Any], key: str) -> float | None:
+    """Read a field that has no sensible default when it is missing."""
+    value = company_data.get(key)
+
+    return float(value) if isinstance(value, (int, float)) else None
+
+
 def volumetric_rate(company_data: Mapping[str, Any], commodity_rate: float) -> float:
     """Everything charged per kWh at a given commodity price, before tax.
 
@@ -53,19 +85,19 @@ def volumetric_rate(company_data: Mapping[str, Any], commodity_rate: float) -> f
     are billed per month and so cannot be expressed per kWh without knowing
     how much was used.
     """
-    loss_factor = _number(company_data, "loss_factor", 1.0)
+    loss_factor = number(company_data, "loss_factor", 1.0)
 
     per_kwh_on_loss_adjusted = (
-        _number(company_data, "retail_transmission_network_rate", 0.0)
-        + _number(company_data, "retail_transmission_connection_rate", 0.0)
-        + _number(company_data, "wholesale_market_service_charge", 0.0)
-        + _number(company_data, "rural_remote_rate_protection", 0.0)
+        number(company_data, "retail_transmission_network_rate", 0.0)
+        + number(company_data, "retail_transmission_connection_rate", 0.0)
+        + number(company_data, "wholesale_market_service_charge", 0.0)
+        + number(company_data, "rural_remote_rate_protection", 0.0)
     )
 
     return (
         commodity_rate * loss_factor
-        + _number(company_data, "distribution_variable_charge", 0.0)
-        + _number(company_data, "debt_retirement_charge", 0.0)
+        + number(company_data, "distribution_variable_charge", 0.0)
+        + number(company_data, "debt_retirement_charge", 0.0)
         + loss_factor * per_kwh_on_loss_adjusted
     )
 
@@ -78,8 +110,8 @@ def tax_and_rebate_multiplier(company_data: Mapping[str, Any]) -> float:
     """
     return (
         1.0
-        + _number(company_data, "harmonized_sales_tax", 0.0)
-        - _number(company_data, "ontario_electricity_rebate", 0.0)
+        + number(company_data, "harmonized_sales_tax", 0.0)
+        - number(company_data, "ontario_electricity_rebate", 0.0)
     )
 
 
@@ -97,3 +129,293 @@ def marginal_rate(
     return volumetric_rate(company_data, commodity_rate) * tax_and_rebate_multiplier(
         company_data
     )
+
+
+@dataclass(frozen=True, slots=True)
+class ElectricityBill:
+    """A bill's lines, as the OEB calculator itemises them, unrounded."""
+
+    electricity: float
+    delivery: float
+    regulatory: float
+    subtotal: float
+    hst: float
+    rebate: float
+    total: float
+
+
+@dataclass(frozen=True, slots=True)
+class IntervalCosts:
+    """What each interval of interval data cost, and the totals per period.
+
+    ``costs`` is an array the shape of the kWh priced, each interval at its
+    period's all-in rate. ``usage`` and ``period_costs`` are keyed by peak
+    state and hold only the periods the intervals fell in; ``usage`` is what
+    bill takes.
+    """
+
+    costs: "np.ndarray"
+    usage: Mapping[str, float]
+    period_costs: Mapping[str, float]
+
+
+@dataclass(frozen=True, slots=True)
+class ElectricityRates:
+    """One company's electricity rates, summed once and priced per period.
+
+    ``per_kwh`` is everything charged per kWh except the commodity itself,
+    before tax, and ``multiplier`` is tax_and_rebate_multiplier. The commodity
+    and all-in rates are keyed by peak state, and hold only the periods the
+    company publishes a price for.
+    """
+
+    loss_factor: float
+    # Distribution and debt retirement, per kWh as metered.
+    distribution_per_kwh: float
+    # Network and connection, per loss-adjusted kWh.
+    transmission_per_kwh: float
+    # Wholesale market service and rural rate protection, per loss-adjusted kWh.
+    regulatory_per_kwh: float
+    per_kwh: float
+    harmonized_sales_tax: float
+    ontario_electricity_rebate: float
+    multiplier: float
+    monthly_fixed_charge: float
+    standard_supply_service_charge: float
+    commodity_rates: Mapping[str, float]
+    all_in_rates: Mapping[str, float]
+    # The two-tier plan: the lower price up to the threshold, in kWh a month,
+    # and the higher price beyond it.
+    tier_threshold: float | None
+    lower_tier_price: float | None
+    higher_tier_price: float | None
+
+    @classmethod
+    def from_company_data(cls, company_data: Mapping[str, Any]) -> Self:
+        """Read and sum a company's record, as published."""
+        loss_factor = number(company_data, "loss_factor", 1.0)
+        distribution_per_kwh = number(
+            company_data, "distribution_variable_charge", 0.0
+        ) + number(company_data, "debt_retirement_charge", 0.0)
+        transmission_per_kwh = number(
+            company_data, "retail_transmission_network_rate", 0.0
+        ) + number(company_data, "retail_transmission_connection_rate", 0.0)
+        regulatory_per_kwh = number(
+            company_data, "wholesale_market_service_charge", 0.0
+        ) + number(company_data, "rural_remote_rate_protection", 0.0)
+        per_kwh = volumetric_rate(company_data, 0.0)
+        multiplier = tax_and_rebate_multiplier(company_data)
+        commodity_rates = {
+            peak: float(company_data[key])
+            for peak, key in PEAK_KEY_MAPPINGS.items()
+            if isinstance(company_data.get(key), (int, float))
+        }
+
+        return cls(
+            loss_factor=loss_factor,
+            distribution_per_kwh=distribution_per_kwh,
+            transmission_per_kwh=transmission_per_kwh,
+            regulatory_per_kwh=regulatory_per_kwh,
+            per_kwh=per_kwh,
+            harmonized_sales_tax=number(company_data, "harmonized_sales_tax", 0.0),
+            ontario_electricity_rebate=number(
+                company_data, "ontario_electricity_rebate", 0.0
+            ),
+            multiplier=multiplier,
+            monthly_fixed_charge=number(company_data, "monthly_fixed_charge", 0.0),
+            standard_supply_service_charge=number(
+                company_data, "standard_supply_service_charge", 0.0
+            ),
+            commodity_rates=MappingProxyType(commodity_rates),
+            all_in_rates=MappingProxyType(
+                {
+                    peak: (commodity_rate * loss_factor + per_kwh) * multiplier
+                    for peak, commodity_rate in commodity_rates.items()
+                }
+            ),
+            tier_threshold=optional_number(company_data, "tier_threshold"),
+            lower_tier_price=optional_number(company_data, "lower_tier_price"),
+            higher_tier_price=optional_number(company_data, "higher_tier_price"),
+        )
+
+    def marginal_rate(self, commodity_rate: float | None) -> float | None:
+        """marginal_rate, from the table's sums rather than the record."""
+        if commodity_rate is None:
+            return None
+
+        return (commodity_rate * self.loss_factor + self.per_kwh) * self.multiplier
+
+    def bill(
+        self, usage: Mapping[str, float], *, months: float = 1.0
+    ) -> ElectricityBill:
+        """The bill for kWh used in each peak period over a billing period.
+
+        ``usage`` is keyed by peak state, Time-of-Use or Ultra-Low Overnight.
+        ``months`` is how many monthly service and supply charges the period
+        carries. Raises ValueError for a period the company has no price for.
+        """
+        electricity = 0.0
+        kwh = 0.0
+
+        for peak, used in usage.items():
+            if (price := self.commodity_rates.get(peak)) is None:
+                raise ValueError(f"No {peak} price is published for this company")
+
+            electricity += used * price
+            kwh += used
+
+        return self._bill(kwh, electricity, months)
+
+    def tiered_bill(
+        self, kwh: float, *, threshold: float | None = None, months: float = 1.0
+    ) -> ElectricityBill:
+        """The bill for kWh used over a billing period on the two-tier plan.
+
+        ``threshold`` is the kWh per month billed at the lower price, the
+        published one unless given; it scales with ``months``. Raises
+        ValueError if the company publishes no tiered prices.
+        """
+        threshold = self.tier_threshold if threshold is None else threshold
+
+        if (
+            threshold is None
+            or self.lower_tier_price is None
+            or self.higher_tier_price is None
+        ):
+            raise ValueError("No tiered prices are published for this company")
+
+        lower = min(kwh, threshold * months)
+        electricity = (
+            lower * self.lower_tier_price + (kwh - lower) * self.higher_tier_price
+        )
+
+        return self._bill(kwh, electricity, months)
+
+    def tier_threshold_at(self, moment: datetime) -> float | None:
+        """The kWh a month bills at the lower price, for energy used at
+        ``moment``.
+
+        Residential customers, whose published threshold is 600 kWh, are
+        allowed 1,000 kWh a month from November to April. Any other published
+        threshold applies all year.
+        """
+        if self.tier_threshold == RESIDENTIAL_SUMMER_THRESHOLD and not is_summer(
+            moment
+        ):
+            return RESIDENTIAL_WINTER_THRESHOLD
+
+        return self.tier_threshold
+
+    def tier(self, month_kwh: float, threshold: float) -> str:
+        """The tier the next kWh falls in, in a month that has used
+        ``month_kwh``.
+        """
+        return STATE_LOWER_TIER if month_kwh < threshold else STATE_HIGHER_TIER
+
+    def tiered_cost(
+        self, month_kwh: float, kwh: float, threshold: float | None
+    ) -> float | None:
+        """The all-in cost of ``kwh`` more in a month that has used
+        ``month_kwh``, on the two-tier plan, the monthly charges aside.
+
+        What crosses the threshold is split between the two prices. None if
+        either price or the threshold is not published.
+        """
+        lower_rate = self.all_in_rates.get(STATE_LOWER_TIER)
+        higher_rate = self.all_in_rates.get(STATE_HIGHER_TIER)
+
+        if threshold is None or lower_rate is None or higher_rate is None:
+            return None
+
+        lower = min(kwh, max(threshold - month_kwh, 0.0))
+
+        return lower * lower_rate + (kwh - lower) * higher_rate
+
+    def price_intervals(
+        self,
+        instants: Any,
+        kwh: Any,
+        holidays: Container[date],
+        *,
+        zone: tzinfo,
+        ulo_enabled: bool,
+    ) -> IntervalCosts:
+        """Price interval data in bulk, at each interval's all-in rate.
+
+        ``instants`` are the UTC instants the intervals are classified at, as
+        classify_peaks takes them, and ``kwh`` what was used in each, in the
+        same shape. Each interval costs what marginal_rate says of its period's
+        price, so this is the per-interval loop over active_peak and
+        marginal_rate, done as array arithmetic. Raises ValueError if any
+        interval falls in a period the company has no price for.
+
+        NumPy is imported here, as in classify_peaks, so the integration does
+        not depend on it.
+        """
+        import numpy as np
+
+        codes = classify_peaks(
+            instants,
+            holidays,
+            zone=zone,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=ulo_enabled,
+        )
+        kwh = np.asarray(kwh, dtype=np.float64)
+
+        if kwh.shape != codes.shape:
+            raise ValueError(
+                f"{kwh.shape} kWh readings cannot price {codes.shape} intervals"
+            )
+
+        all_in = np.array(
+            [self.all_in_rates.get(peak, np.nan) for peak in PEAK_STATES],
+            dtype=np.float64,
+        )
+        usage = np.bincount(codes.ravel(), kwh.ravel(), minlength=len(PEAK_STATES))
+        periods = np.flatnonzero(np.bincount(codes.ravel(), minlength=len(PEAK_STATES)))
+
+        for code in periods:
+            if np.isnan(all_in[code]):
+                raise ValueError(
+                    f"No {PEAK_STATES[code]} price is published for this company"
+                )
+
+        return IntervalCosts(
+            costs=kwh * all_in[codes],
+            usage=MappingProxyType(
+                {PEAK_STATES[code]: float(usage[code]) for code in periods}
+            ),
+            period_costs=MappingProxyType(
+                {
+                    PEAK_STATES[code]: float(usage[code] * all_in[code])
+                    for code in periods
+                }
+            ),
+        )
+
+    def _bill(self, kwh: float, electricity: float, months: float) -> ElectricityBill:
+        """Itemise a bill from its consumption and what that power cost."""
+        delivery = (
+            self.monthly_fixed_charge * months
+            + (self.loss_factor - 1.0) * electricity
+            + self.distribution_per_kwh * kwh
+            + self.transmission_per_kwh * kwh * self.loss_factor
+        )
+        regulatory = (
+            self.regulatory_per_kwh * kwh * self.loss_factor
+            + self.standard_supply_service_charge * months
+        )
+        subtotal = electricity + delivery + regulatory
+        hst = subtotal * self.harmonized_sales_tax
+        rebate = subtotal * self.ontario_electricity_rebate
+
+        return ElectricityBill(
+            electricity=electricity,
+            delivery=delivery,
+            regulatory=regulatory,
+            subtotal=subtotal,
+            hst=hst,
+            rebate=rebate,
+            total=subtotal + hst - rebate,
+        )
@@ -2,16 +2,23 @@
 
 Fetching and parsing are kept separate on purpose: the ``parse_*`` functions
 take a document as a string and can be tested against the fixtures in
-``tests/fixtures/`` without any network or Home Assistant involvement.
+``tests/fixtures/`` without any network or Home Assistant involvement. The
+fetch feeds the same parser as the response streams in, so a document is never
+held whole.
 """
 
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
 from difflib import get_close_matches
+from http import HTTPStatus
 import re
+from typing import Any
 
 import aiohttp
 import defusedxml.ElementTree as ET
 
 from .const import (
+    CONF_RATE_PLAN,
     CONF_ULO_ENABLED,
     ELECTRICITY_CLASS_KEY,
     ELECTRICITY_NAME_KEY,
@@ -23,6 +30,8 @@ from .const import (
     NATURAL_GAS_RATE_UNIT_OF_MEASURE,
     NATURAL_GAS_RATES_URL,
     NATURAL_GAS_XML_ROOT_ELEMENT,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
     SECTOR_ELECTRICITY,
     XML_KEY_MAPPINGS,
     XML_KEY_MID_PEAK_RATE,
@@ -44,6 +53,16 @@ IGNORED_XML_TAGS = frozenset(
 # as "EPCOR Natural Gas Limited Partnership".
 SECTOR_SUFFIX_PATTERN = re.compile(r"\[(Natural Gas|Electricity)\]$")
 
+# The parts format_company_name joins. Distributor names can carry parentheses
+# of their own, so the rate class is the last parenthesised group.
+COMPANY_NAME_PATTERN = re.compile(
+    r"^(?P<distributor>.*) \((?P<rate_class>[^()]*)\) \[(Natural Gas|Electricity)\]$"
+)
+
+# How much of a response is read, and parsed, at a time. Small enough that a
+# chunk parsed on the event loop does not hold it up noticeably.
+RATES_DOCUMENT_CHUNK_SIZE = 64 * 1024
+
 
 def format_company_name(company_name, rate_class, energy_sector) -> str:
     """Format the company name with rate class and energy sector.
@@ -70,16 +89,30 @@ def company_display_name(company_name: str) -> str:
     return SECTOR_SUFFIX_PATTERN.sub("", company_name).strip()
 
 
-def effective_ulo_enabled(config_entry) -> bool:
-    """Whether the entry is on the Ultra-Low Overnight plan.
+def effective_rate_plan(config_entry) -> str:
+    """The rate plan the entry is billed on.
 
     The plan is chosen during setup and can be corrected afterwards from the
     options, so the option wins where one has been set. Entries created before
     the options existed only carry the setup value.
+
+    An entry is only migrated when it is next set up, and duplicates are judged
+    against every entry, loaded or not, so one still carrying the older
+    Ultra-Low Overnight switch is read by that instead.
     """
-    return config_entry.options.get(
-        CONF_ULO_ENABLED, config_entry.data[CONF_ULO_ENABLED]
-    )
+    for values in (config_entry.options, config_entry.data):
+        if CONF_RATE_PLAN in values:
+            return values[CONF_RATE_PLAN]
+
+        if CONF_ULO_ENABLED in values:
+            return (
+                RATE_PLAN_ULTRA_LOW_OVERNIGHT
+                if values[CONF_ULO_ENABLED]
+                else RATE_PLAN_TIME_OF_USE
+            )
+
+    # Version 1 predates any choice of plan.
+    return RATE_PLAN_TIME_OF_USE
 
 
 def energy_sector_from_company_name(company_name: str) -> str:
@@ -118,111 +151,293 @@ def get_energy_sector_metadata(sector) -> dict:
     }
 
 
-async def async_fetch_rates_document(
-    session: aiohttp.ClientSession, sector: str
-) -> str:
-    """Download the raw OEB rates document for an energy sector.
+@dataclass(frozen=True, slots=True)
+class DocumentValidators:
+    """What the OEB host said identifies the version of a document it served.
 
-    SSL verification is disabled deliberately: the OEB host serves an incomplete
-    certificate chain.
+    Sent back on the next request, they let the host answer "not modified"
+    instead of sending the whole document again. The documents change only a
+    few times a year.
     """
-    energy_sector_metadata = get_energy_sector_metadata(sector)
 
-    async with session.get(energy_sector_metadata["xml_url"], ssl=False) as response:
-        response.raise_for_status()
-        return await response.text()
+    etag: str | None = None
+    last_modified: str | None = None
 
+    def request_headers(self) -> dict[str, str]:
+        """The conditional request headers these validators translate to."""
+        headers = {}
 
-def parse_energy_companies(sector: str, content: str) -> list[str]:
-    """Extract every company and rate class combination from a rates document."""
-    energy_sector_metadata = get_energy_sector_metadata(sector)
-    tree = ET.fromstring(content)
+        if self.etag:
+            headers[aiohttp.hdrs.IF_NONE_MATCH] = self.etag
+        if self.last_modified:
+            headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = self.last_modified
 
-    return [
-        format_company_name(
-            company.find(energy_sector_metadata["name_key"]).text,
-            company.find(energy_sector_metadata["class_key"]).text,
-            energy_sector_metadata["name"],
-        )
-        for company in tree.findall(energy_sector_metadata["xml_root_element"])
-    ]
+        return headers
 
 
-def parse_energy_company_data(
-    sector: str, content: str, desired_company: str
-) -> dict | None:
-    """Extract a single company's rates from a rates document.
+def _normalize(value: str) -> str:
+    """Fold case and whitespace, which the OEB is not consistent about."""
+    return " ".join(value.casefold().split())
 
-    Returns None when the company is not present in the document.
-    """
-    energy_sector_metadata = get_energy_sector_metadata(sector)
-    tree = ET.fromstring(content)
 
-    for company in tree.findall(energy_sector_metadata["xml_root_element"]):
-        current_company = format_company_name(
-            company.find(energy_sector_metadata["name_key"]).text,
-            company.find(energy_sector_metadata["class_key"]).text,
-            energy_sector_metadata["name"],
-        )
+def _company_record(sector: str, fields: Mapping[str, str | None]) -> dict:
+    """Convert one company's row into the attributes the entities read."""
+    company_data: dict = {}
 
-        if current_company != desired_company:
+    if sector == SECTOR_ELECTRICITY:
+        # Short aliases for the rates the sensor state is chosen from.
+        for alias, xml_key in (
+            ("on_peak_rate", XML_KEY_ON_PEAK_RATE),
+            ("mid_peak_rate", XML_KEY_MID_PEAK_RATE),
+            ("off_peak_rate", XML_KEY_OFF_PEAK_RATE),
+            ("ulo_on_peak_rate", XML_KEY_ULO_ON_PEAK_RATE),
+            ("ulo_mid_peak_rate", XML_KEY_ULO_MID_PEAK_RATE),
+            ("ulo_off_peak_rate", XML_KEY_ULO_OFF_PEAK_RATE),
+            ("ulo_overnight_rate", XML_KEY_ULO_OVERNIGHT_RATE),
+        ):
+            company_data[alias] = float(fields[xml_key])
+
+    for tag, text in fields.items():
+        if tag in IGNORED_XML_TAGS:
+            continue
+
+        if tag not in XML_KEY_MAPPINGS[sector]:
             continue
 
-        company_data = {}
-
-        if sector == SECTOR_ELECTRICITY:
-            # Short aliases for the rates the sensor state is chosen from.
-            for alias, xml_key in (
-                ("on_peak_rate", XML_KEY_ON_PEAK_RATE),
-                ("mid_peak_rate", XML_KEY_MID_PEAK_RATE),
-                ("off_peak_rate", XML_KEY_OFF_PEAK_RATE),
-                ("ulo_on_peak_rate", XML_KEY_ULO_ON_PEAK_RATE),
-                ("ulo_mid_peak_rate", XML_KEY_ULO_MID_PEAK_RATE),
-                ("ulo_off_peak_rate", XML_KEY_ULO_OFF_PEAK_RATE),
-                ("ulo_overnight_rate", XML_KEY_ULO_OVERNIGHT_RATE),
+        if text is None:
+            value = ""
+        else:
+            try:
+                value = float(text)
+            except ValueError:
+                value = text
+
+        company_data[XML_KEY_MAPPINGS[sector][tag]] = value
+
+    return company_data
+
+
+@dataclass(frozen=True, slots=True)
+class RatesDocument:
+    """Every company in one sector's rates document, indexed for lookup.
+
+    Built by ``parse_rates_document`` in a single walk of the document. This is
+    the unit the shared cache holds: the config flow lists it, each coordinator
+    looks its company up in it, and a repair suggests a replacement from it.
+    """
+
+    sector: str
+    # Keyed by formatted company name, in document order.
+    companies: Mapping[str, dict]
+    # Normalised distributor name and rate class, to the companies carrying it.
+    by_distributor: Mapping[str, tuple[str, ...]]
+    by_rate_class: Mapping[str, tuple[str, ...]]
+    # The order the config flow lists them in, sorted once per parse rather
+    # than every time a form is shown.
+    sorted_names: tuple[str, ...]
+
+    def __contains__(self, company: object) -> bool:
+        return company in self.companies
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def get(self, company: str) -> dict | None:
+        """One company's rates, or None when it is not in the document."""
+        return self.companies.get(company)
+
+    @property
+    def names(self) -> list[str]:
+        """Every company in the document, in document order."""
+        return list(self.companies)
+
+    def closest(self, missing: str) -> str | None:
+        """The company most like one that is no longer in the document.
+
+        A renamed distributor usually keeps its rate class, and a re-classed
+        one keeps its name, so only companies sharing either are compared. Only
+        a name that shares neither falls back to comparing against everything.
+        """
+        match = COMPANY_NAME_PATTERN.match(missing)
+        candidates: dict[str, None] = {}
+
+        if match is not None:
+            for name in (
+                *self.by_distributor.get(_normalize(match["distributor"]), ()),
+                *self.by_rate_class.get(_normalize(match["rate_class"]), ()),
             ):
-                company_data[alias] = float(company.find(xml_key).text)
+                candidates[name] = None
+
+        return closest_company(missing, list(candidates or self.companies))
+
 
-        for element in company.iter():
-            if element.tag in IGNORED_XML_TAGS:
-                continue
+class _CompanyRowTarget:
+    """Parser target that hands over each company's row as it is closed.
 
-            if element.tag not in XML_KEY_MAPPINGS[sector]:
-                continue
+    No tree is built. The only thing held is the row in progress, as a flat
+    mapping of its field tags to their text, and it is dropped once handed over.
+    """
 
-            if element.text is None:
-                value = ""
-            else:
-                try:
-                    value = float(element.text)
-                except ValueError:
-                    value = element.text
+    def __init__(self, row_tag: str, on_row: Callable[[dict], None]) -> None:
+        self._row_tag = row_tag
+        self._on_row = on_row
+        self._fields: dict[str, str | None] | None = None
+        self._field: str | None = None
+        self._text: list[str] = []
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        if tag == self._row_tag:
+            self._fields = {}
+        elif self._fields is not None:
+            self._field = tag
+            self._text = []
+
+    def data(self, data: str) -> None:
+        if self._field is not None:
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        if tag == self._row_tag and self._fields is not None:
+            fields, self._fields = self._fields, None
+            self._on_row(fields)
+        elif tag == self._field and self._fields is not None:
+            # An empty element has no text, as ElementTree reports it.
+            self._fields[tag] = "".join(self._text) or None
+            self._field = None
+
+    def close(self) -> None:
+        return None
+
+
+class RatesDocumentParser:
+    """Build a RatesDocument from a document fed to it a piece at a time.
+
+    Pieces can be handed over as they arrive from the network, so the document
+    never needs to be held whole.
+    """
 
-            company_data[XML_KEY_MAPPINGS[sector][element.tag]] = value
+    def __init__(self, sector: str) -> None:
+        self._sector = sector
+        self._metadata = get_energy_sector_metadata(sector)
+        self._companies: dict[str, dict] = {}
+        self._by_distributor: dict[str, list[str]] = {}
+        self._by_rate_class: dict[str, list[str]] = {}
+        self._parser = ET.DefusedXMLParser(
+            target=_CompanyRowTarget(self._metadata["xml_root_element"], self._add)
+        )
 
-        return company_data
+    def feed(self, data: bytes | str) -> None:
+        """Parse the next piece of the document."""
+        self._parser.feed(data)
+
+    def close(self) -> RatesDocument:
+        """Finish parsing, and index every company read."""
+        self._parser.close()
+
+        return RatesDocument(
+            sector=self._sector,
+            companies=self._companies,
+            by_distributor={
+                key: tuple(names) for key, names in self._by_distributor.items()
+            },
+            by_rate_class={
+                key: tuple(names) for key, names in self._by_rate_class.items()
+            },
+            sorted_names=tuple(sorted(self._companies)),
+        )
 
-    return None
+    def _add(self, fields: dict[str, str | None]) -> None:
+        distributor = fields[self._metadata["name_key"]]
+        rate_class = fields[self._metadata["class_key"]]
+        name = format_company_name(distributor, rate_class, self._metadata["name"])
 
+        # A company listed twice keeps its first row.
+        if name in self._companies:
+            return
 
-async def get_energy_companies(
-    session: aiohttp.ClientSession, sector: str
-) -> list[str]:
-    """Sorted list of every company and rate class in one sector's document."""
+        self._companies[name] = _company_record(self._sector, fields)
+        self._by_distributor.setdefault(_normalize(distributor), []).append(name)
+        self._by_rate_class.setdefault(_normalize(rate_class), []).append(name)
 
-    content = await async_fetch_rates_document(session, sector)
 
-    return sorted(parse_energy_companies(sector, content))
+def parse_rates_document(sector: str, content: bytes | str) -> RatesDocument:
+    """Extract and index every company's rates in one walk of a document."""
+    parser = RatesDocumentParser(sector)
+    parser.feed(content)
 
+    return parser.close()
 
-async def get_energy_company_data(
-    session: aiohttp.ClientSession, sector: str, desired_company: str
-) -> dict | None:
-    """Returns the respective data for an energy company."""
 
-    content = await async_fetch_rates_document(session, sector)
+@dataclass(frozen=True, slots=True)
+class FetchedRatesDocument:
+    """A downloaded rates document, and the validators that identify it."""
+
+    document: RatesDocument
+    validators: DocumentValidators
+
+
+async def async_fetch_rates_document_if_modified(
+    session: aiohttp.ClientSession,
+    sector: str,
+    validators: DocumentValidators | None = None,
+    *,
+    executor: Callable[..., Awaitable[Any]] | None = None,
+) -> FetchedRatesDocument | None:
+    """Download and parse a rates document, unless it is the version held.
+
+    Returns None when the host confirms the document matches ``validators``,
+    in which case nothing was transferred and the previous parse still holds.
+
+    The response is parsed as it streams in, a chunk at a time, and is never
+    held whole; while one chunk is parsed the next is already arriving.
+    ``executor`` runs each chunk's parse off the event loop, as Home Assistant's
+    ``async_add_executor_job`` does; without it chunks are parsed inline.
+
+    SSL verification is disabled deliberately: the OEB host serves an incomplete
+    certificate chain.
+    """
+    energy_sector_metadata = get_energy_sector_metadata(sector)
+    headers = validators.request_headers() if validators else {}
+    parser = RatesDocumentParser(sector)
+
+    async def run(target: Callable[..., Any], *args: Any) -> Any:
+        if executor is None:
+            return target(*args)
+        return await executor(target, *args)
+
+    async with session.get(
+        energy_sector_metadata["xml_url"], ssl=False, headers=headers
+    ) as response:
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            return None
 
-    return parse_energy_company_data(sector, content, desired_company)
+        response.raise_for_status()
+
+        async for chunk in response.content.iter_chunked(RATES_DOCUMENT_CHUNK_SIZE):
+            await run(parser.feed, chunk)
+
+        return FetchedRatesDocument(
+            document=await run(parser.close),
+            validators=DocumentValidators(
+                etag=response.headers.get(aiohttp.hdrs.ETAG),
+                last_modified=response.headers.get(aiohttp.hdrs.LAST_MODIFIED),
+            ),
+        )
+
+
+def parse_energy_companies(sector: str, content: str) -> list[str]:
+    """Extract every company and rate class combination from a rates document."""
+    return parse_rates_document(sector, content).names
+
+
+def parse_energy_company_data(
+    sector: str, content: str, desired_company: str
+) -> dict | None:
+    """Extract a single company's rates from a rates document.
+
+    Returns None when the company is not present in the document.
+    """
+    return parse_rates_document(sector, content).get(desired_company)
 
 
 def closest_company(missing: str, candidates: list[str]) -> str | None:
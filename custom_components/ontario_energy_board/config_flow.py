@@ -1,13 +1,17 @@
 """Config flow for Ontario Energy Board integration."""
 
+from collections.abc import Iterable
 import logging
 from typing import Any, Final
 
 import aiohttp
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import Platform
 from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
     SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
@@ -16,24 +20,28 @@ from homeassistant.helpers.selector import (
 import voluptuous as vol
 
 from .common import (
-    closest_company,
+    RatesDocument,
     company_display_name,
-    effective_ulo_enabled,
+    effective_rate_plan,
     energy_sector_from_company_name,
-    get_energy_companies,
 )
 from .const import (
+    CONF_CIRCUIT_ENTITIES,
+    CONF_CONSUMPTION_ENTITY,
     CONF_ENERGY_COMPANY,
-    CONF_ULO_ENABLED,
+    CONF_RATE_PLAN,
     DOMAIN,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLANS,
     SECTOR_ELECTRICITY,
     SECTOR_NATURAL_GAS,
 )
+from .documents import async_get_rates_documents
 
 _LOGGER: Final = logging.getLogger(__name__)
 
 
-def _company_selector(companies: list[str]) -> SelectSelector:
+def _company_selector(companies: Iterable[str]) -> SelectSelector:
     """A searchable list of companies.
 
     The stored value keeps the sector suffix, since it identifies the sector;
@@ -51,10 +59,21 @@ def _company_selector(companies: list[str]) -> SelectSelector:
     )
 
 
+def _rate_plan_selector() -> SelectSelector:
+    """The regulated price plans an electricity account can be billed on."""
+    return SelectSelector(
+        SelectSelectorConfig(
+            options=RATE_PLANS,
+            mode=SelectSelectorMode.LIST,
+            translation_key=CONF_RATE_PLAN,
+        )
+    )
+
+
 class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Ontario Energy Board."""
 
-    VERSION = 3
+    VERSION = 4
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -91,43 +110,55 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             energy_company = user_input[CONF_ENERGY_COMPANY]
             # Gas is never asked for a plan, but the value is still recorded:
             # the coordinator reads it for every entry.
-            ulo_enabled = user_input.get(CONF_ULO_ENABLED, False)
+            rate_plan = user_input.get(CONF_RATE_PLAN, RATE_PLAN_TIME_OF_USE)
 
             # Entries carry no unique id: the company and the rate plan can
             # both change, so neither can identify an entry for its lifetime.
             # Duplicates are judged on what an entry currently holds instead.
-            if self._is_already_configured(energy_company, ulo_enabled):
+            if self._is_already_configured(energy_company, rate_plan):
                 return self.async_abort(reason="already_configured")
 
             return self.async_create_entry(
                 title=energy_company,
                 data={
                     CONF_ENERGY_COMPANY: energy_company,
-                    CONF_ULO_ENABLED: ulo_enabled,
+                    CONF_RATE_PLAN: rate_plan,
                 },
             )
 
         try:
-            companies = await get_energy_companies(
-                async_get_clientsession(self.hass), sector
-            )
+            document = await self._async_get_rates_document(sector)
         except (aiohttp.ClientError, TimeoutError):
             _LOGGER.exception("Failed to download the %s rates document", sector)
             return self.async_abort(reason="cannot_connect")
 
         schema: dict[Any, Any] = {
-            vol.Required(CONF_ENERGY_COMPANY): _company_selector(companies)
+            vol.Required(CONF_ENERGY_COMPANY): _company_selector(document.sorted_names)
         }
 
         if sector == SECTOR_ELECTRICITY:
-            schema[vol.Required(CONF_ULO_ENABLED, default=False)] = bool
+            schema[vol.Required(CONF_RATE_PLAN, default=RATE_PLAN_TIME_OF_USE)] = (
+                _rate_plan_selector()
+            )
 
         return self.async_show_form(step_id=sector, data_schema=vol.Schema(schema))
 
+    async def _async_get_rates_document(self, sector: str) -> RatesDocument:
+        """Every company in a sector.
+
+        Served from the document the entries share, which is parsed in the
+        executor, so rendering the form never parses on the event loop. The
+        entry created at the end of the flow then starts from the same
+        document instead of downloading it again.
+        """
+        cached, _ = await async_get_rates_documents(self.hass).async_get(sector)
+
+        return cached.document
+
     def _is_already_configured(
         self,
         energy_company: str,
-        ulo_enabled: bool,
+        rate_plan: str,
         ignoring: config_entries.ConfigEntry | None = None,
     ) -> bool:
         """Whether another entry already covers this company and rate plan.
@@ -138,7 +169,7 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return any(
             entry is not ignoring
             and entry.data[CONF_ENERGY_COMPANY] == energy_company
-            and effective_ulo_enabled(entry) == ulo_enabled
+            and effective_rate_plan(entry) == rate_plan
             for entry in self._async_current_entries()
         )
 
@@ -161,7 +192,7 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             chosen = user_input[CONF_ENERGY_COMPANY]
 
-            if self._is_already_configured(chosen, effective_ulo_enabled(entry), entry):
+            if self._is_already_configured(chosen, effective_rate_plan(entry), entry):
                 # Shown on the form rather than aborting, so the user keeps
                 # their place and can pick a different company.
                 errors["base"] = "already_configured"
@@ -173,18 +204,14 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         try:
-            companies = await get_energy_companies(
-                async_get_clientsession(self.hass), sector
-            )
+            document = await self._async_get_rates_document(sector)
         except (aiohttp.ClientError, TimeoutError):
             _LOGGER.exception("Failed to download the %s rates document", sector)
             return self.async_abort(reason="cannot_connect")
 
         # Offered as a default, never applied on the user's behalf: rate zones
         # carry near-identical names and genuinely different delivery charges.
-        suggested = (
-            current if current in companies else closest_company(current, companies)
-        )
+        suggested = current if current in document else document.closest(current)
 
         return self.async_show_form(
             step_id="reconfigure",
@@ -192,7 +219,7 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(
                         CONF_ENERGY_COMPANY, default=suggested
-                    ): _company_selector(companies)
+                    ): _company_selector(document.sorted_names)
                 }
             ),
             errors=errors,
@@ -204,7 +231,9 @@ class OntarioEnergyBoardConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def async_get_options_flow(
         config_entry: config_entries.ConfigEntry,
     ) -> config_entries.OptionsFlow:
-        """Allow the rate plan to be corrected after setup."""
+        """Allow the rate plan to be corrected after setup, and consumption to
+        be costed.
+        """
         return OntarioEnergyBoardOptionsFlow()
 
 
@@ -212,7 +241,9 @@ class OntarioEnergyBoardOptionsFlow(config_entries.OptionsFlow):
     """Change which rate plan an existing entry is billed on.
 
     This is configuration rather than control: it records the plan the utility
-    bills the account on, which Home Assistant cannot change.
+    bills the account on, which Home Assistant cannot change. The consumption
+    sensor and circuits, if any are picked, are what the entry's cost sensors
+    price.
     """
 
     async def async_step_init(
@@ -221,8 +252,7 @@ class OntarioEnergyBoardOptionsFlow(config_entries.OptionsFlow):
         energy_company = self.config_entry.data[CONF_ENERGY_COMPANY]
 
         if energy_sector_from_company_name(energy_company) != SECTOR_ELECTRICITY:
-            # Gas has no peak periods, so there is no plan to choose.
-            return self.async_abort(reason="no_rate_plan")
+            return await self.async_step_natural_gas()
 
         if user_input is not None:
             return self.async_create_entry(data=user_input)
@@ -232,10 +262,53 @@ class OntarioEnergyBoardOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema(
                 {
                     vol.Required(
-                        CONF_ULO_ENABLED,
-                        default=effective_ulo_enabled(self.config_entry),
-                    ): bool
+                        CONF_RATE_PLAN,
+                        default=effective_rate_plan(self.config_entry),
+                    ): _rate_plan_selector(),
+                    **self._meter_field(
+                        CONF_CONSUMPTION_ENTITY, SensorDeviceClass.ENERGY
+                    ),
+                    **self._meter_field(
+                        CONF_CIRCUIT_ENTITIES, SensorDeviceClass.ENERGY, multiple=True
+                    ),
                 }
             ),
             description_placeholders={"energy_company": energy_company},
         )
+
+    async def async_step_natural_gas(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Pick the gas meter to cost. Gas has no peak periods, so no plan."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="natural_gas",
+            data_schema=vol.Schema(
+                self._meter_field(CONF_CONSUMPTION_ENTITY, SensorDeviceClass.GAS)
+            ),
+            description_placeholders={
+                "energy_company": self.config_entry.data[CONF_ENERGY_COMPANY]
+            },
+        )
+
+    def _meter_field(
+        self, key: str, device_class: SensorDeviceClass, *, multiple: bool = False
+    ) -> dict[Any, EntitySelector]:
+        """An optional choice of meter sensors.
+
+        Suggested rather than defaulted, so a choice can be cleared.
+        """
+        return {
+            vol.Optional(
+                key,
+                description={"suggested_value": self.config_entry.options.get(key)},
+            ): EntitySelector(
+                EntitySelectorConfig(
+                    domain=Platform.SENSOR,
+                    device_class=device_class,
+                    multiple=multiple,
+                )
+            )
+        }
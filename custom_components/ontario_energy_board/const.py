@@ -4,14 +4,29 @@ from datetime import timedelta
 
 DOMAIN = "ontario_energy_board"
 
+# hass.data[DOMAIN] is keyed by config entry id. Anything shared between entries
+# lives under a key that cannot collide with one.
+DATA_RATES_DOCUMENTS = "rates_documents"
+DATA_HOLIDAYS = "holidays"
+
 CONF_ENERGY_COMPANY = "energy_company"
+# Superseded by CONF_RATE_PLAN; read only to migrate older entries.
 CONF_ULO_ENABLED = "ulo_enabled"
+CONF_RATE_PLAN = "rate_plan"
+CONF_CONSUMPTION_ENTITY = "consumption_entity"
+CONF_CIRCUIT_ENTITIES = "circuit_entities"
 
 SECTOR_ELECTRICITY = "electricity"
 SECTOR_NATURAL_GAS = "natural_gas"
 
 ENERGY_SECTORS = [SECTOR_ELECTRICITY, SECTOR_NATURAL_GAS]
 
+RATE_PLAN_TIME_OF_USE = "time_of_use"
+RATE_PLAN_ULTRA_LOW_OVERNIGHT = "ultra_low_overnight"
+RATE_PLAN_TIERED = "tiered"
+
+RATE_PLANS = [RATE_PLAN_TIME_OF_USE, RATE_PLAN_ULTRA_LOW_OVERNIGHT, RATE_PLAN_TIERED]
+
 ELECTRICITY_RATES_URL = "https://www.oeb.ca/_html/calculator/data/BillData.xml"
 NATURAL_GAS_RATES_URL = "https://www.oeb.ca/_html/calculator/data/GasBillData.xml"
 
@@ -28,7 +43,11 @@ NATURAL_GAS_RATE_UNIT_OF_MEASURE = "CAD/m³"
 CURRENCY_UNIT = "CAD"
 
 REFRESH_RATES_INTERVAL = timedelta(days=1)
-SCAN_INTERVAL = timedelta(minutes=1)
+
+# Each entry saves the rates from its last good refresh and starts from them,
+# retrying the OEB host at this shorter interval until it answers.
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_RETRY_INTERVAL = timedelta(minutes=15)
 
 XML_KEY_MAPPINGS = {
     "electricity": {
@@ -125,6 +144,8 @@ STATE_ULO_MID_PEAK = "ulo_mid_peak"
 STATE_ULO_OFF_PEAK = "ulo_off_peak"
 STATE_ULO_OVERNIGHT = "ulo_overnight"
 STATE_NO_PEAK = "no_peak"
+STATE_LOWER_TIER = "lower_tier"
+STATE_HIGHER_TIER = "higher_tier"
 
 STATE_SUMMER = "summer"
 STATE_WINTER = "winter"
@@ -138,16 +159,36 @@ ULO_PEAK_OPTIONS = [
     STATE_ULO_OFF_PEAK,
     STATE_ULO_OVERNIGHT,
 ]
+TIER_OPTIONS = [STATE_LOWER_TIER, STATE_HIGHER_TIER]
 SEASON_OPTIONS = [STATE_SUMMER, STATE_WINTER]
 
+# Each plan's pricing periods, and the field each one's price is published in.
+# A tiered plan's periods are its tiers, which follow the month's consumption
+# rather than the clock.
+RATE_PLAN_KEY_MAPPINGS = {
+    RATE_PLAN_TIME_OF_USE: {
+        STATE_ON_PEAK: "time_of_use_on_peak_price",
+        STATE_MID_PEAK: "time_of_use_mid_peak_price",
+        STATE_OFF_PEAK: "time_of_use_off_peak_price",
+    },
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT: {
+        STATE_ULO_ON_PEAK: "ultra_low_overnight_on_peak_rate",
+        STATE_ULO_MID_PEAK: "ultra_low_overnight_mid_peak_rate",
+        STATE_ULO_OFF_PEAK: "ultra_low_overnight_weekend_off_peak_rate",
+        STATE_ULO_OVERNIGHT: "ultra_low_overnight_overnight_rate",
+    },
+    RATE_PLAN_TIERED: {
+        STATE_LOWER_TIER: "lower_tier_price",
+        STATE_HIGHER_TIER: "higher_tier_price",
+    },
+}
+
+# Every plan's periods at once. The states never collide between plans, so a
+# price can be looked up by period alone.
 PEAK_KEY_MAPPINGS = {
-    STATE_ON_PEAK: "time_of_use_on_peak_price",
-    STATE_MID_PEAK: "time_of_use_mid_peak_price",
-    STATE_OFF_PEAK: "time_of_use_off_peak_price",
-    STATE_ULO_ON_PEAK: "ultra_low_overnight_on_peak_rate",
-    STATE_ULO_MID_PEAK: "ultra_low_overnight_mid_peak_rate",
-    STATE_ULO_OFF_PEAK: "ultra_low_overnight_weekend_off_peak_rate",
-    STATE_ULO_OVERNIGHT: "ultra_low_overnight_overnight_rate",
+    period: key
+    for mappings in RATE_PLAN_KEY_MAPPINGS.values()
+    for period, key in mappings.items()
 }
 
 XML_KEY_ON_PEAK_RATE = "RPPOnP"
@@ -0,0 +1,477 @@
+"""Running costs for the energy counted by other entities' meters.
+
+An entry can cost its main consumption sensor and any number of circuit
+monitors besides, and a panel monitor reports dozens of circuits in the same
+instant. Rather than each cost sensor following its own meter, every meter an
+entry costs is followed by one ConsumptionCosts: one state listener for all of
+them, each reading priced against the coordinator's current rates, and the
+cost sensors that moved written once, together, when the event loop next comes
+round. No meter has a timer of its own.
+
+Gas is priced differently. Its delivery charge is banded by the volume used so
+far in the month, so a gas meter also keeps the month's volume to date, and
+each increase is priced from the band that volume has reached. Electricity on
+the tiered plan is kept the same way, and priced from the tier the month's kWh
+have reached.
+
+Any electricity meter can also be followed by a PlanAdvisorMeter, which costs
+nothing itself but keeps the last 30 days' kWh split into every clock plan's
+periods, so what they would have cost on each plan can be compared.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+import logging
+from typing import Any, Final, Self
+
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfEnergy,
+    UnitOfVolume,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.restore_state import ExtraStoredData
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import (
+    BaseUnitConverter,
+    EnergyConverter,
+    VolumeConverter,
+)
+
+from .advisor import PlanComparison, RollingUsage, compare_plans, split_usage
+from .const import DOMAIN
+from .coordinator import OntarioEnergyBoardDataUpdateCoordinator
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+def meter_reading(
+    state: State | None, converter: type[BaseUnitConverter], unit: str
+) -> float | None:
+    """A cumulative meter's reading in ``unit``, if it has a usable one.
+
+    A reading without a unit is taken to be in ``unit`` already.
+    """
+    if state is None or state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return None
+
+    try:
+        value = float(state.state)
+    except ValueError:
+        return None
+
+    from_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, unit)
+
+    if from_unit not in converter.VALID_UNITS:
+        return None
+
+    return converter.convert(value, from_unit, unit)
+
+
+@dataclass(frozen=True, slots=True)
+class MeterCostExtraStoredData(ExtraStoredData):
+    """The running cost, and the reading it was last brought up to.
+
+    A meter priced by the month also saves the month its total belongs to,
+    and a plan advisor its window of daily totals, as RollingUsage.as_dict.
+    """
+
+    cost: float
+    reading: float | None
+    read_at: datetime | None
+    month: date | None = None
+    month_volume: float = 0.0
+    rolling: dict[str, Any] | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cost": self.cost,
+            "reading": self.reading,
+            "read_at": None if self.read_at is None else self.read_at.isoformat(),
+            "month": None if self.month is None else self.month.isoformat(),
+            "month_volume": self.month_volume,
+            "rolling": self.rolling,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> Self | None:
+        """Read back what as_dict saved, or None if it cannot be trusted."""
+        try:
+            read_at = restored["read_at"]
+            month = restored.get("month")
+
+            return cls(
+                cost=float(restored["cost"]),
+                reading=(
+                    None if restored["reading"] is None else float(restored["reading"])
+                ),
+                read_at=None if read_at is None else dt_util.parse_datetime(read_at),
+                month=None if month is None else date.fromisoformat(month),
+                month_volume=float(restored.get("month_volume", 0.0)),
+                rolling=restored.get("rolling"),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+class MeterCost:
+    """One electricity meter's running cost, brought up to its last reading.
+
+    Each reading is priced from the one before it alone, so the work does not
+    grow with history and nothing is asked of the recorder.
+    """
+
+    converter: type[BaseUnitConverter] = EnergyConverter
+    unit: str = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(self, entity_id: str) -> None:
+        self.entity_id = entity_id
+        self.cost = 0.0
+        self.reading: float | None = None
+        self.read_at: datetime | None = None
+
+    def stored(self) -> MeterCostExtraStoredData:
+        """What to save to carry on from after a restart."""
+        return MeterCostExtraStoredData(self.cost, self.reading, self.read_at)
+
+    def restore(self, stored: MeterCostExtraStoredData) -> None:
+        self.cost = stored.cost
+        self.reading = stored.reading
+        self.read_at = stored.read_at
+
+    def read(
+        self,
+        state: State | None,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+    ) -> bool:
+        """Price what was used since the last reading; say if anything was."""
+        if state is None:
+            return False
+        if (reading := meter_reading(state, self.converter, self.unit)) is None:
+            return False
+
+        previous, previous_at = self.reading, self.read_at
+        self.reading, self.read_at = reading, state.last_updated
+
+        if previous is None or previous_at is None or reading == previous:
+            return False
+
+        # A cumulative sensor that goes down has been reset, and counts what
+        # has been used since the reset.
+        used = reading - previous if reading > previous else reading
+
+        return self._count(coordinator, used, previous_at, state.last_updated)
+
+    def _count(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        used: float,
+        start: datetime,
+        end: datetime,
+    ) -> bool:
+        """Account for what was used between two readings; say if it was."""
+        if (cost := self._price(coordinator, used, start, end)) is None:
+            _LOGGER.debug(
+                "No price for %s %s reported by %s; it is left uncosted",
+                used,
+                self.unit,
+                self.entity_id,
+            )
+            return False
+
+        self.cost += cost
+
+        return True
+
+    def _price(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        used: float,
+        start: datetime,
+        end: datetime,
+    ) -> float | None:
+        return coordinator.energy_cost(used, start, end)
+
+
+class MonthlyMeterCost(MeterCost, ABC):
+    """A meter priced by how much the month has used so far.
+
+    Each increase is priced from where the month's total stands, and the
+    total starts again from nothing when a month begins.
+    """
+
+    def __init__(self, entity_id: str) -> None:
+        super().__init__(entity_id)
+
+        # The first day of the month month_volume was used in.
+        self.month: date | None = None
+        self.month_volume = 0.0
+
+    def stored(self) -> MeterCostExtraStoredData:
+        return MeterCostExtraStoredData(
+            self.cost, self.reading, self.read_at, self.month, self.month_volume
+        )
+
+    def restore(self, stored: MeterCostExtraStoredData) -> None:
+        super().restore(stored)
+
+        self.month = stored.month
+        self.month_volume = stored.month_volume
+
+    def month_to_date(self, moment: datetime) -> float:
+        """The amount used so far in the month of ``moment``."""
+        return self.month_volume if self.month == _month_of(moment) else 0.0
+
+    def _price(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        used: float,
+        start: datetime,
+        end: datetime,
+    ) -> float | None:
+        month = _month_of(end)
+        costs: list[float | None] = []
+
+        if self.month != month:
+            month_start = dt_util.start_of_local_day(month)
+
+            if self.month is not None and start < month_start:
+                # The increase straddles the turn of the month. What was used
+                # before it, in proportion to the time, goes to the old month.
+                before = (
+                    used
+                    * (month_start - start).total_seconds()
+                    / (end - start).total_seconds()
+                )
+                costs.append(
+                    self._price_in_month(coordinator, self.month_volume, before, start)
+                )
+                used -= before
+
+            self.month, self.month_volume = month, 0.0
+
+        costs.append(self._price_in_month(coordinator, self.month_volume, used, end))
+        # Counted even if it could not be priced: it was still used.
+        self.month_volume += used
+
+        if None in costs:
+            return None
+
+        return sum(cost for cost in costs if cost is not None)
+
+    @abstractmethod
+    def _price_in_month(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        month_volume: float,
+        used: float,
+        moment: datetime,
+    ) -> float | None:
+        """What ``used`` more costs in a month that has used ``month_volume``."""
+
+
+class GasMeterCost(MonthlyMeterCost):
+    """One gas meter's running cost, and the volume used so far this month.
+
+    Pricing an increase is a bisect over the delivery bands, from the band
+    the month's volume has reached.
+    """
+
+    converter = VolumeConverter
+    unit = UnitOfVolume.CUBIC_METERS
+
+    def _price_in_month(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        month_volume: float,
+        used: float,
+        moment: datetime,
+    ) -> float | None:
+        return coordinator.gas_rates.cost(month_volume, used)
+
+
+class TieredMeterCost(MonthlyMeterCost):
+    """One electricity meter's running cost on the two-tier plan, and the kWh
+    used so far this month.
+
+    The month's kWh decide which of the two prices the next kWh is charged at,
+    against the threshold for the season the kWh are used in.
+    """
+
+    def _price_in_month(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        month_volume: float,
+        used: float,
+        moment: datetime,
+    ) -> float | None:
+        rates = coordinator.electricity_rates
+
+        return rates.tiered_cost(
+            month_volume, used, rates.tier_threshold_at(dt_util.as_local(moment))
+        )
+
+
+class PlanAdvisorMeter(MeterCost):
+    """One electricity meter's last 30 days, as each clock plan would bill them.
+
+    Nothing is priced as it is read: each increase is split into every plan's
+    periods and added to today's totals, and the plans are priced from the
+    totals when asked. The kWh are counted on the day of the reading that
+    reports them.
+    """
+
+    def __init__(self, entity_id: str) -> None:
+        super().__init__(entity_id)
+
+        self.usage = RollingUsage()
+
+    def stored(self) -> MeterCostExtraStoredData:
+        return MeterCostExtraStoredData(
+            self.cost, self.reading, self.read_at, rolling=self.usage.as_dict()
+        )
+
+    def restore(self, stored: MeterCostExtraStoredData) -> None:
+        super().restore(stored)
+
+        if stored.rolling is None:
+            return
+
+        try:
+            self.usage = RollingUsage.from_dict(stored.rolling)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            _LOGGER.debug(
+                "The saved usage of %s could not be read; it starts again",
+                self.entity_id,
+            )
+
+    def advance(self, moment: datetime) -> None:
+        """Roll the window on to the day of ``moment``."""
+        self.usage.advance(dt_util.as_local(moment).date())
+
+    def comparison(
+        self, coordinator: OntarioEnergyBoardDataUpdateCoordinator, moment: datetime
+    ) -> PlanComparison:
+        """The window priced on every plan, at the rates in effect now."""
+        return compare_plans(
+            coordinator.electricity_rates, self.usage, dt_util.as_local(moment)
+        )
+
+    def _count(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        used: float,
+        start: datetime,
+        end: datetime,
+    ) -> bool:
+        end = dt_util.as_local(end)
+        self.usage.add(
+            end.date(),
+            split_usage(
+                dt_util.as_local(start), end, used, coordinator.ontario_holidays
+            ),
+        )
+
+        return True
+
+
+def _month_of(moment: datetime) -> date:
+    """The first day of a moment's month, in local time."""
+    return dt_util.as_local(moment).date().replace(day=1)
+
+
+class ConsumptionCosts:
+    """Every meter an entry costs, followed by one listener."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        entity_ids: Iterable[str],
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entity_ids = list(dict.fromkeys(entity_ids))
+        # For each meter entity, the meters reading it and, for each of those,
+        # how to write every sensor that shows something of it.
+        self._followers: dict[str, dict[MeterCost, list[CALLBACK_TYPE]]] = {}
+        # The sensors to write when the event loop next comes round. Ordered,
+        # so they are written in the order their meters moved.
+        self._pending: dict[CALLBACK_TYPE, None] = {}
+        self._write_scheduled = False
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Listen to every meter at once. Returns how to stop."""
+        return async_track_state_change_event(
+            self.hass, self.entity_ids, self._handle_state_change
+        )
+
+    @callback
+    def async_follow(self, meter: MeterCost, write: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Price a meter's readings until told to stop.
+
+        ``write`` is called, at most once per pass of the event loop, whenever
+        the meter has moved. A meter shown by several sensors is followed once
+        by each, and read once for them all. Returns how to stop.
+        """
+        meters = self._followers.setdefault(meter.entity_id, {})
+        writes = meters.setdefault(meter, [])
+        writes.append(write)
+
+        @callback
+        def unfollow() -> None:
+            writes.remove(write)
+            self._pending.pop(write, None)
+
+            if not writes:
+                del meters[meter]
+
+        return unfollow
+
+    @callback
+    def async_moved(self, meter: MeterCost) -> None:
+        """Have every sensor showing a meter written, as if it had been read."""
+        for write in self._followers.get(meter.entity_id, {}).get(meter, ()):
+            self._pending[write] = None
+
+        if self._pending and not self._write_scheduled:
+            # A panel reports its circuits one event after another in the same
+            # pass; waiting for the pass to finish writes each sensor once. A
+            # task rather than a bare callback, so Home Assistant tracks it.
+            self._write_scheduled = True
+            self.hass.async_create_task(
+                self._async_write_pending(),
+                f"{DOMAIN} consumption cost writes",
+                eager_start=False,
+            )
+
+    @callback
+    def _handle_state_change(self, event: Event[EventStateChangedData]) -> None:
+        if not (meters := self._followers.get(event.data["entity_id"])):
+            return
+
+        new_state = event.data["new_state"]
+
+        for meter in meters:
+            if meter.read(new_state, self.coordinator):
+                self.async_moved(meter)
+
+    async def _async_write_pending(self) -> None:
+        self._write_scheduled = False
+        pending, self._pending = self._pending, {}
+
+        for write in pending:
+            write()
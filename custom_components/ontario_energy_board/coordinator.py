@@ -1,26 +1,40 @@
 """Data update coordinator for the Ontario Energy Board integration."""
 
-from collections.abc import Container
-from datetime import date
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
 import logging
-from typing import Final
+from typing import Any, Final
 
+import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryError
 from homeassistant.helpers import issue_registry as ir
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
+from . import billing, gas_billing, peaks
 from .common import (
-    async_fetch_rates_document,
-    closest_company,
-    effective_ulo_enabled,
+    DocumentValidators,
+    effective_rate_plan,
     energy_sector_from_company_name,
-    parse_energy_companies,
-    parse_energy_company_data,
 )
-from .const import CONF_ENERGY_COMPANY, DOMAIN, REFRESH_RATES_INTERVAL
+from .const import (
+    CONF_ENERGY_COMPANY,
+    DOMAIN,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    REFRESH_RATES_INTERVAL,
+    SECTOR_ELECTRICITY,
+    SNAPSHOT_RETRY_INTERVAL,
+    SNAPSHOT_STORAGE_VERSION,
+    STATE_NO_PEAK,
+    STATE_SUMMER,
+    STATE_WINTER,
+)
+from .documents import CachedRatesDocument, async_get_rates_documents
+from .ontario_holidays import async_get_holiday_calendar
 
 _LOGGER: Final = logging.getLogger(__name__)
 
@@ -30,6 +44,36 @@ def company_missing_issue_id(entry_id: str) -> str:
     return f"company_missing_{entry_id}"
 
 
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """The store an entry's last good rates are saved in."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def _rate(value: Any) -> float | None:
+    """A published price, or None for the empty element of an unused one."""
+    return value if isinstance(value, (int, float)) else None
+
+
+@dataclass(frozen=True, slots=True)
+class ClockValues:
+    """Everything an entry derives from the clock, as of one instant.
+
+    None of it can change before ``valid_until``, the next peak or season
+    change, so one computation serves every entity until then.
+    """
+
+    as_of: datetime
+    valid_until: datetime | None
+    active_peak: str
+    season: str
+    next_peak: str | None
+    next_peak_starts_at: datetime | None
+    current_rate: float | None
+    current_all_in_rate: float | None
+    next_peak_rate: float | None
+    next_peak_all_in_rate: float | None
+
+
 class OntarioEnergyBoardDataUpdateCoordinator(DataUpdateCoordinator[dict]):
     """Coordinator to manage Ontario Energy Board data."""
 
@@ -37,7 +81,6 @@ class OntarioEnergyBoardDataUpdateCoordinator(DataUpdateCoordinator[dict]):
         self,
         hass: HomeAssistant,
         config_entry: ConfigEntry,
-        ontario_holidays: Container[date],
     ) -> None:
         super().__init__(
             hass,
@@ -45,31 +88,239 @@ class OntarioEnergyBoardDataUpdateCoordinator(DataUpdateCoordinator[dict]):
             config_entry=config_entry,
             name=DOMAIN,
             update_interval=REFRESH_RATES_INTERVAL,
+            # The rates change a few times a year. A refresh that brings the
+            # same record as the last tells no entity anything new.
+            always_update=False,
         )
-        self.websession = async_get_clientsession(hass)
-        self.ontario_holidays = ontario_holidays
+        self.rates_documents = async_get_rates_documents(hass)
+        self.holiday_calendar = async_get_holiday_calendar(hass)
         self.energy_company = config_entry.data[CONF_ENERGY_COMPANY]
-        self.ulo_enabled = effective_ulo_enabled(config_entry)
+        self.rate_plan = effective_rate_plan(config_entry)
+        self.ulo_enabled = self.rate_plan == RATE_PLAN_ULTRA_LOW_OVERNIGHT
         # Derived from the stored company name, which carries the sector as a
         # suffix. It is a property of the configuration, not of the fetch.
         self.energy_sector = energy_sector_from_company_name(self.energy_company)
+        # How the last refresh got its document: "cached" and "not_modified"
+        # mean nothing was downloaded or parsed for it.
+        self.last_refresh_outcome: str | None = None
+        # True from restoring a snapshot until the OEB host has been reached.
+        self.restored_from_snapshot = False
+        self._snapshot_store = snapshot_store(hass, config_entry.entry_id)
+        self._snapshot: dict[str, Any] | None = None
+        # Everything the sensors price, summed from the current rates, for the
+        # entry's sector. Rebuilt whenever the data changes, and never between.
+        self.electricity_rates = billing.ElectricityRates.from_company_data({})
+        self.gas_rates = gas_billing.GasRates.from_company_data({})
+        self._clock_values: ClockValues | None = None
 
     @property
     def company_data(self) -> dict:
         """The most recently fetched rates, empty before the first refresh."""
         return self.data or {}
 
+    @property
+    def follows_peaks(self) -> bool:
+        """Whether the price changes with the clock.
+
+        Gas has no peak periods, and the tiered plan's price follows the
+        month's consumption instead.
+        """
+        return (
+            self.energy_sector == SECTOR_ELECTRICITY
+            and self.rate_plan != RATE_PLAN_TIERED
+        )
+
+    @property
+    def ontario_holidays(self) -> frozenset[date]:
+        """Every observed holiday a peak lookup made today can reach."""
+        return self.holiday_calendar.dates
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Tell the entities about new data, and reprice from it first."""
+        if self.energy_sector == SECTOR_ELECTRICITY:
+            self.electricity_rates = billing.ElectricityRates.from_company_data(
+                self.company_data
+            )
+        else:
+            self.gas_rates = gas_billing.GasRates.from_company_data(self.company_data)
+
+        self._clock_values = None
+        super().async_update_listeners()
+
+    def clock_values(self) -> ClockValues:
+        """The entry's clock-derived values, shared by every entity.
+
+        Computed once per peak or season change rather than by each entity
+        that shows one of them, so every entity reports the same instant.
+        """
+        moment = dt_util.now()
+        values = self._clock_values
+
+        if (
+            values is None
+            or moment < values.as_of
+            or (values.valid_until is not None and moment >= values.valid_until)
+        ):
+            values = self._clock_values = self._compute_clock_values(moment)
+
+        return values
+
+    def _compute_clock_values(self, moment: datetime) -> ClockValues:
+        holidays = self.ontario_holidays
+
+        if self.follows_peaks:
+            active_peak = peaks.active_peak(
+                moment,
+                holidays,
+                energy_sector=self.energy_sector,
+                ulo_enabled=self.ulo_enabled,
+            )
+            change = peaks.next_peak_change(
+                moment,
+                holidays,
+                energy_sector=self.energy_sector,
+                ulo_enabled=self.ulo_enabled,
+            )
+        else:
+            active_peak, change = STATE_NO_PEAK, None
+
+        next_peak = None if change is None else change[1]
+
+        # Every clock-derived value follows the peak schedule, and both the
+        # Time-of-Use schedule and the tier threshold swap between summer and
+        # winter.
+        changes = [] if change is None else [change[0]]
+
+        if self.energy_sector == SECTOR_ELECTRICITY and not self.ulo_enabled:
+            changes.append(peaks.next_season_change(moment))
+
+        rates = self.electricity_rates
+
+        if self.energy_sector == SECTOR_ELECTRICITY:
+            current_rate = rates.commodity_rates.get(active_peak)
+            current_all_in_rate = rates.all_in_rates.get(active_peak)
+        else:
+            current_rate = _rate(self.company_data.get("gas_supply_charge"))
+            # Gas delivery is banded by monthly volume, so its marginal rate
+            # depends on which tier the month has reached.
+            current_all_in_rate = None
+
+        return ClockValues(
+            as_of=moment,
+            valid_until=min(changes, default=None),
+            active_peak=active_peak,
+            season=STATE_SUMMER if peaks.is_summer(moment) else STATE_WINTER,
+            next_peak=next_peak,
+            next_peak_starts_at=None if change is None else change[0],
+            current_rate=current_rate,
+            current_all_in_rate=current_all_in_rate,
+            next_peak_rate=(
+                None if next_peak is None else rates.commodity_rates.get(next_peak)
+            ),
+            next_peak_all_in_rate=(
+                None if next_peak is None else rates.all_in_rates.get(next_peak)
+            ),
+        )
+
+    def energy_cost(self, kwh: float, start: datetime, end: datetime) -> float | None:
+        """What kWh used between two moments cost, all in.
+
+        A meter reading says how much was used but not when, so the kWh are
+        spread evenly over the time between readings and each period's share
+        is priced at its all-in rate. None if any of those periods has no
+        published price, and for a plan whose price does not follow the clock.
+        """
+        if not self.follows_peaks:
+            return None
+
+        values = self.clock_values()
+
+        if start >= values.as_of and (
+            values.valid_until is None or end < values.valid_until
+        ):
+            # Both readings fall in the period in effect now, the common case
+            # by far, priced from the snapshot every entity shares.
+            if values.current_all_in_rate is None:
+                return None
+
+            return kwh * values.current_all_in_rate
+
+        spans = peaks.peak_spans(
+            dt_util.as_local(start),
+            dt_util.as_local(end),
+            self.ontario_holidays,
+            energy_sector=self.energy_sector,
+            ulo_enabled=self.ulo_enabled,
+        )
+        all_in_rates = self.electricity_rates.all_in_rates
+
+        if any(peak not in all_in_rates for peak, _ in spans):
+            return None
+
+        duration = sum(seconds for _, seconds in spans)
+
+        if not duration:
+            # Two readings at one instant: price the step where it happened.
+            return kwh * all_in_rates[spans[-1][0]]
+
+        return sum(
+            kwh * seconds / duration * all_in_rates[peak] for peak, seconds in spans
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Start from the rates saved at the last good refresh, if there are any.
+
+        Returns whether there were. Rates change a few times a year, so
+        yesterday's are a far better start than none, and with them setup need
+        not wait on the OEB host at all. A snapshot taken for another company,
+        before the entry was reconfigured, is ignored.
+        """
+        snapshot = await self._snapshot_store.async_load()
+
+        if not snapshot or snapshot["energy_company"] != self.energy_company:
+            return False
+
+        self._snapshot = snapshot
+        self.restored_from_snapshot = True
+        self.rates_documents.async_seed(
+            self.energy_sector,
+            self.energy_company,
+            snapshot["company_data"],
+            DocumentValidators(**snapshot["validators"]),
+        )
+        self.async_set_updated_data(snapshot["company_data"])
+
+        return True
+
     async def _async_update_data(self) -> dict:
         """Fetch the rates for the selected energy company."""
 
-        # Parsed twice from one download rather than fetched twice: the list of
-        # companies is only needed to suggest a replacement, and it is the same
-        # document the rates come from.
-        content = await async_fetch_rates_document(self.websession, self.energy_sector)
+        # Riding on the daily refresh, the holidays are extended into next
+        # year from November, long before any lookup needs them.
+        await self.holiday_calendar.async_cover(dt_util.now().date())
 
-        company_data = parse_energy_company_data(
-            self.energy_sector, content, self.energy_company
-        )
+        try:
+            cached = await self._async_get_rates_document()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            if not self.restored_from_snapshot:
+                raise
+
+            # The snapshot's rates are still the best known, so the entities
+            # keep them rather than going unavailable, and the host is tried
+            # again sooner than the usual day.
+            _LOGGER.debug(
+                "Keeping the saved rates for %s, the OEB host is unreachable: %s",
+                self.energy_company,
+                err,
+            )
+            self.update_interval = SNAPSHOT_RETRY_INTERVAL
+            return self.data
+
+        self.restored_from_snapshot = False
+        self.update_interval = REFRESH_RATES_INTERVAL
+
+        company_data = cached.document.get(self.energy_company)
 
         if company_data is None:
             # The company has left the document. Ontario distributors are
@@ -77,7 +328,7 @@ class OntarioEnergyBoardDataUpdateCoordinator(DataUpdateCoordinator[dict]):
             # retrying brings the old name back, so this is reported as
             # something the user has to act on rather than retried forever.
             self._async_report_company_missing(
-                parse_energy_companies(self.energy_sector, content)
+                cached.document.closest(self.energy_company)
             )
 
             raise ConfigEntryError(
@@ -88,11 +339,48 @@ class OntarioEnergyBoardDataUpdateCoordinator(DataUpdateCoordinator[dict]):
 
         self._async_clear_company_missing()
 
+        # A copy, so nothing one entry does to its data reaches another's.
+        company_data = dict(company_data)
+        await self._async_save_snapshot(company_data, cached.validators)
+
         return company_data
 
-    def _async_report_company_missing(self, available: list[str]) -> None:
+    async def _async_get_rates_document(self) -> CachedRatesDocument:
+        """The sector's document, or as much of it as the snapshots hold.
+
+        Shared with every other entry in the sector, so only the first of them
+        to refresh in a day downloads and parses anything. The same parse is
+        indexed to suggest a replacement from. After a restart the cache holds
+        the snapshots' rates, and the host is only asked whether they are
+        still current.
+        """
+        cached, self.last_refresh_outcome = await self.rates_documents.async_get(
+            self.energy_sector, self.energy_company
+        )
+
+        return cached
+
+    async def _async_save_snapshot(
+        self, company_data: dict, validators: DocumentValidators
+    ) -> None:
+        """Save the rates for the next start, unless they are already saved."""
+        snapshot = {
+            "energy_company": self.energy_company,
+            "company_data": company_data,
+            "validators": asdict(validators),
+        }
+
+        # The document only changes a few times a year, and most refreshes
+        # would otherwise rewrite the same file.
+        if snapshot == self._snapshot:
+            return
+
+        self._snapshot = snapshot
+        await self._snapshot_store.async_save(snapshot)
+
+    def _async_report_company_missing(self, suggestion: str | None) -> None:
         """Raise a repair explaining the entry needs re-pointing."""
-        suggestion = closest_company(self.energy_company, available) or ""
+        suggestion = suggestion or ""
 
         ir.async_create_issue(
             self.hass,
@@ -0,0 +1,33 @@
+"""Diagnostics support for the Ontario Energy Board integration."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import OntarioEnergyBoardDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Describe an entry's rates, and how its document was last obtained.
+
+    Everything here is published open data, so nothing needs redacting.
+    """
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator = hass.data[DOMAIN][
+        entry.entry_id
+    ]
+
+    return {
+        "energy_company": coordinator.energy_company,
+        "energy_sector": coordinator.energy_sector,
+        "rate_plan": coordinator.rate_plan,
+        "last_refresh_outcome": coordinator.last_refresh_outcome,
+        "restored_from_snapshot": coordinator.restored_from_snapshot,
+        "rates_document": coordinator.rates_documents.async_diagnostics(
+            coordinator.energy_sector
+        ),
+        "company_data": coordinator.company_data,
+    }
@@ -0,0 +1,279 @@
+"""The OEB rates documents, shared by every config entry.
+
+Each sector publishes a single document covering every company, and every entry
+in that sector reads its own company out of it. Left to each coordinator, a
+household with two electricity entries and a gas entry would download and parse
+the electricity document twice per refresh. The cache here holds one download
+and one parse per sector, at the domain level, until it is as old as the
+coordinators' own refresh interval.
+
+Once it is that old, the host is asked whether the document has changed rather
+than sent for it outright. It rarely has, and a "not modified" answer keeps the
+parse already held without transferring or parsing anything. After a restart,
+the snapshots each entry restored seed the cache with their companies and the
+version they were read from, so the first refresh asks the same question.
+
+Concurrent requests for a document that is not cached share one request to
+the host. At startup every entry refreshes at once, and the config flow can ask
+while a coordinator is mid-download; each of them awaits the same response.
+
+A download is parsed as it streams in, each chunk in the executor while the
+next is still arriving, so nothing parses on the event loop and the document is
+never held whole. The one walk yields every company, which is both the list the
+config flow offers and the record each coordinator reads.
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime
+import logging
+from typing import Any, Final
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .common import (
+    DocumentValidators,
+    RatesDocument,
+    async_fetch_rates_document_if_modified,
+)
+from .const import DATA_RATES_DOCUMENTS, DOMAIN, REFRESH_RATES_INTERVAL
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+# How a request for a document was satisfied.
+OUTCOME_CACHED = "cached"
+OUTCOME_NOT_MODIFIED = "not_modified"
+OUTCOME_DOWNLOADED = "downloaded"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedRatesDocument:
+    """Every company parsed from one sector's document, and its version."""
+
+    document: RatesDocument
+    validators: DocumentValidators
+    # When the host last confirmed this is the current document, by sending it
+    # or by answering "not modified". None for one seeded from snapshots and
+    # not yet confirmed.
+    fetched_at: datetime | None
+    # False while it holds only the companies seeded from snapshots.
+    complete: bool = True
+
+    def covers(self, company: str | None) -> bool:
+        """Whether a request for ``company``, or for all of them, is answered."""
+        return self.complete or (company is not None and company in self.document)
+
+
+class RatesDocumentCache:
+    """Download and parse each sector's document at most once per interval."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.websession = async_get_clientsession(hass)
+        self._documents: dict[str, CachedRatesDocument] = {}
+        self._outcomes: dict[str, Counter[str]] = {}
+        # Requests in flight, by sector and the validators sent with them, and
+        # the document each was asked about.
+        self._in_flight: dict[
+            tuple[str, DocumentValidators | None],
+            tuple[
+                CachedRatesDocument | None,
+                asyncio.Task[tuple[CachedRatesDocument, str]],
+            ],
+        ] = {}
+        # Requests that awaited one already in flight instead of their own.
+        self._coalesced: Counter[str] = Counter()
+
+    @callback
+    def async_seed(
+        self,
+        sector: str,
+        company: str,
+        company_data: dict,
+        validators: DocumentValidators,
+    ) -> None:
+        """Hold a company's rates restored from a snapshot, and their version.
+
+        At startup nothing is cached, but the snapshots hold what each entry
+        read from the document they were taken from. Seeded, the first refresh
+        asks whether that version is still current, and "not modified" then
+        refreshes a real entry the rest of the sector is answered from. Only
+        snapshots of one version are held together, and never over a document
+        already downloaded.
+        """
+        held = self._documents.get(sector)
+
+        if held is None:
+            companies = {}
+        elif not held.complete and held.validators == validators:
+            companies = dict(held.document.companies)
+        else:
+            return
+
+        companies.setdefault(company, dict(company_data))
+        self._documents[sector] = CachedRatesDocument(
+            document=RatesDocument(
+                sector=sector,
+                companies=companies,
+                by_distributor={},
+                by_rate_class={},
+                sorted_names=tuple(sorted(companies)),
+            ),
+            validators=validators,
+            fetched_at=held.fetched_at if held is not None else None,
+            complete=False,
+        )
+
+    async def async_get(
+        self, sector: str, company: str | None = None
+    ) -> tuple[CachedRatesDocument, str]:
+        """The sector's document, downloaded only if it has changed, and how
+        this request for it was satisfied.
+
+        A caller that needs only ``company`` can be answered from companies
+        seeded from snapshots; without it, or for a company not seeded, the
+        whole document is downloaded.
+
+        The outcome is returned rather than kept, as every entry in the sector
+        shares the cache: anything but "downloaded" was a cache hit, nothing was
+        parsed, and for "cached" nothing was even requested from the host.
+
+        A failed download raises and leaves any previous document in place, so
+        the coordinator that asked sees the failure and retries as before.
+        """
+        held = self._documents.get(sector)
+        now = dt_util.utcnow()
+
+        if held is not None and not held.covers(company):
+            held = None
+
+        if (
+            held is not None
+            and held.fetched_at is not None
+            and now - held.fetched_at < REFRESH_RATES_INTERVAL
+        ):
+            self._record(sector, OUTCOME_CACHED)
+            return held, OUTCOME_CACHED
+
+        # Only requests sending the same validators can share an answer: "not
+        # modified" is only true of the version it was asked about. Nor can one
+        # for a company seeded after the request went out, which it may not
+        # answer for.
+        key = (sector, held.validators if held is not None else None)
+        in_flight = self._in_flight.get(key)
+
+        if in_flight is not None and (
+            in_flight[0] is None or in_flight[0].covers(company)
+        ):
+            request = in_flight[1]
+            self._coalesced[sector] += 1
+        else:
+            request = self.hass.async_create_task(
+                self._async_fetch(sector, held),
+                f"{DOMAIN} {sector} rates document",
+            )
+            self._in_flight[key] = (held, request)
+            request.add_done_callback(
+                lambda done: self._async_forget_request(key, done)
+            )
+
+        # Shielded, so a caller that is cancelled does not cancel the request
+        # for everyone else awaiting it.
+        return await asyncio.shield(request)
+
+    async def _async_fetch(
+        self, sector: str, held: CachedRatesDocument | None
+    ) -> tuple[CachedRatesDocument, str]:
+        """Ask the host for a document, sending the validators of one held."""
+        now = dt_util.utcnow()
+
+        fetched = await async_fetch_rates_document_if_modified(
+            self.websession,
+            sector,
+            held.validators if held is not None else None,
+            executor=self.hass.async_add_executor_job,
+        )
+
+        if fetched is None:
+            if held is None:
+                # "Not modified" only answers validators, and none were sent:
+                # the host sent no document, which is a failed download.
+                raise aiohttp.ClientError(
+                    f"The {sector} rates document was reported not modified "
+                    "without a version being asked about"
+                )
+
+            _LOGGER.debug("The %s rates document has not changed", sector)
+            self._record(sector, OUTCOME_NOT_MODIFIED)
+            outcome = OUTCOME_NOT_MODIFIED
+
+            # Companies seeded from snapshots of the same version while the
+            # request was out are confirmed with the rest.
+            current = self._documents.get(sector)
+
+            if current is not None and current.validators == held.validators:
+                held = current
+
+            cached = replace(held, fetched_at=now)
+
+            # A newer document downloaded meanwhile is not replaced by seeds.
+            if current is not held:
+                return cached, outcome
+        else:
+            cached = CachedRatesDocument(
+                document=fetched.document,
+                validators=fetched.validators,
+                fetched_at=now,
+            )
+            self._record(sector, OUTCOME_DOWNLOADED)
+            outcome = OUTCOME_DOWNLOADED
+
+        self._documents[sector] = cached
+
+        return cached, outcome
+
+    @callback
+    def _async_forget_request(
+        self,
+        key: tuple[str, DocumentValidators | None],
+        request: asyncio.Task[tuple[CachedRatesDocument, str]],
+    ) -> None:
+        """Stop offering a finished request, unless another has taken its key."""
+        in_flight = self._in_flight.get(key)
+
+        if in_flight is not None and in_flight[1] is request:
+            del self._in_flight[key]
+
+    @callback
+    def async_diagnostics(self, sector: str) -> dict[str, Any]:
+        """What the cache holds for a sector, and how often it has helped."""
+        cached = self._documents.get(sector)
+
+        return {
+            "fetched_at": (
+                cached.fetched_at.isoformat() if cached and cached.fetched_at else None
+            ),
+            "complete": cached.complete if cached else None,
+            "etag": cached.validators.etag if cached else None,
+            "last_modified": cached.validators.last_modified if cached else None,
+            "outcomes": dict(self._outcomes.get(sector, {})),
+            "coalesced": self._coalesced[sector],
+        }
+
+    def _record(self, sector: str, outcome: str) -> None:
+        self._outcomes.setdefault(sector, Counter())[outcome] += 1
+
+
+@callback
+def async_get_rates_documents(hass: HomeAssistant) -> RatesDocumentCache:
+    """The cache shared by every entry, created on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    if DATA_RATES_DOCUMENTS not in domain_data:
+        domain_data[DATA_RATES_DOCUMENTS] = RatesDocumentCache(hass)
+
+    return domain_data[DATA_RATES_DOCUMENTS]
@@ -1,24 +1,39 @@
 """Base entity for the Ontario Energy Board integration."""
 
-from homeassistant.core import callback
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import EntityDescription
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .common import company_display_name
-from .const import DOMAIN, MANUFACTURER, OEB_URL, SCAN_INTERVAL, SECTOR_ELECTRICITY
+from .const import (
+    DOMAIN,
+    MANUFACTURER,
+    OEB_URL,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    SECTOR_ELECTRICITY,
+)
 from .coordinator import OntarioEnergyBoardDataUpdateCoordinator
 
+RATE_PLAN_NAMES = {
+    RATE_PLAN_TIME_OF_USE: "Time-of-Use",
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT: "Ultra-Low Overnight",
+    RATE_PLAN_TIERED: "Tiered",
+}
+
 
 def device_model(coordinator: OntarioEnergyBoardDataUpdateCoordinator) -> str:
     """Describe the sector and rate plan this entry is configured for."""
     if coordinator.energy_sector != SECTOR_ELECTRICITY:
         return "Natural Gas"
 
-    plan = "Ultra-Low Overnight" if coordinator.ulo_enabled else "Time-of-Use"
-
-    return f"Electricity · {plan}"
+    return f"Electricity · {RATE_PLAN_NAMES[coordinator.rate_plan]}"
 
 
 class OntarioEnergyBoardEntity(
@@ -27,6 +42,9 @@ class OntarioEnergyBoardEntity(
     """Shared device wiring for every Ontario Energy Board entity."""
 
     _attr_has_entity_name = True
+    _unsub_clock: CALLBACK_TYPE | None = None
+    # What the entity last wrote, as (available, state, extra attributes).
+    _last_written: tuple[bool, Any, dict[str, Any] | None] | None = None
 
     def __init__(
         self,
@@ -61,17 +79,72 @@ class OntarioEnergyBoardEntity(
         refresh, so a one minute poll downloads the rates document every
         minute. The rates change once a day; only the values derived from the
         clock change more often than that, and they need no new data at all.
+
+        Nor do they change every minute: only when the peak or the season
+        does, a handful of times a day. So rather than waking on an interval,
+        the entity wakes once, at the exact instant of the next change, and
+        arms the following one from there.
         """
         await super().async_added_to_hass()
 
+        # The platform writes the first state as soon as this returns.
+        self._last_written = self._written()
+
         if not getattr(self.entity_description, "clock_dependent", False):
             return
 
-        self.async_on_remove(
-            async_track_time_interval(self.hass, self._handle_clock, SCAN_INTERVAL)
+        self._async_schedule_clock()
+        self.async_on_remove(self._async_cancel_clock)
+
+    @callback
+    def _async_schedule_clock(self) -> None:
+        when = self.coordinator.clock_values().valid_until
+
+        self._unsub_clock = (
+            None
+            if when is None
+            else async_track_point_in_utc_time(self.hass, self._handle_clock, when)
         )
 
     @callback
-    def _handle_clock(self, _now) -> None:
+    def _async_cancel_clock(self) -> None:
+        if self._unsub_clock is not None:
+            self._unsub_clock()
+            self._unsub_clock = None
+
+    @callback
+    def _handle_clock(self, _now: datetime) -> None:
         """Re-read the clock. The coordinator is deliberately untouched."""
+        self._async_schedule_clock()
+        self._async_write_if_changed()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._async_write_if_changed()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write the state only if it, or its attributes, differ from those
+        last written.
+
+        Most values do not move when the rates are refreshed, nor when a clock
+        change moves some other value of the entry. Writing them anyway costs
+        a state event and a recorder row for nothing.
+        """
+        written = self._written()
+
+        if written == self._last_written:
+            return
+
+        self._last_written = written
         self.async_write_ha_state()
+
+    def _written(self) -> tuple[bool, Any, dict[str, Any] | None]:
+        """What a write now would record, attributes copied as they stand."""
+        attributes = self.extra_state_attributes
+
+        return (
+            self.available,
+            self.state,
+            None if attributes is None else dict(attributes),
+        )
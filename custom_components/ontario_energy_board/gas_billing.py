@@ -0,0 +1,225 @@
+"""Ontario natural gas bill arithmetic.
+
+Like `billing`, pure functions free of Home Assistant imports. A gas bill is:
+
+    customer charge = the monthly charge
+    delivery        = each band of the month's volume at that band's price,
+                      plus the delivery price adjustment on every m³
+    transportation  = the transportation charge and its adjustment, per m³
+    storage         = the storage charge and its adjustment, per m³
+    gas supply      = the commodity and its adjustment, per m³
+    carbon          = the federal and facility carbon charges, per m³
+    total           = everything above x (1 + HST)
+
+There is no rebate: the Ontario Electricity Rebate is for electricity only.
+
+Delivery is the awkward part. It is priced in up to five bands of monthly
+volume, published as a start and an end for each. The starts are unreliable
+(Enbridge publishes 0-30, then 31-85, then 85-170), so each band is taken to
+run from the previous band's end to its own, and the last band in use carries
+on past its nominal end. A tier that ends where the previous one did, as the
+unused fifth tier does at 0, is no band at all.
+
+The bands only change when the rates are refreshed, so their boundaries, and
+the delivery charge for volume up to each one, are worked out once per refresh
+as a GasRates table. Pricing a volume is then a bisect over the boundaries.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Self
+
+from .billing import number
+
+DELIVERY_TIERS = range(1, 6)
+
+
+@dataclass(frozen=True, slots=True)
+class GasBill:
+    """A month's bill, line by line, unrounded."""
+
+    customer_charge: float
+    delivery: float
+    transportation: float
+    storage: float
+    gas_supply: float
+    carbon: float
+    subtotal: float
+    hst: float
+    total: float
+
+
+@dataclass(frozen=True, slots=True)
+class GasRates:
+    """One company's gas rates, with its delivery bands laid out for bisecting.
+
+    ``band_starts[n]`` is the monthly volume band ``n`` starts at, the first
+    always 0, and ``band_prices[n]`` its price per m³. ``delivery_to_start[n]``
+    is what delivering everything below that start costs, so the delivery
+    charge for any volume is one band's worth of arithmetic.
+    """
+
+    monthly_charge: float
+    band_starts: tuple[float, ...]
+    band_prices: tuple[float, ...]
+    delivery_to_start: tuple[float, ...]
+    delivery_adjustment: float
+    transportation_per_m3: float
+    storage_per_m3: float
+    gas_supply_per_m3: float
+    carbon_per_m3: float
+    harmonized_sales_tax: float
+
+    @classmethod
+    def from_company_data(cls, company_data: Mapping[str, Any]) -> Self:
+        """Read a company's record, as published, and lay out its bands."""
+        starts = [0.0]
+        prices: list[float] = []
+
+        for tier in DELIVERY_TIERS:
+            end = company_data.get(f"delivery_tier_{tier}_end")
+            price = company_data.get(f"delivery_charge_tier_{tier}")
+
+            if not isinstance(end, (int, float)) or not isinstance(price, (int, float)):
+                continue
+            if end <= starts[-1]:
+                continue
+
+            prices.append(float(price))
+            starts.append(float(end))
+
+        # The last band in use carries on past its end.
+        starts.pop()
+
+        if not prices:
+            # No bands at all: nothing is charged for delivery by volume.
+            starts, prices = [0.0], [0.0]
+
+        delivery_to_start = [0.0]
+
+        for start, end, price in zip(starts, starts[1:], prices, strict=False):
+            delivery_to_start.append(delivery_to_start[-1] + (end - start) * price)
+
+        return cls(
+            monthly_charge=number(company_data, "monthly_charge", 0.0),
+            band_starts=tuple(starts),
+            band_prices=tuple(prices),
+            delivery_to_start=tuple(delivery_to_start),
+            delivery_adjustment=number(
+                company_data, "delivery_charge_price_adjustment", 0.0
+            ),
+            transportation_per_m3=number(company_data, "transportation_charge", 0.0)
+            + number(company_data, "transportation_charge_price_adjustment", 0.0),
+            storage_per_m3=number(company_data, "storage_charge", 0.0)
+            + number(company_data, "storage_charge_price_adjustment", 0.0),
+            gas_supply_per_m3=number(company_data, "gas_supply_charge", 0.0)
+            + number(company_data, "gas_supply_charge_price_adjustment", 0.0),
+            carbon_per_m3=number(company_data, "federal_carbon_charge", 0.0)
+            + number(company_data, "facility_carbon_charge", 0.0),
+            harmonized_sales_tax=number(company_data, "harmonized_sales_tax", 0.0),
+        )
+
+    def band(self, volume: float) -> int:
+        """Which band the next m³ after ``volume`` in a month is delivered in."""
+        return bisect_right(self.band_starts, volume) - 1
+
+    def delivery(self, volume: float) -> float:
+        """The delivery charge for a month's volume, adjustment included."""
+        band = self.band(volume)
+        banded = (
+            self.delivery_to_start[band]
+            + (volume - self.band_starts[band]) * self.band_prices[band]
+        )
+
+        return banded + volume * self.delivery_adjustment
+
+    def bill(self, volume: float) -> GasBill:
+        """The bill for a month in which ``volume`` m³ was used."""
+        delivery = self.delivery(volume)
+        transportation = volume * self.transportation_per_m3
+        storage = volume * self.storage_per_m3
+        gas_supply = volume * self.gas_supply_per_m3
+        carbon = volume * self.carbon_per_m3
+        subtotal = (
+            self.monthly_charge
+            + delivery
+            + transportation
+            + storage
+            + gas_supply
+            + carbon
+        )
+        hst = subtotal * self.harmonized_sales_tax
+
+        return GasBill(
+            customer_charge=self.monthly_charge,
+            delivery=delivery,
+            transportation=transportation,
+            storage=storage,
+            gas_supply=gas_supply,
+            carbon=carbon,
+            subtotal=subtotal,
+            hst=hst,
+            total=subtotal + hst,
+        )
+
+    def totals(self, volumes: Iterable[float]) -> list[float]:
+        """The total bill for each of many months' volumes, at once.
+
+        For comparing months, or households, without building a GasBill for
+        each. Everything but delivery is summed into one rate per m³ first, so
+        each volume costs a bisect and a few multiplications.
+        """
+        starts, prices = self.band_starts, self.band_prices
+        to_start = self.delivery_to_start
+        per_m3 = (
+            self.delivery_adjustment
+            + self.transportation_per_m3
+            + self.storage_per_m3
+            + self.gas_supply_per_m3
+            + self.carbon_per_m3
+        )
+        multiplier = 1.0 + self.harmonized_sales_tax
+        totals = []
+
+        for volume in volumes:
+            band = bisect_right(starts, volume) - 1
+            banded = to_start[band] + (volume - starts[band]) * prices[band]
+            totals.append((self.monthly_charge + banded + volume * per_m3) * multiplier)
+
+        return totals
+
+    def cost(self, month_volume: float, volume: float) -> float:
+        """The all-in cost of ``volume`` m³ more in a month that has used
+        ``month_volume``, the monthly charge aside.
+
+        What a bill for the month goes up by, worked out from the two delivery
+        charges alone, so it costs two bisects however many bands it crosses.
+        """
+        delivery = self.delivery(month_volume + volume) - self.delivery(month_volume)
+        # Everything else is flat per m³.
+        flat = (
+            self.transportation_per_m3
+            + self.storage_per_m3
+            + self.gas_supply_per_m3
+            + self.carbon_per_m3
+        )
+
+        return (delivery + volume * flat) * (1.0 + self.harmonized_sales_tax)
+
+    def marginal_rate(self, volume: float) -> float:
+        """The all-in cost of the next m³ in a month that has used ``volume``.
+
+        Everything but delivery is flat per m³; delivery depends on the band
+        the month has reached.
+        """
+        per_m3 = (
+            self.band_prices[self.band(volume)]
+            + self.delivery_adjustment
+            + self.transportation_per_m3
+            + self.storage_per_m3
+            + self.gas_supply_per_m3
+            + self.carbon_per_m3
+        )
+
+        return per_m3 * (1.0 + self.harmonized_sales_tax)
@@ -0,0 +1,112 @@
+"""Ontario's observed holidays, shared by every config entry.
+
+Weekends and holidays are off-peak all day, so every peak lookup asks whether
+a date is a holiday. A ``holidays`` calendar answers by populating any year it
+has not seen yet on the spot, which around New Year means building a year's
+tables on the event loop, in the middle of a sensor update.
+
+The calendar here is instead built up front, in the executor, as a frozenset
+of dates covering the years in use. Every entry reads the same set, and a
+lookup is a plain membership test. The following year is added from November,
+well before any lookup reaches past December 31st, and the previous year is
+kept, as readings taken in January still price time spent in December.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from datetime import date
+import logging
+from typing import Final
+
+from holidays import country_holidays
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_HOLIDAYS, DOMAIN
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+# From this month on, next year's holidays are built alongside this year's.
+PREWARM_MONTH = 11
+
+
+def observed_holidays(years: Iterable[int]) -> frozenset[date]:
+    """Every observed Ontario holiday in the given years.
+
+    Builds the ``holidays`` tables for each year, so it belongs in an executor.
+    """
+    return frozenset(
+        country_holidays(
+            "CA",
+            subdiv="ON",
+            years=years,
+            observed=True,
+            categories={"public", "optional"},
+        )
+    )
+
+
+def years_needed(today: date) -> range:
+    """The years a lookup made today can reach, from last year's end on."""
+    if today.month >= PREWARM_MONTH:
+        return range(today.year - 1, today.year + 2)
+
+    return range(today.year - 1, today.year + 1)
+
+
+class OntarioHolidayCalendar:
+    """The observed holidays for every year in use, rebuilt whole to extend."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.dates: frozenset[date] = frozenset()
+        self.years = range(0)
+        self._lock = asyncio.Lock()
+
+    def covers(self, years: range) -> bool:
+        """Whether every one of the years has been built."""
+        return not years or (
+            self.years.start <= years.start and years.stop <= self.years.stop
+        )
+
+    async def async_cover(self, today: date) -> frozenset[date]:
+        """The holidays, built out to every year a lookup today can reach.
+
+        Years already built are kept, so a calendar only ever grows and a date
+        never stops being a holiday once it has been one.
+        """
+        years = years_needed(today)
+
+        if self.covers(years):
+            return self.dates
+
+        async with self._lock:
+            # Another entry may have built them while this one waited.
+            if not self.covers(years):
+                if self.years:
+                    years = range(
+                        min(self.years.start, years.start),
+                        max(self.years.stop, years.stop),
+                    )
+
+                _LOGGER.debug(
+                    "Building Ontario holidays for %s to %s",
+                    years.start,
+                    years.stop - 1,
+                )
+                self.dates = await self.hass.async_add_import_executor_job(
+                    observed_holidays, years
+                )
+                self.years = years
+
+        return self.dates
+
+
+@callback
+def async_get_holiday_calendar(hass: HomeAssistant) -> OntarioHolidayCalendar:
+    """The calendar shared by every entry, created on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+
+    if DATA_HOLIDAYS not in domain_data:
+        domain_data[DATA_HOLIDAYS] = OntarioHolidayCalendar(hass)
+
+    return domain_data[DATA_HOLIDAYS]
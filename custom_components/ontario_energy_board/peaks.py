@@ -5,11 +5,19 @@ is pure, taking an explicit timezone-aware ``datetime`` rather than reading the
 clock. That makes the rules directly testable without a Home Assistant
 instance, and keeps the sensor a thin adapter over them.
 
-All callers must pass a datetime already localised to the Ontario timezone.
+The schedules are written out once, as the periods of each kind of day, and
+compiled into tables of the peak in effect for every hour. Classifying a moment
+is then a lookup by day type, season and hour, made only as far as the hour
+needs: at night, or on a weekend, no holiday or season is looked up at all.
+Finding the next change reads the same tables, so the two cannot disagree.
+
+All callers must pass a datetime already localised to the Ontario timezone,
+except classify_peaks, which takes UTC instants in bulk along with the zone.
 """
 
-from collections.abc import Container
-from datetime import UTC, date, datetime, timedelta
+from collections.abc import Container, Iterable, Iterator
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import TYPE_CHECKING, Any
 
 from .const import (
     SECTOR_ELECTRICITY,
@@ -23,6 +31,9 @@ from .const import (
     STATE_ULO_OVERNIGHT,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 SUMMER_FIRST_MONTH = 5
 SUMMER_FIRST_DAY = 1
 SUMMER_LAST_MONTH = 10
@@ -32,10 +43,35 @@ SUMMER_LAST_DAY = 31
 def is_summer(moment: datetime) -> bool:
     """Whether the summer schedule applies, observed from May 1st to Oct 31st."""
 
+    return _is_summer_day(moment.date())
+
+
+def _is_summer_day(day: date) -> bool:
     return (
-        date(moment.year, SUMMER_FIRST_MONTH, SUMMER_FIRST_DAY)
-        <= moment.date()
-        <= date(moment.year, SUMMER_LAST_MONTH, SUMMER_LAST_DAY)
+        (SUMMER_FIRST_MONTH, SUMMER_FIRST_DAY)
+        <= (day.month, day.day)
+        <= (SUMMER_LAST_MONTH, SUMMER_LAST_DAY)
+    )
+
+
+def next_season_change(moment: datetime) -> datetime:
+    """When the Time-of-Use schedule next switches between summer and winter.
+
+    Summer starts at midnight on May 1st and winter at midnight on November
+    1st. Daylight saving changes at 2am, so local midnight always exists.
+    """
+    summer_starts = date(moment.year, SUMMER_FIRST_MONTH, SUMMER_FIRST_DAY)
+    winter_starts = date(moment.year, SUMMER_LAST_MONTH, SUMMER_LAST_DAY)
+    winter_starts += timedelta(days=1)
+
+    for day in (summer_starts, winter_starts):
+        change = datetime.combine(day, time(), moment.tzinfo)
+
+        if change > moment:
+            return change
+
+    return datetime.combine(
+        summer_starts.replace(year=moment.year + 1), time(), moment.tzinfo
     )
 
 
@@ -45,6 +81,189 @@ def is_off_peak_day(moment: datetime, holidays: Container[date]) -> bool:
     return moment.weekday() >= 5 or moment.date() in holidays
 
 
+# The periods making up each kind of day, as (first hour, peak) in the order
+# they occur; each runs until the next begins. These are the schedules as the
+# OEB publishes them, and everything below is compiled from them.
+TOU_SUMMER_WEEKDAY = (
+    (0, STATE_OFF_PEAK),
+    (7, STATE_MID_PEAK),
+    (11, STATE_ON_PEAK),
+    (17, STATE_MID_PEAK),
+    (19, STATE_OFF_PEAK),
+)
+TOU_WINTER_WEEKDAY = (
+    (0, STATE_OFF_PEAK),
+    (7, STATE_ON_PEAK),
+    (11, STATE_MID_PEAK),
+    (17, STATE_ON_PEAK),
+    (19, STATE_OFF_PEAK),
+)
+TOU_OFF_PEAK_DAY = ((0, STATE_OFF_PEAK),)
+ULO_WEEKDAY = (
+    (0, STATE_ULO_OVERNIGHT),
+    (7, STATE_ULO_MID_PEAK),
+    (16, STATE_ULO_ON_PEAK),
+    (21, STATE_ULO_MID_PEAK),
+    (23, STATE_ULO_OVERNIGHT),
+)
+ULO_OFF_PEAK_DAY = (
+    (0, STATE_ULO_OVERNIGHT),
+    (7, STATE_ULO_OFF_PEAK),
+    (23, STATE_ULO_OVERNIGHT),
+)
+
+# Every peak a table can hold. Tables store a position in this tuple rather
+# than the name, which keeps each one to 24 bytes and lets a bulk classifier
+# work on integer arrays.
+PEAK_STATES = (
+    STATE_NO_PEAK,
+    STATE_OFF_PEAK,
+    STATE_MID_PEAK,
+    STATE_ON_PEAK,
+    STATE_ULO_OVERNIGHT,
+    STATE_ULO_OFF_PEAK,
+    STATE_ULO_MID_PEAK,
+    STATE_ULO_ON_PEAK,
+)
+
+# Table indexes.
+PLAN_TOU = 0
+PLAN_ULO = 1
+DAY_WEEKDAY = 0
+DAY_OFF_PEAK = 1
+SEASON_WINTER = 0
+SEASON_SUMMER = 1
+
+
+def _compile(schedule: tuple[tuple[int, str], ...]) -> bytes:
+    """Expand a day's periods into the peak in effect for each hour."""
+    hours = bytearray(24)
+    ends = (*(first for first, _ in schedule[1:]), 24)
+
+    for (first, peak), end in zip(schedule, ends, strict=True):
+        hours[first:end] = bytes([PEAK_STATES.index(peak)]) * (end - first)
+
+    return bytes(hours)
+
+
+# PEAK_TABLES[plan][day type][season][hour] is the position in PEAK_STATES of
+# the peak in effect. Ultra-Low Overnight is the same all year, so both of its
+# seasons share a table.
+PEAK_TABLES = (
+    (
+        (_compile(TOU_WINTER_WEEKDAY), _compile(TOU_SUMMER_WEEKDAY)),
+        (_compile(TOU_OFF_PEAK_DAY),) * 2,
+    ),
+    (
+        (_compile(ULO_WEEKDAY),) * 2,
+        (_compile(ULO_OFF_PEAK_DAY),) * 2,
+    ),
+)
+
+
+def _boundaries(table: bytes) -> tuple[tuple[int, int], ...]:
+    """The hours a table's peak changes on, and what it changes to.
+
+    Midnight always counts, since the day before may have ended differently.
+    """
+    return tuple(
+        (hour, code)
+        for hour, code in enumerate(table)
+        if hour == 0 or code != table[hour - 1]
+    )
+
+
+# Indexed as PEAK_TABLES is.
+PEAK_BOUNDARIES = tuple(
+    tuple(tuple(_boundaries(table) for table in seasons) for seasons in day_types)
+    for day_types in PEAK_TABLES
+)
+
+
+def _varies(tables: Iterable[tuple[str, ...]]) -> tuple[bool, ...]:
+    """For each hour, whether the tables disagree on the peak in effect."""
+    first, *rest = tables
+
+    return tuple(
+        any(table[hour] != first[hour] for table in rest) for hour in range(24)
+    )
+
+
+# PEAK_TABLES with each peak's name in place of its position, for classifying
+# one moment at a time.
+PEAK_NAMES = tuple(
+    tuple(
+        tuple(tuple(PEAK_STATES[code] for code in table) for table in seasons)
+        for seasons in day_types
+    )
+    for day_types in PEAK_TABLES
+)
+# For each plan and hour, the peak if every day has the same one then, as most
+# of the night does, or None where the date decides it. For the hours it does,
+# SEASONLESS_PEAKS has, by plan and day type, the peak if both seasons agree on
+# it, or None where the season decides; for Ultra-Low Overnight, it never does.
+FIXED_PEAKS = tuple(
+    tuple(
+        None if varies else day_types[DAY_WEEKDAY][SEASON_WINTER][hour]
+        for hour, varies in enumerate(
+            _varies(table for seasons in day_types for table in seasons)
+        )
+    )
+    for day_types in PEAK_NAMES
+)
+SEASONLESS_PEAKS = tuple(
+    tuple(
+        tuple(
+            None if varies else seasons[SEASON_WINTER][hour]
+            for hour, varies in enumerate(_varies(seasons))
+        )
+        for seasons in day_types
+    )
+    for day_types in PEAK_NAMES
+)
+
+
+def day_kind(day: date, holidays: Container[date]) -> tuple[int, int]:
+    """The day type and season of a date, which pick its table.
+
+    The holiday lookup is most of the cost of classifying a moment, so the bulk
+    functions here resolve each date once and reuse it for every moment on it.
+    """
+    day_type = DAY_OFF_PEAK if day.weekday() >= 5 or day in holidays else DAY_WEEKDAY
+    season = SEASON_SUMMER if _is_summer_day(day) else SEASON_WINTER
+
+    return day_type, season
+
+
+def _plan(ulo_enabled: bool) -> int:
+    return PLAN_ULO if ulo_enabled else PLAN_TOU
+
+
+def _peak(moment: datetime, holidays: Container[date], plan: int) -> str:
+    """The peak in effect at one moment, looking up only what its hour needs.
+
+    Where the plan's tables agree on the hour, no date is looked at at all,
+    and the season is only worked out where the day type's tables differ.
+    """
+    hour = moment.hour
+
+    if (peak := FIXED_PEAKS[plan][hour]) is not None:
+        return peak
+
+    if moment.weekday() >= 5 or moment.date() in holidays:
+        day_type = DAY_OFF_PEAK
+    else:
+        day_type = DAY_WEEKDAY
+
+    if (peak := SEASONLESS_PEAKS[plan][day_type][hour]) is not None:
+        return peak
+
+    # A datetime is a date, and only its month and day are read.
+    season = SEASON_SUMMER if _is_summer_day(moment) else SEASON_WINTER
+
+    return PEAK_NAMES[plan][day_type][season][hour]
+
+
 def tou_active_peak(moment: datetime, holidays: Container[date]) -> str:
     """Find the active Time-of-Use peak for a given moment.
 
@@ -54,17 +273,7 @@ def tou_active_peak(moment: datetime, holidays: Container[date]) -> str:
     time, where morning and evening are on-peak and afternoons are mid-peak.
     """
 
-    if is_off_peak_day(moment, holidays):
-        return STATE_OFF_PEAK
-
-    hour = moment.hour
-
-    if (7 <= hour < 11) or (17 <= hour < 19):
-        return STATE_MID_PEAK if is_summer(moment) else STATE_ON_PEAK
-    if 11 <= hour < 17:
-        return STATE_ON_PEAK if is_summer(moment) else STATE_MID_PEAK
-
-    return STATE_OFF_PEAK
+    return _peak(moment, holidays, PLAN_TOU)
 
 
 def ulo_active_peak(moment: datetime, holidays: Container[date]) -> str:
@@ -77,18 +286,7 @@ def ulo_active_peak(moment: datetime, holidays: Container[date]) -> str:
     ULO prices and periods are the same all year round.
     """
 
-    hour = moment.hour
-
-    if hour < 7 or hour >= 23:
-        return STATE_ULO_OVERNIGHT
-
-    if is_off_peak_day(moment, holidays):
-        return STATE_ULO_OFF_PEAK
-
-    if 16 <= hour < 21:
-        return STATE_ULO_ON_PEAK
-
-    return STATE_ULO_MID_PEAK
+    return _peak(moment, holidays, PLAN_ULO)
 
 
 def active_peak(
@@ -106,26 +304,46 @@ def active_peak(
     if energy_sector != SECTOR_ELECTRICITY:
         return STATE_NO_PEAK
 
-    if ulo_enabled:
-        return ulo_active_peak(moment, holidays)
+    return _peak(moment, holidays, PLAN_ULO if ulo_enabled else PLAN_TOU)
 
-    return tou_active_peak(moment, holidays)
 
+def active_peaks(
+    moments: Iterable[datetime],
+    holidays: Container[date],
+    *,
+    energy_sector: str,
+    ulo_enabled: bool,
+) -> list[str]:
+    """active_peak for each of many moments, resolving each date only once.
 
-# A Time-of-Use off-peak stretch runs from Friday evening to Monday morning,
-# and a holiday adjoining a weekend extends it further. Eight days clears any
-# run of statutory holidays Ontario can produce, and the search is cheap.
-MAX_LOOKAHEAD_HOURS = 8 * 24
+    Moments arrive in runs from the same date, such as a day's hourly
+    statistics, and each run is looked up against the holidays once.
+    """
+    moments = list(moments)
 
+    if energy_sector != SECTOR_ELECTRICITY:
+        return [STATE_NO_PEAK] * len(moments)
 
-def _next_hour(moment: datetime) -> datetime:
-    """The following hour boundary, correct across daylight saving changes.
+    tables = PEAK_TABLES[_plan(ulo_enabled)]
+    peaks = []
+    day: date | None = None
+    table = tables[DAY_WEEKDAY][SEASON_WINTER]
 
-    Adding to a zone-aware datetime directly does wall-clock arithmetic and
-    keeps the old offset, which drifts by an hour twice a year. Going through
-    UTC keeps it to a true hour.
-    """
-    return (moment.astimezone(UTC) + timedelta(hours=1)).astimezone(moment.tzinfo)
+    for moment in moments:
+        if moment.date() != day:
+            day = moment.date()
+            day_type, season = day_kind(day, holidays)
+            table = tables[day_type][season]
+
+        peaks.append(PEAK_STATES[table[moment.hour]])
+
+    return peaks
+
+
+# A Time-of-Use off-peak stretch runs from Friday evening to Monday morning,
+# and a holiday adjoining a weekend extends it further. Eight days clears any
+# run of statutory holidays Ontario can produce, and the search is cheap.
+MAX_LOOKAHEAD_DAYS = 8
 
 
 def next_peak_change(
@@ -140,24 +358,206 @@ def next_peak_change(
     Returns None where there is nothing to look forward to, which is any
     sector without peak periods.
 
-    Peaks only ever change on the hour, so only hour boundaries are tested.
+    Works a day at a time from each day's period boundaries, so an off-peak
+    weekend or holiday, a single period, is passed over in one step. Each
+    boundary is built from its date and hour in the local zone rather than by
+    adding hours, which keeps it right across daylight saving changes. None of
+    the boundary hours fall in the hour a change skips or repeats.
     """
     if energy_sector != SECTOR_ELECTRICITY:
         return None
 
-    current = active_peak(
-        moment, holidays, energy_sector=energy_sector, ulo_enabled=ulo_enabled
+    changes = _peak_changes(moment, holidays, _plan(ulo_enabled))
+    next(changes)
+
+    if (change := next(changes, None)) is None:
+        return None
+
+    return change[0], PEAK_STATES[change[1]]
+
+
+def _peak_changes(
+    moment: datetime, holidays: Container[date], plan: int
+) -> Iterator[tuple[datetime, int]]:
+    """The peak at ``moment``, then each change after it and its new peak.
+
+    Each date is resolved once as the walk reaches it. Ends once a change is
+    more than MAX_LOOKAHEAD_DAYS away.
+    """
+    day = moment.date()
+    day_type, season = day_kind(day, holidays)
+    current = PEAK_TABLES[plan][day_type][season][moment.hour]
+    quiet_days = 0
+
+    yield moment, current
+
+    while quiet_days <= MAX_LOOKAHEAD_DAYS:
+        for hour, code in PEAK_BOUNDARIES[plan][day_type][season]:
+            if code == current:
+                continue
+
+            change = datetime.combine(day, time(hour), moment.tzinfo)
+
+            if change > moment:
+                yield change, code
+                current = code
+                quiet_days = 0
+
+        day += timedelta(days=1)
+        day_type, season = day_kind(day, holidays)
+        quiet_days += 1
+
+
+def peak_spans(
+    start: datetime,
+    end: datetime,
+    holidays: Container[date],
+    *,
+    energy_sector: str,
+    ulo_enabled: bool,
+) -> list[tuple[str, float]]:
+    """How many seconds between two moments fall in each peak period.
+
+    Returns the periods in order, a period appearing once for each stretch of
+    it, so a span with no peak change in it is a single entry. Seconds are
+    counted on the UTC timeline, so a span across a daylight saving change is
+    as long as it really was.
+
+    A meter read at two moments says how much was used between them but not
+    when; splitting at each change lets what was used be priced in proportion
+    to the time spent in each period. The work is one step of the walk
+    next_peak_change takes per change in the span, a handful a day, and each
+    date is resolved once.
+    """
+    if energy_sector != SECTOR_ELECTRICITY:
+        return [(STATE_NO_PEAK, max(end.timestamp() - start.timestamp(), 0.0))]
+
+    changes = _peak_changes(start, holidays, _plan(ulo_enabled))
+    _, code = next(changes)
+    spans = []
+
+    for change, next_code in changes:
+        if change >= end:
+            break
+
+        spans.append((PEAK_STATES[code], change.timestamp() - start.timestamp()))
+        start, code = change, next_code
+
+    spans.append((PEAK_STATES[code], max(end.timestamp() - start.timestamp(), 0.0)))
+
+    return spans
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SECONDS_PER_HOUR = 60 * 60
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def classify_peaks(
+    instants: Any,
+    holidays: Container[date],
+    *,
+    zone: tzinfo,
+    energy_sector: str,
+    ulo_enabled: bool,
+) -> "np.ndarray":
+    """Find the active peak for many UTC instants at once.
+
+    Takes a NumPy ``datetime64`` array, or anything array-like of seconds since
+    the epoch, and returns an array of the same shape holding each instant's
+    position in PEAK_STATES. This is active_peak for cost studies over months
+    or years of interval data, where calling it per instant is far too slow.
+
+    Local time comes from the zone's offsets across the span, found once per
+    daylight saving change rather than per instant, and each date in the span
+    is resolved with day_kind, so the two always agree.
+
+    NumPy is imported here rather than at the top of the module: the
+    integration never classifies in bulk and does not depend on it.
+    """
+    import numpy as np
+
+    seconds = _epoch_seconds(np, instants)
+    codes = np.zeros(seconds.shape, dtype=np.uint8)
+
+    if energy_sector != SECTOR_ELECTRICITY or not seconds.size:
+        return codes
+
+    changes, offsets = _utc_offsets(int(seconds.min()), int(seconds.max()), zone)
+    period = np.searchsorted(np.array(changes), seconds, side="right") - 1
+    local = seconds + np.array(offsets, dtype=np.int64)[period]
+    days, clock = np.divmod(local, SECONDS_PER_DAY)
+
+    first_day = int(days.min())
+    kinds = np.array(
+        [
+            day_kind(date.fromordinal(EPOCH_ORDINAL + day), holidays)
+            for day in range(first_day, int(days.max()) + 1)
+        ],
+        dtype=np.intp,
     )
+    tables = np.array(
+        [
+            [list(table) for table in seasons]
+            for seasons in PEAK_TABLES[_plan(ulo_enabled)]
+        ],
+        dtype=np.uint8,
+    )
+    index = days - first_day
 
-    probe = moment.replace(minute=0, second=0, microsecond=0)
+    codes[...] = tables[kinds[index, 0], kinds[index, 1], clock // SECONDS_PER_HOUR]
 
-    for _ in range(MAX_LOOKAHEAD_HOURS):
-        probe = _next_hour(probe)
-        upcoming = active_peak(
-            probe, holidays, energy_sector=energy_sector, ulo_enabled=ulo_enabled
-        )
+    return codes
+
+
+def _epoch_seconds(np: Any, instants: Any) -> "np.ndarray":
+    """Whole seconds since the epoch, as int64, from datetimes or numbers."""
+    array = np.asarray(instants)
+
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[s]").astype(np.int64)
+    if array.dtype.kind == "f":
+        return np.floor(array).astype(np.int64)
+
+    return array.astype(np.int64)
+
+
+def _utc_offsets(first: int, last: int, zone: tzinfo) -> tuple[list[int], list[int]]:
+    """The zone's UTC offsets between two instants, in seconds since the epoch.
+
+    Returns the instants the offset takes effect, starting with ``first``, and
+    the offset from each. The span is probed a day at a time and bisected to
+    the second wherever the offset differs, which finds every change a zone
+    that changes at most once a day makes.
+    """
+
+    def offset(instant: int) -> int:
+        if (utcoffset := datetime.fromtimestamp(instant, zone).utcoffset()) is None:
+            raise ValueError(f"{zone} gives no UTC offset for local time")
+
+        return int(utcoffset.total_seconds())
+
+    changes = [first]
+    offsets = [offset(first)]
+    start = first
+
+    while start < last:
+        end = min(start + SECONDS_PER_DAY, last)
+
+        if offset(end) != offsets[-1]:
+            before, after = start, end
+
+            while after - before > 1:
+                middle = (before + after) // 2
+
+                if offset(middle) == offsets[-1]:
+                    before = middle
+                else:
+                    after = middle
+
+            changes.append(after)
+            offsets.append(offset(after))
 
-        if upcoming != current:
-            return probe, upcoming
+        start = end
 
-    return None
+    return changes, offsets
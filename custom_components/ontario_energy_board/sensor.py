@@ -7,7 +7,8 @@ than a new class.
 
 from collections.abc import Callable
 from dataclasses import dataclass, replace
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -17,26 +18,41 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfVolume
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
-from homeassistant.util.dt import as_local, now
+from homeassistant.util import dt as dt_util
 
-from . import billing, peaks
+from .advisor import PlanComparison
 from .const import (
+    CONF_CIRCUIT_ENTITIES,
+    CONF_CONSUMPTION_ENTITY,
     CURRENCY_UNIT,
     DOMAIN,
     ELECTRICITY_RATE_UNIT_OF_MEASURE,
     NATURAL_GAS_RATE_UNIT_OF_MEASURE,
-    PEAK_KEY_MAPPINGS,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    RATE_PLANS,
     SEASON_OPTIONS,
     SECTOR_ELECTRICITY,
-    STATE_SUMMER,
-    STATE_WINTER,
+    TIER_OPTIONS,
     TOU_PEAK_OPTIONS,
     ULO_PEAK_OPTIONS,
 )
+from .consumption import (
+    ConsumptionCosts,
+    GasMeterCost,
+    MeterCost,
+    MeterCostExtraStoredData,
+    MonthlyMeterCost,
+    PlanAdvisorMeter,
+    TieredMeterCost,
+)
 from .coordinator import OntarioEnergyBoardDataUpdateCoordinator
 from .entity import OntarioEnergyBoardEntity
 
@@ -47,31 +63,37 @@ class OntarioEnergyBoardSensorEntityDescription(SensorEntityDescription):
 
     value_fn: Callable[[OntarioEnergyBoardDataUpdateCoordinator], StateType]
     # Most values only change when the coordinator refreshes, once a day. Only
-    # the few derived from the wall clock need the platform to poll them.
+    # the few derived from the wall clock are re-rendered as the peak changes.
     clock_dependent: bool = False
 
 
+@dataclass(frozen=True, kw_only=True)
+class OntarioEnergyBoardMonthToDateSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor read from how much a meter has counted this month."""
+
+    value_fn: Callable[
+        [OntarioEnergyBoardDataUpdateCoordinator, float, datetime], StateType
+    ]
+
+
+@dataclass(frozen=True, kw_only=True)
+class OntarioEnergyBoardPlanComparisonSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor read from what the last 30 days cost on each plan."""
+
+    value_fn: Callable[
+        [OntarioEnergyBoardDataUpdateCoordinator, PlanComparison], StateType
+    ]
+
+
 def _active_peak(coordinator: OntarioEnergyBoardDataUpdateCoordinator) -> str:
-    return peaks.active_peak(
-        as_local(now()),
-        coordinator.ontario_holidays,
-        energy_sector=coordinator.energy_sector,
-        ulo_enabled=coordinator.ulo_enabled,
-    )
+    return coordinator.clock_values().active_peak
 
 
 def _current_rate(
     coordinator: OntarioEnergyBoardDataUpdateCoordinator,
 ) -> StateType:
     """The rate in effect right now, per the entry's sector and rate plan."""
-    company_data = coordinator.company_data
-
-    if coordinator.energy_sector != SECTOR_ELECTRICITY:
-        return company_data.get("gas_supply_charge")
-
-    mapping = PEAK_KEY_MAPPINGS.get(_active_peak(coordinator))
-
-    return None if mapping is None else company_data.get(mapping)
+    return coordinator.clock_values().current_rate
 
 
 def _current_all_in_rate(
@@ -81,30 +103,15 @@ def _current_all_in_rate(
     included.
 
     Gas is excluded: its delivery is banded by monthly volume, so a marginal
-    rate would depend on which tier the month has reached.
+    rate depends on which tier the month has reached. That takes a gas meter,
+    and OntarioEnergyBoardMonthToDateSensor. The tiered plan is the same.
     """
-    if coordinator.energy_sector != SECTOR_ELECTRICITY:
-        return None
-
-    return billing.marginal_rate(coordinator.company_data, _current_rate(coordinator))
-
-
-def _next_change(
-    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
-) -> tuple[datetime, str] | None:
-    return peaks.next_peak_change(
-        as_local(now()),
-        coordinator.ontario_holidays,
-        energy_sector=coordinator.energy_sector,
-        ulo_enabled=coordinator.ulo_enabled,
-    )
+    return coordinator.clock_values().current_all_in_rate
 
 
 def _next_peak(coordinator: OntarioEnergyBoardDataUpdateCoordinator) -> StateType:
     """Which peak period comes next."""
-    change = _next_change(coordinator)
-
-    return None if change is None else change[1]
+    return coordinator.clock_values().next_peak
 
 
 def _next_peak_starts_at(
@@ -116,34 +123,92 @@ def _next_peak_starts_at(
     timestamp as relative time on its own, and an instant is what an automation
     can act on.
     """
-    change = _next_change(coordinator)
-
-    return None if change is None else change[0]
+    return coordinator.clock_values().next_peak_starts_at
 
 
 def _next_peak_commodity_rate(
     coordinator: OntarioEnergyBoardDataUpdateCoordinator,
 ) -> StateType:
-    change = _next_change(coordinator)
+    return coordinator.clock_values().next_peak_rate
+
 
-    if change is None:
+def _next_peak_all_in_rate(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+) -> StateType:
+    return coordinator.clock_values().next_peak_all_in_rate
+
+
+def _season(coordinator: OntarioEnergyBoardDataUpdateCoordinator) -> str:
+    return coordinator.clock_values().season
+
+
+def _gas_all_in_rate(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+    month_to_date: float,
+    moment: datetime,
+) -> StateType:
+    return coordinator.gas_rates.marginal_rate(month_to_date)
+
+
+def _tier(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+    month_to_date: float,
+    moment: datetime,
+) -> str | None:
+    """The tier the month's kWh have reached, against the season's threshold."""
+    rates = coordinator.electricity_rates
+
+    if (threshold := rates.tier_threshold_at(moment)) is None:
         return None
 
-    mapping = PEAK_KEY_MAPPINGS.get(change[1])
+    return rates.tier(month_to_date, threshold)
+
+
+def _tier_rate(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+    month_to_date: float,
+    moment: datetime,
+) -> StateType:
+    if (tier := _tier(coordinator, month_to_date, moment)) is None:
+        return None
 
-    return None if mapping is None else coordinator.company_data.get(mapping)
+    return coordinator.electricity_rates.commodity_rates.get(tier)
 
 
-def _next_peak_all_in_rate(
+def _tier_all_in_rate(
     coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+    month_to_date: float,
+    moment: datetime,
 ) -> StateType:
-    return billing.marginal_rate(
-        coordinator.company_data, _next_peak_commodity_rate(coordinator)
-    )
+    if (tier := _tier(coordinator, month_to_date, moment)) is None:
+        return None
 
+    return coordinator.electricity_rates.all_in_rates.get(tier)
 
-def _season(coordinator: OntarioEnergyBoardDataUpdateCoordinator) -> str:
-    return STATE_SUMMER if peaks.is_summer(as_local(now())) else STATE_WINTER
+
+def _cheapest_rate_plan(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator, comparison: PlanComparison
+) -> StateType:
+    return comparison.cheapest
+
+
+def _rate_plan_savings(
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator, comparison: PlanComparison
+) -> StateType:
+    """How much less the cheapest plan would have cost than the entry's own."""
+    return comparison.savings(coordinator.rate_plan)
+
+
+def _plan_cost(
+    rate_plan: str,
+) -> Callable[[OntarioEnergyBoardDataUpdateCoordinator, PlanComparison], StateType]:
+    def value_fn(
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        comparison: PlanComparison,
+    ) -> StateType:
+        return comparison.costs.get(rate_plan)
+
+    return value_fn
 
 
 def _numeric(
@@ -283,6 +348,48 @@ CURRENT_ALL_IN_RATE = OntarioEnergyBoardSensorEntityDescription(
     clock_dependent=True,
 )
 
+# Priced from a meter's month to date rather than the clock.
+CURRENT_ALL_IN_RATE_NATURAL_GAS = OntarioEnergyBoardMonthToDateSensorEntityDescription(
+    key="current_all_in_rate",
+    translation_key="current_all_in_rate",
+    native_unit_of_measurement=NATURAL_GAS_RATE_UNIT_OF_MEASURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=4,
+    value_fn=_gas_all_in_rate,
+)
+
+CURRENT_RATE_TIERED = OntarioEnergyBoardMonthToDateSensorEntityDescription(
+    key="current_rate",
+    translation_key="current_rate",
+    native_unit_of_measurement=ELECTRICITY_RATE_UNIT_OF_MEASURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=4,
+    value_fn=_tier_rate,
+)
+
+CURRENT_ALL_IN_RATE_TIERED = OntarioEnergyBoardMonthToDateSensorEntityDescription(
+    key="current_all_in_rate",
+    translation_key="current_all_in_rate",
+    native_unit_of_measurement=ELECTRICITY_RATE_UNIT_OF_MEASURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    suggested_display_precision=4,
+    value_fn=_tier_all_in_rate,
+)
+
+ACTIVE_TIER = OntarioEnergyBoardMonthToDateSensorEntityDescription(
+    key="active_tier",
+    translation_key="active_tier",
+    device_class=SensorDeviceClass.ENUM,
+    options=TIER_OPTIONS,
+    value_fn=_tier,
+)
+
+MONTH_TO_DATE_TIERED = (
+    CURRENT_RATE_TIERED,
+    CURRENT_ALL_IN_RATE_TIERED,
+    ACTIVE_TIER,
+)
+
 NEXT_PEAK_STARTS_AT = OntarioEnergyBoardSensorEntityDescription(
     key="next_peak_starts_at",
     translation_key="next_peak_starts_at",
@@ -321,6 +428,63 @@ SEASON = OntarioEnergyBoardSensorEntityDescription(
     clock_dependent=True,
 )
 
+# Not a value_fn sensor: its state is accumulated from another entity's, and
+# survives restarts, rather than read from the coordinator.
+ENERGY_COST = SensorEntityDescription(
+    key="energy_cost",
+    translation_key="energy_cost",
+    device_class=SensorDeviceClass.MONETARY,
+    state_class=SensorStateClass.TOTAL,
+    native_unit_of_measurement=CURRENCY_UNIT,
+    suggested_display_precision=2,
+)
+
+
+# Priced from a meter's last 30 days, split into every plan's periods. Rolling
+# totals go down as well as up, so none of them has a state class.
+CHEAPEST_RATE_PLAN = OntarioEnergyBoardPlanComparisonSensorEntityDescription(
+    key="cheapest_rate_plan",
+    translation_key="cheapest_rate_plan",
+    device_class=SensorDeviceClass.ENUM,
+    options=RATE_PLANS,
+    value_fn=_cheapest_rate_plan,
+)
+
+PLAN_COMPARISON_SENSORS = (
+    OntarioEnergyBoardPlanComparisonSensorEntityDescription(
+        key="rate_plan_savings",
+        translation_key="rate_plan_savings",
+        device_class=SensorDeviceClass.MONETARY,
+        native_unit_of_measurement=CURRENCY_UNIT,
+        suggested_display_precision=2,
+        value_fn=_rate_plan_savings,
+    ),
+    *(
+        OntarioEnergyBoardPlanComparisonSensorEntityDescription(
+            key=f"{rate_plan}_cost",
+            translation_key=f"{rate_plan}_cost",
+            device_class=SensorDeviceClass.MONETARY,
+            native_unit_of_measurement=CURRENCY_UNIT,
+            suggested_display_precision=2,
+            value_fn=_plan_cost(rate_plan),
+        )
+        for rate_plan in (
+            RATE_PLAN_TIME_OF_USE,
+            RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+            RATE_PLAN_TIERED,
+        )
+    ),
+)
+
+
+def _circuit_cost_description(entity_id: str) -> SensorEntityDescription:
+    """The cost of one circuit, named for the circuit's meter."""
+    return replace(
+        ENERGY_COST,
+        key=f"circuit_cost_{entity_id}",
+        translation_key="circuit_cost",
+    )
+
 
 TOU_RATE_SENSORS = (
     _rate("time_of_use_off_peak_price", "off_peak_rate"),
@@ -335,6 +499,11 @@ ULO_RATE_SENSORS = (
     _rate("ultra_low_overnight_on_peak_rate", "ulo_on_peak_rate"),
 )
 
+TIERED_RATE_SENSORS = (
+    _rate("lower_tier_price", "lower_tier_price"),
+    _rate("higher_tier_price", "higher_tier_price"),
+)
+
 # Everything needed to reconstruct a bill, off by default. The README documents
 # this use case; enable what you need in the entity registry.
 ELECTRICITY_DIAGNOSTIC_SENSORS = (
@@ -349,8 +518,6 @@ ELECTRICITY_DIAGNOSTIC_SENSORS = (
     _rate("wholesale_market_service_charge", "wholesale_market_service_charge"),
     _rate("rural_remote_rate_protection", "rural_remote_rate_protection"),
     _rate("debt_retirement_charge", "debt_retirement_charge"),
-    _rate("lower_tier_price", "lower_tier_price"),
-    _rate("higher_tier_price", "higher_tier_price"),
     # Fixed amounts.
     OntarioEnergyBoardSensorEntityDescription(
         key="monthly_fixed_charge",
@@ -529,30 +696,46 @@ def descriptions_for(
             ),
         ]
 
-    peak_options = ULO_PEAK_OPTIONS if coordinator.ulo_enabled else TOU_PEAK_OPTIONS
-
-    descriptions = [
-        CURRENT_RATE_ELECTRICITY,
-        CURRENT_ALL_IN_RATE,
-        _active_peak_description(peak_options),
-        _next_peak_description(peak_options),
-        NEXT_PEAK_STARTS_AT,
-        NEXT_PEAK_RATE,
-        NEXT_PEAK_ALL_IN_RATE,
-    ]
-
-    # Only Time-of-Use swaps its schedule between summer and winter.
-    if not coordinator.ulo_enabled:
+    rate_plan = coordinator.rate_plan
+    descriptions: list[OntarioEnergyBoardSensorEntityDescription] = []
+
+    # The tiered plan's price follows the month's consumption rather than the
+    # clock, so it has no peaks. Its current rates come with a meter.
+    if rate_plan != RATE_PLAN_TIERED:
+        peak_options = (
+            ULO_PEAK_OPTIONS
+            if rate_plan == RATE_PLAN_ULTRA_LOW_OVERNIGHT
+            else TOU_PEAK_OPTIONS
+        )
+        descriptions.extend(
+            (
+                CURRENT_RATE_ELECTRICITY,
+                CURRENT_ALL_IN_RATE,
+                _active_peak_description(peak_options),
+                _next_peak_description(peak_options),
+                NEXT_PEAK_STARTS_AT,
+                NEXT_PEAK_RATE,
+                NEXT_PEAK_ALL_IN_RATE,
+            )
+        )
+
+    # Time-of-Use swaps its schedule between summer and winter, and the tiered
+    # plan its threshold. Ultra-Low Overnight is the same all year.
+    if rate_plan != RATE_PLAN_ULTRA_LOW_OVERNIGHT:
         descriptions.append(SEASON)
 
-    # Both plans' rates are published as enabled diagnostics, rather than
+    # Every plan's rates are published as enabled diagnostics, rather than
     # promoting whichever plan is configured. entity_registry_enabled_default
     # only applies the first time an entity is registered, so a split could not
     # follow a plan changed later from the options: the newly relevant rates
-    # would stay disabled. Publishing both also lets the two be compared.
+    # would stay disabled. Publishing them all also lets the plans be compared.
     descriptions.extend(
         _as_shown_diagnostic(description)
-        for description in (*TOU_RATE_SENSORS, *ULO_RATE_SENSORS)
+        for description in (
+            *TOU_RATE_SENSORS,
+            *ULO_RATE_SENSORS,
+            *TIERED_RATE_SENSORS,
+        )
     )
     descriptions.extend(
         _as_diagnostic(description) for description in ELECTRICITY_DIAGNOSTIC_SENSORS
@@ -569,10 +752,111 @@ async def async_setup_entry(
     """Set up the Ontario Energy Board sensors."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
+    entities: list[SensorEntity] = [
         OntarioEnergyBoardSensor(coordinator, description)
         for description in descriptions_for(coordinator)
+    ]
+
+    entities.extend(_energy_cost_sensors(hass, entry, coordinator))
+
+    async_add_entities(entities)
+
+
+def _energy_cost_sensors(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+) -> list[SensorEntity]:
+    """A cost sensor for the consumption sensor and each circuit, if any.
+
+    A gas meter also gets the all-in rate of its next m³, and a meter on the
+    tiered plan the tier and rates of its next kWh, all of which depend on the
+    month to date. Circuits are priced by the clock, so only where the plan
+    follows it. An electricity meter is also compared across the plans, on
+    any plan. All of them are priced by one ConsumptionCosts, started here
+    and stopped with the entry.
+    """
+    is_electricity = coordinator.energy_sector == SECTOR_ELECTRICITY
+    consumption_entity_id = entry.options.get(CONF_CONSUMPTION_ENTITY)
+    circuit_entity_ids = (
+        entry.options.get(CONF_CIRCUIT_ENTITIES, [])
+        if coordinator.follows_peaks
+        else []
+    )
+
+    if not consumption_entity_id and not circuit_entity_ids:
+        return []
+
+    consumption_costs = ConsumptionCosts(
+        hass,
+        coordinator,
+        filter(None, [consumption_entity_id, *circuit_entity_ids]),
     )
+    entry.async_on_unload(consumption_costs.async_start())
+
+    sensors: list[SensorEntity] = []
+
+    if consumption_entity_id and coordinator.follows_peaks:
+        sensors.append(
+            OntarioEnergyBoardEnergyCostSensor(
+                coordinator,
+                ENERGY_COST,
+                consumption_costs,
+                MeterCost(consumption_entity_id),
+            )
+        )
+    elif consumption_entity_id:
+        meter: MonthlyMeterCost
+
+        if is_electricity:
+            meter = TieredMeterCost(consumption_entity_id)
+            month_to_date = MONTH_TO_DATE_TIERED
+        else:
+            meter = GasMeterCost(consumption_entity_id)
+            month_to_date = (CURRENT_ALL_IN_RATE_NATURAL_GAS,)
+
+        sensors.append(
+            OntarioEnergyBoardEnergyCostSensor(
+                coordinator, ENERGY_COST, consumption_costs, meter
+            )
+        )
+        sensors.extend(
+            OntarioEnergyBoardMonthToDateSensor(
+                coordinator, description, consumption_costs, meter
+            )
+            for description in month_to_date
+        )
+
+    if consumption_entity_id and is_electricity:
+        advisor = PlanAdvisorMeter(consumption_entity_id)
+        sensors.append(
+            OntarioEnergyBoardPlanAdvisorSensor(
+                coordinator, CHEAPEST_RATE_PLAN, consumption_costs, advisor
+            )
+        )
+        sensors.extend(
+            OntarioEnergyBoardPlanComparisonSensor(
+                coordinator, description, consumption_costs, advisor
+            )
+            for description in PLAN_COMPARISON_SENSORS
+        )
+
+    for entity_id in dict.fromkeys(circuit_entity_ids):
+        # Named for the meter as it stands at setup.
+        state = hass.states.get(entity_id)
+        sensors.append(
+            OntarioEnergyBoardEnergyCostSensor(
+                coordinator,
+                _circuit_cost_description(entity_id),
+                consumption_costs,
+                MeterCost(entity_id),
+                translation_placeholders={
+                    "circuit": entity_id if state is None else state.name
+                },
+            )
+        )
+
+    return sensors
 
 
 class OntarioEnergyBoardSensor(OntarioEnergyBoardEntity, SensorEntity):
@@ -583,3 +867,226 @@ class OntarioEnergyBoardSensor(OntarioEnergyBoardEntity, SensorEntity):
     @property
     def native_value(self) -> StateType:
         return self.entity_description.value_fn(self.coordinator)
+
+
+class OntarioEnergyBoardEnergyCostSensor(
+    OntarioEnergyBoardEntity, RestoreEntity, SensorEntity
+):
+    """What the energy counted by a meter has cost, all in.
+
+    Home Assistant's Energy dashboard prices consumption from the current
+    all-in rate on its own. This keeps a running total on the device instead,
+    for dashboards and automations, by pricing each increase of a cumulative
+    kWh sensor as it is reported. The readings are followed and priced by the
+    entry's ConsumptionCosts, which this only presents and restores.
+
+    The total and the last reading are restored on restart, and what was used
+    while Home Assistant was down is priced from the first reading after it.
+    """
+
+    def __init__(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        description: SensorEntityDescription,
+        consumption_costs: ConsumptionCosts,
+        meter: MeterCost,
+        *,
+        translation_placeholders: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(coordinator, description)
+
+        if translation_placeholders is not None:
+            self._attr_translation_placeholders = translation_placeholders
+
+        self._consumption_costs = consumption_costs
+        self._meter = meter
+
+    @property
+    def native_value(self) -> float:
+        return self._meter.cost
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"consumption_entity": self._meter.entity_id}
+
+    @property
+    def extra_restore_state_data(self) -> MeterCostExtraStoredData:
+        return self._meter.stored()
+
+    async def async_added_to_hass(self) -> None:
+        """Carry on from the last reading, then follow the meter."""
+        if (last := await self.async_get_last_extra_data()) is not None and (
+            restored := MeterCostExtraStoredData.from_dict(last.as_dict())
+        ) is not None:
+            self._meter.restore(restored)
+
+        self._meter.read(self.hass.states.get(self._meter.entity_id), self.coordinator)
+
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self._consumption_costs.async_follow(
+                self._meter, self._async_write_if_changed
+            )
+        )
+        # Anything else showing the meter was added before it was restored.
+        self._consumption_costs.async_moved(self._meter)
+
+
+class OntarioEnergyBoardMonthToDateSensor(OntarioEnergyBoardEntity, SensorEntity):
+    """A rate that depends on how much has been used so far this month.
+
+    Gas delivery is banded by the month's volume, and the tiered plan's price
+    by the month's kWh, so neither rate can be known from the rates alone. It
+    comes from the meter's month to date, which the entry's cost sensor keeps
+    and restores, and drops back to the start when a month begins.
+    """
+
+    entity_description: OntarioEnergyBoardMonthToDateSensorEntityDescription
+    _unsub_month: CALLBACK_TYPE | None = None
+
+    def __init__(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        description: OntarioEnergyBoardMonthToDateSensorEntityDescription,
+        consumption_costs: ConsumptionCosts,
+        meter: MonthlyMeterCost,
+    ) -> None:
+        super().__init__(coordinator, description)
+
+        self._consumption_costs = consumption_costs
+        self._meter = meter
+
+    @property
+    def native_value(self) -> StateType:
+        moment = dt_util.now()
+
+        return self.entity_description.value_fn(
+            self.coordinator, self._meter.month_to_date(moment), moment
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self._consumption_costs.async_follow(
+                self._meter, self._async_write_if_changed
+            )
+        )
+        self._async_schedule_month()
+        self.async_on_remove(self._async_cancel_month)
+
+    @callback
+    def _async_schedule_month(self) -> None:
+        today = dt_util.now().date()
+        next_month = (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+        self._unsub_month = async_track_point_in_time(
+            self.hass, self._handle_new_month, dt_util.start_of_local_day(next_month)
+        )
+
+    @callback
+    def _async_cancel_month(self) -> None:
+        if self._unsub_month is not None:
+            self._unsub_month()
+            self._unsub_month = None
+
+    @callback
+    def _handle_new_month(self, _now: datetime) -> None:
+        self._async_schedule_month()
+        self._async_write_if_changed()
+
+
+class OntarioEnergyBoardPlanComparisonSensor(OntarioEnergyBoardEntity, SensorEntity):
+    """Something of what the meter's last 30 days would have cost on each plan.
+
+    The plans are priced from the window's totals, a few multiplications, each
+    time the state is rendered. The window is kept by the entry's advisor
+    sensor, which this only follows.
+    """
+
+    entity_description: OntarioEnergyBoardPlanComparisonSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: OntarioEnergyBoardDataUpdateCoordinator,
+        description: OntarioEnergyBoardPlanComparisonSensorEntityDescription,
+        consumption_costs: ConsumptionCosts,
+        meter: PlanAdvisorMeter,
+    ) -> None:
+        super().__init__(coordinator, description)
+
+        self._consumption_costs = consumption_costs
+        self._meter = meter
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(
+            self.coordinator, self._meter.comparison(self.coordinator, dt_util.now())
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        self.async_on_remove(
+            self._consumption_costs.async_follow(
+                self._meter, self._async_write_if_changed
+            )
+        )
+
+
+class OntarioEnergyBoardPlanAdvisorSensor(
+    OntarioEnergyBoardPlanComparisonSensor, RestoreEntity
+):
+    """The plan the meter's last 30 days would have cost least on.
+
+    This one keeps the window: it restores it on restart, and rolls it on at
+    each midnight, so days drop out of it even while the meter is quiet.
+    """
+
+    _unsub_midnight: CALLBACK_TYPE | None = None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"consumption_entity": self._meter.entity_id}
+
+    @property
+    def extra_restore_state_data(self) -> MeterCostExtraStoredData:
+        return self._meter.stored()
+
+    async def async_added_to_hass(self) -> None:
+        """Carry on from the saved window, then follow the meter."""
+        if (last := await self.async_get_last_extra_data()) is not None and (
+            restored := MeterCostExtraStoredData.from_dict(last.as_dict())
+        ) is not None:
+            self._meter.restore(restored)
+
+        self._meter.advance(dt_util.now())
+        self._meter.read(self.hass.states.get(self._meter.entity_id), self.coordinator)
+
+        await super().async_added_to_hass()
+
+        self._async_schedule_midnight()
+        self.async_on_remove(self._async_cancel_midnight)
+        # Anything else showing the meter was added before it was restored.
+        self._consumption_costs.async_moved(self._meter)
+
+    @callback
+    def _async_schedule_midnight(self) -> None:
+        tomorrow = dt_util.now().date() + timedelta(days=1)
+
+        self._unsub_midnight = async_track_point_in_time(
+            self.hass, self._handle_midnight, dt_util.start_of_local_day(tomorrow)
+        )
+
+    @callback
+    def _async_cancel_midnight(self) -> None:
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    @callback
+    def _handle_midnight(self, now: datetime) -> None:
+        self._async_schedule_midnight()
+        self._meter.advance(now)
+        self._consumption_costs.async_moved(self._meter)
@@ -0,0 +1,256 @@
+"""The compare_plans service: a meter's history priced on every rate plan.
+
+The live advisor only sees the last 30 days. This answers for any range, from
+the hourly long-term statistics the recorder keeps of the meter. A range can
+span years, so it is taken a month at a time: each month's statistics are
+fetched and priced in the recorder's executor, and only the month's bills come
+back to the event loop, so neither the loop nor memory sees the whole range at
+once. A month is also the tiered plan's unit, so each is billed whole.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+import logging
+from typing import Any, Final
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .advisor import PlanBill, bill_plans, hourly_usage
+from .billing import ElectricityRates
+from .const import CONF_CONSUMPTION_ENTITY, DOMAIN, SECTOR_ELECTRICITY
+from .ontario_holidays import observed_holidays
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+SERVICE_COMPARE_PLANS = "compare_plans"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+
+COMPARE_PLANS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(CONF_CONSUMPTION_ENTITY): cv.entity_id,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services, once for every entry."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPARE_PLANS,
+        _async_compare_plans,
+        schema=COMPARE_PLANS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def _async_compare_plans(call: ServiceCall) -> ServiceResponse:
+    """Price a meter's recorded consumption on every plan, at today's rates."""
+    hass = call.hass
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={
+                "config_entry_id": call.data[ATTR_CONFIG_ENTRY_ID]
+            },
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"entry_title": entry.title},
+        )
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    if coordinator.energy_sector != SECTOR_ELECTRICITY:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="no_rate_plans"
+        )
+
+    statistic_id = call.data.get(
+        CONF_CONSUMPTION_ENTITY, entry.options.get(CONF_CONSUMPTION_ENTITY)
+    )
+
+    if not statistic_id:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="no_consumption_entity",
+            translation_placeholders={"entry_title": entry.title},
+        )
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="recorder_required"
+        )
+
+    start = _local(call.data[ATTR_START])
+    end = _local(call.data.get(ATTR_END, dt_util.now()))
+
+    if start >= end:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="invalid_range"
+        )
+
+    rates: ElectricityRates = coordinator.electricity_rates
+    recorder = get_instance(hass)
+    # The entry's calendar only covers the years a lookup today can reach.
+    holidays = await hass.async_add_executor_job(
+        observed_holidays, range(start.year, end.year + 1)
+    )
+
+    kwh = 0.0
+    hours = 0
+    bills: dict[str, PlanBill] = {}
+
+    # The range ends after it starts, so there is at least one month.
+    for index, (month_start, month_end) in enumerate(_months(start, end)):
+        month = await recorder.async_add_executor_job(
+            _bill_month, hass, statistic_id, month_start, month_end, rates, holidays
+        )
+        kwh += month.kwh
+        hours += month.hours
+        # A plan missing from any month cannot be totalled.
+        bills = (
+            month.bills
+            if index == 0
+            else {
+                plan: bill + month.bills[plan]
+                for plan, bill in bills.items()
+                if plan in month.bills
+            }
+        )
+
+    _LOGGER.debug(
+        "Priced %s hours of %s from %s to %s", hours, statistic_id, start, end
+    )
+
+    return {
+        CONF_CONSUMPTION_ENTITY: statistic_id,
+        ATTR_START: start.isoformat(),
+        ATTR_END: end.isoformat(),
+        "hours": hours,
+        "kwh": round(kwh, 3),
+        "cheapest": (
+            min(bills, key=lambda plan: bills[plan].bill.total) if bills else None
+        ),
+        "plans": {plan: _itemised(bill) for plan, bill in bills.items()},
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class _Month:
+    """One month's hours, and what they cost on each plan."""
+
+    kwh: float
+    hours: int
+    bills: dict[str, PlanBill]
+
+
+def _bill_month(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime,
+    end: datetime,
+    rates: ElectricityRates,
+    holidays: frozenset[date],
+) -> _Month:
+    """Fetch and price one month, or the part of it in the range.
+
+    Runs in the recorder's executor. A part month carries its share of the
+    fixed charges, and of the tiered threshold.
+    """
+    rows = statistics_during_period(
+        hass,
+        start,
+        end,
+        {statistic_id},
+        "hour",
+        {"energy": UnitOfEnergy.KILO_WATT_HOUR},
+        {"change"},
+    ).get(statistic_id, [])
+    hours = [
+        (dt_util.as_local(dt_util.utc_from_timestamp(row["start"])), change)
+        for row in rows
+        if (change := row.get("change")) is not None
+    ]
+    usage = hourly_usage(hours, holidays)
+    month_start, month_end = _month_around(start)
+
+    return _Month(
+        kwh=sum(kwh for _, kwh in hours),
+        hours=len(hours),
+        bills=bill_plans(
+            rates,
+            usage,
+            threshold=rates.tier_threshold_at(start),
+            months=(end - start) / (month_end - month_start),
+        ),
+    )
+
+
+def _itemised(plan_bill: PlanBill) -> dict[str, Any]:
+    """A plan's bill as the response carries it, to the cent and the Wh."""
+    bill = plan_bill.bill
+
+    return {
+        "usage": {period: round(kwh, 3) for period, kwh in plan_bill.usage.items()},
+        "electricity": round(bill.electricity, 2),
+        "delivery": round(bill.delivery, 2),
+        "regulatory": round(bill.regulatory, 2),
+        "subtotal": round(bill.subtotal, 2),
+        "hst": round(bill.hst, 2),
+        "rebate": round(bill.rebate, 2),
+        "total": round(bill.total, 2),
+    }
+
+
+def _local(moment: datetime) -> datetime:
+    """A moment in local time, taking one without a zone to be local already."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=dt_util.get_default_time_zone())
+
+    return dt_util.as_local(moment)
+
+
+def _month_around(moment: datetime) -> tuple[datetime, datetime]:
+    """The local midnights the month of ``moment`` starts and ends at."""
+    first = moment.date().replace(day=1)
+    following = first.replace(
+        year=first.year + first.month // 12, month=first.month % 12 + 1
+    )
+
+    return dt_util.start_of_local_day(first), dt_util.start_of_local_day(following)
+
+
+def _months(start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """The range, cut where each month begins."""
+    months = []
+
+    while start < end:
+        month_end = min(_month_around(start)[1], end)
+        months.append((start, month_end))
+        start = month_end
+
+    return months
@@ -79,6 +79,7 @@ async def ontario_timezone(hass):
 def build_config_entry(
     energy_company: str = ELECTRICITY_COMPANY,
     ulo_enabled: bool = False,
+    options: dict | None = None,
 ) -> MockConfigEntry:
     """Create a config entry matching what the config flow produces."""
     return MockConfigEntry(
@@ -90,6 +91,7 @@ def build_config_entry(
             CONF_ENERGY_COMPANY: energy_company,
             CONF_ULO_ENABLED: ulo_enabled,
         },
+        options=options or {},
     )
 
 
@@ -102,8 +104,9 @@ async def init_integration(
     async def _setup(
         energy_company: str = ELECTRICITY_COMPANY,
         ulo_enabled: bool = False,
+        options: dict | None = None,
     ) -> MockConfigEntry:
-        entry = build_config_entry(energy_company, ulo_enabled)
+        entry = build_config_entry(energy_company, ulo_enabled, options)
         entry.add_to_hass(hass)
         await hass.config_entries.async_setup(entry.entry_id)
         await hass.async_block_till_done()
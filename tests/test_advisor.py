@@ -0,0 +1,379 @@
+"""Tests for the rolling comparison of rate plans.
+
+These run without Home Assistant.
+"""
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
+import pytest
+
+from custom_components.ontario_energy_board.advisor import (
+    PERIODS,
+    WINDOW_DAYS,
+    RollingUsage,
+    bill_plans,
+    compare_plans,
+    hourly_usage,
+    split_usage,
+)
+from custom_components.ontario_energy_board.billing import ElectricityRates
+from custom_components.ontario_energy_board.const import (
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
+    STATE_MID_PEAK,
+    STATE_OFF_PEAK,
+    STATE_ON_PEAK,
+    STATE_ULO_MID_PEAK,
+    STATE_ULO_OFF_PEAK,
+    STATE_ULO_ON_PEAK,
+    STATE_ULO_OVERNIGHT,
+)
+
+ONTARIO = ZoneInfo("America/Toronto")
+ONTARIO_HOLIDAYS = country_holidays(
+    "CA", subdiv="ON", observed=True, categories={"public", "optional"}
+)
+
+# A residential company publishing every plan, under the parser's names.
+COMPANY = {
+    "loss_factor": 1.0383,
+    "monthly_fixed_charge": 38.24,
+    "distribution_variable_charge": 0.0039,
+    "retail_transmission_network_rate": 0.013,
+    "retail_transmission_connection_rate": 0.0099,
+    "wholesale_market_service_charge": 0.0047,
+    "rural_remote_rate_protection": 0.0006,
+    "standard_supply_service_charge": 0.25,
+    "harmonized_sales_tax": 0.13,
+    "ontario_electricity_rebate": 0.235,
+    "time_of_use_on_peak_price": 0.203,
+    "time_of_use_mid_peak_price": 0.157,
+    "time_of_use_off_peak_price": 0.098,
+    "ultra_low_overnight_on_peak_rate": 0.391,
+    "ultra_low_overnight_mid_peak_rate": 0.157,
+    "ultra_low_overnight_weekend_off_peak_rate": 0.098,
+    "ultra_low_overnight_overnight_rate": 0.039,
+    "tier_threshold": 600,
+    "lower_tier_price": 0.093,
+    "higher_tier_price": 0.11,
+}
+
+JULY = date(2024, 7, 10)
+
+
+def _usage(**kwh: float) -> dict[str, float]:
+    return dict(dict.fromkeys(PERIODS, 0.0), **kwh)
+
+
+def test_split_usage_shares_kwh_by_the_time_in_each_period():
+    # A summer Wednesday, 6 to 8 in the morning: the first hour is off-peak on
+    # Time-of-Use and overnight on Ultra-Low Overnight.
+    usage = split_usage(
+        datetime(2024, 7, 10, 6, tzinfo=ONTARIO),
+        datetime(2024, 7, 10, 8, tzinfo=ONTARIO),
+        2.0,
+        ONTARIO_HOLIDAYS,
+    )
+
+    assert usage == pytest.approx(
+        _usage(
+            **{
+                STATE_OFF_PEAK: 1.0,
+                STATE_MID_PEAK: 1.0,
+                STATE_ULO_OVERNIGHT: 1.0,
+                STATE_ULO_MID_PEAK: 1.0,
+            }
+        )
+    )
+
+
+def test_split_usage_counts_a_step_where_it_happened():
+    moment = datetime(2024, 7, 10, 12, tzinfo=ONTARIO)
+
+    assert split_usage(moment, moment, 0.5, ONTARIO_HOLIDAYS) == pytest.approx(
+        _usage(**{STATE_ON_PEAK: 0.5, STATE_ULO_MID_PEAK: 0.5})
+    )
+
+
+def test_a_day_adds_up_and_is_counted_once():
+    usage = RollingUsage()
+    usage.add(JULY, _usage(**{STATE_OFF_PEAK: 1.0, STATE_ULO_OFF_PEAK: 1.0}))
+    usage.add(JULY, _usage(**{STATE_OFF_PEAK: 2.0, STATE_ULO_OFF_PEAK: 2.0}))
+
+    assert usage.totals[STATE_OFF_PEAK] == 3.0
+    assert usage.totals[STATE_ULO_OFF_PEAK] == 3.0
+    assert usage.days_covered == 1
+
+
+def test_the_oldest_day_drops_out_as_the_window_rolls():
+    usage = RollingUsage()
+
+    for day in range(WINDOW_DAYS):
+        usage.add(JULY + timedelta(days=day), _usage(**{STATE_OFF_PEAK: day + 1}))
+
+    assert usage.totals[STATE_OFF_PEAK] == sum(range(1, WINDOW_DAYS + 1))
+    assert usage.days_covered == WINDOW_DAYS
+
+    usage.advance(JULY + timedelta(days=WINDOW_DAYS))
+
+    assert usage.totals[STATE_OFF_PEAK] == sum(range(2, WINDOW_DAYS + 1))
+    assert usage.days_covered == WINDOW_DAYS
+
+
+def test_a_quiet_spell_longer_than_the_window_empties_it():
+    usage = RollingUsage()
+    usage.add(JULY, _usage(**{STATE_ON_PEAK: 5.0}))
+    usage.advance(JULY + timedelta(days=WINDOW_DAYS + 10))
+
+    assert usage.totals == _usage()
+
+
+def test_a_late_reading_counts_on_its_own_day():
+    usage = RollingUsage()
+    usage.add(JULY + timedelta(days=5), _usage(**{STATE_ON_PEAK: 1.0}))
+    usage.add(JULY, _usage(**{STATE_ON_PEAK: 2.0}))
+    usage.add(JULY - timedelta(days=WINDOW_DAYS), _usage(**{STATE_ON_PEAK: 4.0}))
+
+    assert usage.totals[STATE_ON_PEAK] == 3.0
+
+    # The late day leaves the window before the newer one.
+    usage.advance(JULY + timedelta(days=WINDOW_DAYS))
+    assert usage.totals[STATE_ON_PEAK] == 1.0
+
+
+def test_the_window_stays_the_same_size():
+    usage = RollingUsage()
+
+    for day in range(3 * WINDOW_DAYS):
+        usage.add(JULY + timedelta(days=day), _usage(**{STATE_MID_PEAK: 1.0}))
+
+    assert usage.totals[STATE_MID_PEAK] == pytest.approx(WINDOW_DAYS)
+    assert all(len(daily) == WINDOW_DAYS for daily in usage.as_dict()["daily"].values())
+
+
+def test_a_saved_window_carries_on_as_it_would_have():
+    usage = RollingUsage()
+
+    for day in range(40):
+        usage.add(JULY + timedelta(days=day), _usage(**{STATE_OFF_PEAK: day}))
+
+    restored = RollingUsage.from_dict(usage.as_dict())
+
+    assert restored.totals == pytest.approx(usage.totals)
+    assert restored.days_covered == usage.days_covered
+
+    for window in (usage, restored):
+        window.add(JULY + timedelta(days=45), _usage(**{STATE_OFF_PEAK: 1.0}))
+
+    assert restored.totals == pytest.approx(usage.totals)
+
+
+def test_an_unreadable_window_is_refused():
+    with pytest.raises((KeyError, TypeError, ValueError)):
+        RollingUsage.from_dict({"day": "yesterday", "first_day": None, "daily": {}})
+
+
+def _a_month_of_readings() -> RollingUsage:
+    """30 days of 20 kWh a day, read every hour, from the first of June."""
+    usage = RollingUsage()
+    moment = datetime(2024, 6, 1, tzinfo=ONTARIO)
+
+    for _ in range(WINDOW_DAYS * 24):
+        end = moment + timedelta(hours=1)
+        usage.add(moment.date(), split_usage(moment, end, 20 / 24, ONTARIO_HOLIDAYS))
+        moment = end
+
+    return usage
+
+
+def test_clock_plans_cost_each_periods_kwh_at_its_marginal_rate():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    usage = _a_month_of_readings()
+    comparison = compare_plans(rates, usage, datetime(2024, 6, 30, tzinfo=ONTARIO))
+
+    for plan, periods in (
+        (RATE_PLAN_TIME_OF_USE, (STATE_OFF_PEAK, STATE_MID_PEAK, STATE_ON_PEAK)),
+        (
+            RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+            (
+                STATE_ULO_OVERNIGHT,
+                STATE_ULO_OFF_PEAK,
+                STATE_ULO_MID_PEAK,
+                STATE_ULO_ON_PEAK,
+            ),
+        ),
+    ):
+        assert sum(usage.totals[period] for period in periods) == pytest.approx(600)
+        assert comparison.costs[plan] == pytest.approx(
+            sum(
+                usage.totals[period]
+                * rates.marginal_rate(rates.commodity_rates[period])
+                for period in periods
+            )
+        )
+
+    # 600 kWh in June is exactly the summer threshold.
+    assert comparison.costs[RATE_PLAN_TIERED] == pytest.approx(
+        600 * rates.all_in_rates[STATE_LOWER_TIER]
+    )
+    assert comparison.days == WINDOW_DAYS
+
+
+def test_the_cheapest_plan_and_the_savings():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    comparison = compare_plans(
+        rates, _a_month_of_readings(), datetime(2024, 6, 30, tzinfo=ONTARIO)
+    )
+    cheapest = min(comparison.costs.values())
+
+    assert comparison.costs[comparison.cheapest] == cheapest
+    assert comparison.savings(comparison.cheapest) == 0
+    assert comparison.savings(RATE_PLAN_TIME_OF_USE) == pytest.approx(
+        comparison.costs[RATE_PLAN_TIME_OF_USE] - cheapest
+    )
+
+
+def test_a_new_window_is_allowed_its_share_of_the_threshold():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    usage = RollingUsage()
+    usage.add(JULY, _usage(**{STATE_OFF_PEAK: 50.0}))
+    comparison = compare_plans(rates, usage, datetime(2024, 7, 10, tzinfo=ONTARIO))
+
+    # One day of the summer threshold is 20 kWh.
+    assert comparison.costs[RATE_PLAN_TIERED] == pytest.approx(
+        20 * rates.all_in_rates[STATE_LOWER_TIER]
+        + 30 * rates.all_in_rates[STATE_HIGHER_TIER]
+    )
+
+
+def test_a_plan_without_prices_is_left_out():
+    rates = ElectricityRates.from_company_data(
+        {
+            key: value
+            for key, value in COMPANY.items()
+            if not key.startswith(("ultra_low_overnight", "tier", "lower", "higher"))
+        }
+    )
+    comparison = compare_plans(
+        rates, _a_month_of_readings(), datetime(2024, 6, 30, tzinfo=ONTARIO)
+    )
+
+    assert list(comparison.costs) == [RATE_PLAN_TIME_OF_USE]
+    assert comparison.cheapest == RATE_PLAN_TIME_OF_USE
+    assert comparison.savings(RATE_PLAN_TIERED) is None
+
+
+def test_nothing_to_compare_before_the_first_reading():
+    comparison = compare_plans(
+        ElectricityRates.from_company_data(COMPANY),
+        RollingUsage(),
+        datetime(2024, 6, 30, tzinfo=ONTARIO),
+    )
+
+    assert RATE_PLAN_TIERED not in comparison.costs
+    assert comparison.days == 0
+
+
+def _a_day_of_hours(day: date, kwh: float) -> list[tuple[datetime, float]]:
+    start = datetime(day.year, day.month, day.day, tzinfo=ONTARIO)
+
+    return [(start + timedelta(hours=hour), kwh) for hour in range(24)]
+
+
+def test_hourly_usage_puts_each_hour_in_its_period():
+    # A summer Wednesday has 12 off-peak hours on Time-of-Use, 6 mid-peak and
+    # 6 on-peak; on Ultra-Low Overnight 8 overnight, 11 mid-peak and 5 on-peak.
+    usage = hourly_usage(_a_day_of_hours(JULY, 1.0), ONTARIO_HOLIDAYS)
+
+    assert usage == _usage(
+        **{
+            STATE_OFF_PEAK: 12.0,
+            STATE_MID_PEAK: 6.0,
+            STATE_ON_PEAK: 6.0,
+            STATE_ULO_OVERNIGHT: 8.0,
+            STATE_ULO_MID_PEAK: 11.0,
+            STATE_ULO_ON_PEAK: 5.0,
+        }
+    )
+
+
+def test_hourly_usage_agrees_with_splitting_the_same_hours():
+    hours = _a_day_of_hours(date(2024, 7, 1), 0.5) + _a_day_of_hours(JULY, 1.5)
+    split = _usage()
+
+    for start, kwh in hours:
+        for period, shared in split_usage(
+            start, start + timedelta(hours=1), kwh, ONTARIO_HOLIDAYS
+        ).items():
+            split[period] += shared
+
+    assert hourly_usage(hours, ONTARIO_HOLIDAYS) == pytest.approx(split)
+
+
+def test_each_plan_is_billed_line_by_line():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    usage = hourly_usage(_a_day_of_hours(JULY, 30.0), ONTARIO_HOLIDAYS)
+    bills = bill_plans(rates, usage, threshold=600)
+
+    assert set(bills) == {
+        RATE_PLAN_TIME_OF_USE,
+        RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        RATE_PLAN_TIERED,
+    }
+    assert bills[RATE_PLAN_TIME_OF_USE].usage == pytest.approx(
+        {STATE_OFF_PEAK: 360.0, STATE_MID_PEAK: 180.0, STATE_ON_PEAK: 180.0}
+    )
+    assert bills[RATE_PLAN_TIME_OF_USE].bill.total == pytest.approx(
+        rates.bill(bills[RATE_PLAN_TIME_OF_USE].usage).total
+    )
+    assert bills[RATE_PLAN_TIERED].usage == {
+        STATE_LOWER_TIER: 600.0,
+        STATE_HIGHER_TIER: 120.0,
+    }
+    assert bills[RATE_PLAN_TIERED].bill == rates.tiered_bill(720, threshold=600)
+
+
+def test_a_part_month_carries_its_share_of_the_threshold():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    usage = hourly_usage(_a_day_of_hours(JULY, 30.0), ONTARIO_HOLIDAYS)
+    bills = bill_plans(rates, usage, threshold=600, months=0.5)
+
+    assert bills[RATE_PLAN_TIERED].usage[STATE_LOWER_TIER] == 300.0
+    assert bills[RATE_PLAN_TIME_OF_USE].bill == rates.bill(
+        bills[RATE_PLAN_TIME_OF_USE].usage, months=0.5
+    )
+
+
+def test_bills_for_two_stretches_add_up():
+    rates = ElectricityRates.from_company_data(COMPANY)
+    first = hourly_usage(_a_day_of_hours(date(2024, 7, 1), 10.0), ONTARIO_HOLIDAYS)
+    second = hourly_usage(_a_day_of_hours(JULY, 20.0), ONTARIO_HOLIDAYS)
+    both = {period: first[period] + second[period] for period in PERIODS}
+
+    added = (
+        bill_plans(rates, first, threshold=None, months=0.5)[RATE_PLAN_TIME_OF_USE]
+        + bill_plans(rates, second, threshold=None, months=0.5)[RATE_PLAN_TIME_OF_USE]
+    )
+    whole = bill_plans(rates, both, threshold=None)[RATE_PLAN_TIME_OF_USE]
+
+    assert added.usage == pytest.approx(whole.usage)
+    assert added.bill.total == pytest.approx(whole.bill.total)
+    assert added.bill.delivery == pytest.approx(whole.bill.delivery)
+
+
+def test_a_plan_without_prices_is_not_billed():
+    rates = ElectricityRates.from_company_data(
+        {
+            key: value
+            for key, value in COMPANY.items()
+            if not key.startswith("ultra_low_overnight")
+        }
+    )
+    usage = hourly_usage(_a_day_of_hours(JULY, 1.0), ONTARIO_HOLIDAYS)
+
+    assert set(bill_plans(rates, usage, threshold=None)) == {RATE_PLAN_TIME_OF_USE}
@@ -6,13 +6,30 @@ oeb.ca/_html/calculator/billcalc.php, and from a real Newmarket-Tay Power
 residential bill. If the formula drifts, these fail.
 """
 
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from holidays import country_holidays
 import pytest
 
 from custom_components.ontario_energy_board.billing import (
+    ElectricityBill,
+    ElectricityRates,
     marginal_rate,
     tax_and_rebate_multiplier,
     volumetric_rate,
 )
+from custom_components.ontario_energy_board.const import (
+    PEAK_KEY_MAPPINGS,
+    SECTOR_ELECTRICITY,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
+    STATE_MID_PEAK,
+    STATE_OFF_PEAK,
+    STATE_ON_PEAK,
+    STATE_ULO_ON_PEAK,
+)
+from custom_components.ontario_energy_board.peaks import active_peak
 
 # Newmarket-Tay Power Distribution Ltd. - Newmarket-Tay Rate Zone, RESIDENTIAL,
 # as published in BillData.xml, under the attribute names the parser produces.
@@ -165,3 +182,293 @@ def test_empty_oeb_fields_are_treated_as_zero():
     assert volumetric_rate(sparse, 0.098) == pytest.approx(
         volumetric_rate(NT_POWER, 0.098) - NT_POWER["distribution_variable_charge"]
     )
+
+
+def test_rate_table_prices_each_published_period_as_marginal_rate_does():
+    rates = ElectricityRates.from_company_data(NT_POWER)
+
+    assert rates.commodity_rates == {
+        STATE_OFF_PEAK: 0.098,
+        STATE_MID_PEAK: 0.157,
+        STATE_ON_PEAK: 0.203,
+    }
+    for peak, commodity_rate in rates.commodity_rates.items():
+        assert rates.all_in_rates[peak] == pytest.approx(
+            marginal_rate(NT_POWER, commodity_rate)
+        )
+        assert rates.marginal_rate(commodity_rate) == rates.all_in_rates[peak]
+
+    # NT Power publishes no Ultra-Low Overnight prices in this extract.
+    assert STATE_ULO_ON_PEAK not in rates.all_in_rates
+
+
+def test_rate_table_carries_the_monthly_charges():
+    rates = ElectricityRates.from_company_data(NT_POWER)
+
+    assert rates.monthly_fixed_charge == SERVICE_CHARGE
+    assert rates.standard_supply_service_charge == SUPPLY_SERVICE_CHARGE
+    assert rates.marginal_rate(None) is None
+
+
+def test_rate_table_skips_empty_prices():
+    rates = ElectricityRates.from_company_data(
+        dict(NT_POWER, time_of_use_mid_peak_price="")
+    )
+
+    assert STATE_MID_PEAK not in rates.commodity_rates
+    assert STATE_MID_PEAK not in rates.all_in_rates
+
+
+# The calculator's usage, keyed by peak state as the bill engine takes it.
+CALCULATOR_USAGE_BY_PEAK = {
+    STATE_OFF_PEAK: CALCULATOR_USAGE["time_of_use_off_peak_price"],
+    STATE_MID_PEAK: CALCULATOR_USAGE["time_of_use_mid_peak_price"],
+    STATE_ON_PEAK: CALCULATOR_USAGE["time_of_use_on_peak_price"],
+}
+
+
+def test_bill_matches_the_official_calculator_line_by_line():
+    bill = ElectricityRates.from_company_data(NT_POWER).bill(CALCULATOR_USAGE_BY_PEAK)
+
+    assert bill == ElectricityBill(
+        electricity=pytest.approx(CALCULATOR_ELECTRICITY, abs=0.01),
+        delivery=pytest.approx(CALCULATOR_DELIVERY, abs=0.01),
+        regulatory=pytest.approx(CALCULATOR_REGULATORY, abs=0.01),
+        subtotal=pytest.approx(CALCULATOR_SUBTOTAL, abs=0.01),
+        hst=pytest.approx(CALCULATOR_HST, abs=0.01),
+        rebate=pytest.approx(CALCULATOR_REBATE, abs=0.01),
+        total=pytest.approx(CALCULATOR_TOTAL, abs=0.01),
+    )
+
+
+def test_bill_agrees_with_the_marginal_rate():
+    """One more kWh in a period adds exactly that period's all-in rate."""
+    rates = ElectricityRates.from_company_data(NT_POWER)
+    bill = rates.bill(CALCULATOR_USAGE_BY_PEAK)
+
+    for peak in CALCULATOR_USAGE_BY_PEAK:
+        more = dict(CALCULATOR_USAGE_BY_PEAK)
+        more[peak] += 1
+
+        assert rates.bill(more).total - bill.total == pytest.approx(
+            rates.all_in_rates[peak]
+        )
+
+
+def test_a_two_month_bill_carries_two_months_of_fixed_charges():
+    rates = ElectricityRates.from_company_data(NT_POWER)
+    one = rates.bill(CALCULATOR_USAGE_BY_PEAK)
+    two = rates.bill(CALCULATOR_USAGE_BY_PEAK, months=2)
+
+    assert two.delivery - one.delivery == pytest.approx(SERVICE_CHARGE)
+    assert two.regulatory - one.regulatory == pytest.approx(SUPPLY_SERVICE_CHARGE)
+
+
+def test_a_period_without_a_price_cannot_be_billed():
+    rates = ElectricityRates.from_company_data(NT_POWER)
+
+    with pytest.raises(ValueError, match=STATE_ULO_ON_PEAK):
+        rates.bill({STATE_ULO_ON_PEAK: 100})
+
+
+TIERED = dict(
+    NT_POWER, tier_threshold=600, lower_tier_price=0.093, higher_tier_price=0.11
+)
+
+
+@pytest.mark.parametrize(
+    "kwh, expected_electricity",
+    [
+        (500, 500 * 0.093),
+        (600, 600 * 0.093),
+        (700, 600 * 0.093 + 100 * 0.11),
+    ],
+)
+def test_tiered_bill_prices_beyond_the_threshold_higher(kwh, expected_electricity):
+    rates = ElectricityRates.from_company_data(TIERED)
+    bill = rates.tiered_bill(kwh)
+
+    assert bill.electricity == pytest.approx(expected_electricity)
+    # Everything but the commodity is billed as on Time-of-Use.
+    tou = rates.bill({STATE_OFF_PEAK: kwh})
+    assert bill.regulatory == pytest.approx(tou.regulatory)
+    assert bill.delivery - tou.delivery == pytest.approx(
+        (NT_POWER["loss_factor"] - 1) * (bill.electricity - tou.electricity)
+    )
+
+
+def test_tiered_bill_threshold_can_be_overridden_and_scales_with_months():
+    rates = ElectricityRates.from_company_data(TIERED)
+
+    assert rates.tiered_bill(700, threshold=1000).electricity == pytest.approx(
+        700 * 0.093
+    )
+    assert rates.tiered_bill(1200, months=2).electricity == pytest.approx(1200 * 0.093)
+
+
+def test_tiered_bill_needs_tiered_prices():
+    with pytest.raises(ValueError):
+        ElectricityRates.from_company_data(NT_POWER).tiered_bill(700)
+
+
+@pytest.mark.parametrize(
+    "published, month, expected",
+    [
+        (600, 7, 600),
+        (600, 10, 600),
+        (600, 11, 1000),
+        (600, 4, 1000),
+        # Only the residential threshold changes with the season.
+        (750, 1, 750),
+        (750, 7, 750),
+    ],
+)
+def test_tier_threshold_rises_in_winter_for_residential_customers(
+    published, month, expected
+):
+    rates = ElectricityRates.from_company_data(dict(TIERED, tier_threshold=published))
+
+    assert rates.tier_threshold_at(datetime(2024, month, 15, tzinfo=ONTARIO)) == (
+        expected
+    )
+
+
+def test_tier_prices_are_looked_up_like_any_period():
+    rates = ElectricityRates.from_company_data(TIERED)
+
+    assert rates.commodity_rates[STATE_LOWER_TIER] == 0.093
+    assert rates.commodity_rates[STATE_HIGHER_TIER] == 0.11
+    assert rates.all_in_rates[STATE_HIGHER_TIER] == rates.marginal_rate(0.11)
+    assert rates.tier(599.9, 600) == STATE_LOWER_TIER
+    assert rates.tier(600, 600) == STATE_HIGHER_TIER
+
+
+def test_tiered_cost_splits_what_crosses_the_threshold():
+    rates = ElectricityRates.from_company_data(TIERED)
+    lower = rates.all_in_rates[STATE_LOWER_TIER]
+    higher = rates.all_in_rates[STATE_HIGHER_TIER]
+
+    assert rates.tiered_cost(0, 500, 600) == pytest.approx(500 * lower)
+    assert rates.tiered_cost(500, 200, 600) == pytest.approx(100 * lower + 100 * higher)
+    assert rates.tiered_cost(700, 50, 600) == pytest.approx(50 * higher)
+
+
+def test_tiered_cost_adds_up_to_the_months_electricity():
+    """However the month is read, its increases cost what the bill charges."""
+    rates = ElectricityRates.from_company_data(TIERED)
+    month_kwh, total = 0.0, 0.0
+
+    for used in (250, 250, 250, 250):
+        total += rates.tiered_cost(month_kwh, used, 600)
+        month_kwh += used
+
+    bill = rates.tiered_bill(1000)
+    assert total == pytest.approx(
+        bill.total - (SERVICE_CHARGE + SUPPLY_SERVICE_CHARGE) * rates.multiplier
+    )
+
+
+def test_tiered_cost_needs_tiered_prices():
+    rates = ElectricityRates.from_company_data(NT_POWER)
+
+    assert rates.tiered_cost(0, 100, 600) is None
+    assert ElectricityRates.from_company_data(TIERED).tiered_cost(0, 100, None) is None
+
+
+ONTARIO = ZoneInfo("America/Toronto")
+ONTARIO_HOLIDAYS = country_holidays(
+    "CA", subdiv="ON", observed=True, categories={"public", "optional"}
+)
+
+
+def _a_year_of_intervals(np):
+    """Every quarter hour of 2024, starting times and a made-up kWh for each."""
+    start = int(datetime(2024, 1, 1, tzinfo=ONTARIO).timestamp())
+    end = int(datetime(2025, 1, 1, tzinfo=ONTARIO).timestamp())
+    instants = np.arange(start, end, 15 * 60)
+    kwh = np.random.default_rng(2024).gamma(2.0, 0.1, instants.shape)
+
+    return instants, kwh
+
+
+def test_price_intervals_agrees_with_the_scalar_functions():
+    """Every interval of a year, with its daylight saving changes and holidays,
+    costs what active_peak and marginal_rate price it at.
+    """
+    np = pytest.importorskip("numpy")
+    instants, kwh = _a_year_of_intervals(np)
+
+    priced = ElectricityRates.from_company_data(NT_POWER).price_intervals(
+        instants, kwh, ONTARIO_HOLIDAYS, zone=ONTARIO, ulo_enabled=False
+    )
+
+    usage = dict.fromkeys(CALCULATOR_USAGE_BY_PEAK, 0.0)
+    period_costs = dict.fromkeys(CALCULATOR_USAGE_BY_PEAK, 0.0)
+    for instant, used, cost in zip(
+        instants.tolist(), kwh.tolist(), priced.costs.tolist(), strict=True
+    ):
+        peak = active_peak(
+            datetime.fromtimestamp(instant, ONTARIO),
+            ONTARIO_HOLIDAYS,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=False,
+        )
+        expected = used * marginal_rate(NT_POWER, NT_POWER[PEAK_KEY_MAPPINGS[peak]])
+
+        assert cost == pytest.approx(expected, rel=1e-12), instant
+        usage[peak] += used
+        period_costs[peak] += expected
+
+    assert priced.usage == pytest.approx(usage, rel=1e-9)
+    assert priced.period_costs == pytest.approx(period_costs, rel=1e-9)
+
+
+def test_price_intervals_totals_are_what_bill_takes():
+    np = pytest.importorskip("numpy")
+    instants, kwh = _a_year_of_intervals(np)
+    rates = ElectricityRates.from_company_data(NT_POWER)
+
+    priced = rates.price_intervals(
+        instants, kwh, ONTARIO_HOLIDAYS, zone=ONTARIO, ulo_enabled=False
+    )
+    bill = rates.bill(priced.usage, months=12)
+
+    # The variable part of the year's bill is what its intervals cost.
+    assert priced.costs.sum() == pytest.approx(
+        bill.total - (SERVICE_CHARGE + SUPPLY_SERVICE_CHARGE) * 12 * rates.multiplier
+    )
+
+
+def test_price_intervals_keeps_the_shape_of_its_input():
+    np = pytest.importorskip("numpy")
+    instants, kwh = _a_year_of_intervals(np)
+
+    priced = ElectricityRates.from_company_data(NT_POWER).price_intervals(
+        instants[: 96 * 7].reshape(7, 96),
+        kwh[: 96 * 7].reshape(7, 96),
+        ONTARIO_HOLIDAYS,
+        zone=ONTARIO,
+        ulo_enabled=False,
+    )
+
+    assert priced.costs.shape == (7, 96)
+
+
+def test_price_intervals_needs_a_reading_per_interval():
+    np = pytest.importorskip("numpy")
+    instants, kwh = _a_year_of_intervals(np)
+
+    with pytest.raises(ValueError):
+        ElectricityRates.from_company_data(NT_POWER).price_intervals(
+            instants, kwh[1:], [], zone=ONTARIO, ulo_enabled=False
+        )
+
+
+def test_price_intervals_in_a_period_without_a_price_cannot_be_priced():
+    np = pytest.importorskip("numpy")
+    instants, kwh = _a_year_of_intervals(np)
+
+    with pytest.raises(ValueError, match=r"No ulo_\w+ price is published"):
+        ElectricityRates.from_company_data(NT_POWER).price_intervals(
+            instants, kwh, [], zone=ONTARIO, ulo_enabled=True
+        )
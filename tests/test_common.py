@@ -4,13 +4,14 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import pytest
 
 from custom_components.ontario_energy_board.common import (
+    RatesDocumentParser,
+    async_fetch_rates_document_if_modified,
     energy_sector_from_company_name,
     format_company_name,
-    get_energy_companies,
-    get_energy_company_data,
     get_energy_sector_metadata,
     parse_energy_companies,
     parse_energy_company_data,
+    parse_rates_document,
 )
 from custom_components.ontario_energy_board.const import (
     ELECTRICITY_RATE_UNIT_OF_MEASURE,
@@ -143,28 +144,125 @@ def test_parse_company_data_returns_none_for_unknown_company(electricity_documen
 
 
 @pytest.mark.parametrize(
-    "sector, expected, unexpected",
+    "sector, document_fixture",
     [
-        (SECTOR_ELECTRICITY, ELECTRICITY_COMPANY, NATURAL_GAS_COMPANY),
-        (SECTOR_NATURAL_GAS, NATURAL_GAS_COMPANY, ELECTRICITY_COMPANY),
+        (SECTOR_ELECTRICITY, "electricity_document"),
+        (SECTOR_NATURAL_GAS, "natural_gas_document"),
     ],
 )
-async def test_get_energy_companies_is_scoped_to_one_sector(
-    hass, mock_oeb, sector, expected, unexpected
+def test_parse_rates_document_agrees_with_the_single_company_parse(
+    request, sector, document_fixture
 ):
-    companies = await get_energy_companies(async_get_clientsession(hass), sector)
+    """The whole-document parse is what every entry in a sector now shares."""
+    document = request.getfixturevalue(document_fixture)
+
+    parsed = parse_rates_document(sector, document)
+
+    assert parsed.names == parse_energy_companies(sector, document)
+    for name, data in parsed.companies.items():
+        assert data == parse_energy_company_data(sector, document, name)
 
-    assert expected in companies
-    assert unexpected not in companies
-    assert companies == sorted(companies)
 
+def test_rates_document_indexes_distributors_and_rate_classes(electricity_document):
+    parsed = parse_rates_document(SECTOR_ELECTRICITY, electricity_document)
 
-async def test_get_energy_company_data_fetches_selected_sector(hass, mock_oeb):
-    data = await get_energy_company_data(
-        async_get_clientsession(hass), SECTOR_ELECTRICITY, ELECTRICITY_COMPANY
+    assert ELECTRICITY_COMPANY in parsed
+    assert len(parsed) == 4
+    # Normalised, so lookups need not match the OEB's casing or spacing.
+    assert parsed.by_distributor["algoma power inc."] == (
+        "Algoma Power Inc. (RESIDENTIAL R1) [Electricity]",
+        "Algoma Power Inc. (SEASONAL CUSTOMERS) [Electricity]",
+        "Algoma Power Inc. (RESIDENTIAL R2) [Electricity]",
     )
+    assert parsed.by_rate_class["residential"] == (ELECTRICITY_COMPANY,)
 
-    assert data is not None
-    assert (
-        data["distributor_name"] == "Alectra Utilities Corporation-Brampton Rate Zone"
+
+@pytest.mark.parametrize(
+    "missing, expected",
+    [
+        # Renamed, same rate class.
+        (
+            "Alectra Utilities Corporation-For Brampton Main Rate Zone "
+            "(RESIDENTIAL) [Electricity]",
+            ELECTRICITY_COMPANY,
+        ),
+        # Same distributor, re-classed.
+        (
+            "Algoma Power Inc. (SEASONAL) [Electricity]",
+            "Algoma Power Inc. (SEASONAL CUSTOMERS) [Electricity]",
+        ),
+        # Nothing in common with anything published.
+        ("Utility That Left The Feed (COMMERCIAL) [Electricity]", None),
+    ],
+)
+def test_rates_document_suggests_the_closest_company(
+    electricity_document, missing, expected
+):
+    parsed = parse_rates_document(SECTOR_ELECTRICITY, electricity_document)
+
+    assert parsed.closest(missing) == expected
+
+
+def _pieces(document: str, size: int) -> list[bytes]:
+    """The document as it might arrive over the network, in small chunks."""
+    content = document.encode()
+    return [content[start : start + size] for start in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize(
+    "sector, document_fixture",
+    [
+        (SECTOR_ELECTRICITY, "electricity_document"),
+        (SECTOR_NATURAL_GAS, "natural_gas_document"),
+    ],
+)
+def test_parser_fed_in_pieces_agrees_with_the_whole_document(
+    request, sector, document_fixture
+):
+    """Chunk boundaries fall mid-tag and mid-value, which must not matter."""
+    document = request.getfixturevalue(document_fixture)
+    parser = RatesDocumentParser(sector)
+
+    for piece in _pieces(document, 7):
+        parser.feed(piece)
+
+    assert parser.close() == parse_rates_document(sector, document)
+
+
+def test_a_company_listed_twice_keeps_its_first_row(electricity_document):
+    """The whole parse and a lookup of the one company read the same row."""
+    start = electricity_document.index("<BillDataRow>")
+    end = electricity_document.index("</BillDataRow>") + len("</BillDataRow>")
+    # The first row again at the end, with another monthly service charge.
+    repeated = electricity_document[start:end].replace("<SC>30.8</SC>", "<SC>99</SC>")
+    document = electricity_document.replace(
+        "</BillDataTable>", f"{repeated}</BillDataTable>"
+    )
+    original = parse_rates_document(SECTOR_ELECTRICITY, electricity_document)
+
+    parsed = parse_rates_document(SECTOR_ELECTRICITY, document)
+
+    assert parsed == original
+    assert parse_energy_company_data(
+        SECTOR_ELECTRICITY, document, ELECTRICITY_COMPANY
+    ) == original.get(ELECTRICITY_COMPANY)
+
+
+@pytest.mark.parametrize(
+    "sector, expected, unexpected",
+    [
+        (SECTOR_ELECTRICITY, ELECTRICITY_COMPANY, NATURAL_GAS_COMPANY),
+        (SECTOR_NATURAL_GAS, NATURAL_GAS_COMPANY, ELECTRICITY_COMPANY),
+    ],
+)
+async def test_a_fetched_document_is_scoped_to_one_sector(
+    hass, mock_oeb, sector, expected, unexpected
+):
+    fetched = await async_fetch_rates_document_if_modified(
+        async_get_clientsession(hass), sector
     )
+
+    assert fetched is not None
+    assert expected in fetched.document
+    assert unexpected not in fetched.document
+    assert list(fetched.document.sorted_names) == sorted(fetched.document.names)
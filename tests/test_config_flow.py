@@ -6,11 +6,16 @@ from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers import entity_registry as er
 
 from custom_components.ontario_energy_board.const import (
+    CONF_CONSUMPTION_ENTITY,
     CONF_ENERGY_COMPANY,
-    CONF_ULO_ENABLED,
+    CONF_RATE_PLAN,
     DOMAIN,
     ELECTRICITY_RATES_URL,
     NATURAL_GAS_RATES_URL,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    RATE_PLANS,
 )
 
 from .conftest import ELECTRICITY_COMPANY, NATURAL_GAS_COMPANY, build_config_entry
@@ -58,7 +63,11 @@ async def test_electricity_list_is_filtered_and_asks_for_the_rate_plan(
     assert all(value.endswith("[Electricity]") for value in values)
 
     # The rate plan is asked here, now that the sector is known.
-    assert CONF_ULO_ENABLED in result["data_schema"].schema
+    plan_selector = result["data_schema"].schema[CONF_RATE_PLAN]
+    assert plan_selector.config["options"] == RATE_PLANS
+
+    chosen = result["data_schema"]({CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY})
+    assert chosen[CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
 
 
 async def test_natural_gas_list_is_filtered_and_asks_nothing_further(
@@ -73,8 +82,8 @@ async def test_natural_gas_list_is_filtered_and_asks_nothing_further(
     assert NATURAL_GAS_COMPANY in values
     assert ELECTRICITY_COMPANY not in values
 
-    # Gas has no peak periods, so Ultra-Low Overnight is meaningless for it.
-    assert CONF_ULO_ENABLED not in result["data_schema"].schema
+    # Gas has no peak periods or tiers, so no rate plan means anything for it.
+    assert CONF_RATE_PLAN not in result["data_schema"].schema
 
 
 async def test_labels_drop_the_now_redundant_sector_suffix(
@@ -99,20 +108,34 @@ async def test_creates_an_electricity_entry(hass, mock_oeb, enable_custom_integr
     result = await _choose_sector(hass, "electricity")
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: True},
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        },
     )
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert result["title"] == ELECTRICITY_COMPANY
     assert result["data"] == {
         CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
-        CONF_ULO_ENABLED: True,
+        CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT,
     }
     # Neither the company nor the plan identifies an entry, since both can
     # change; the entry id does that instead.
     assert result["result"].unique_id is None
 
 
+async def test_creates_a_tiered_entry(hass, mock_oeb, enable_custom_integrations):
+    result = await _choose_sector(hass, "electricity")
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_RATE_PLAN: RATE_PLAN_TIERED},
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_RATE_PLAN] == RATE_PLAN_TIERED
+
+
 async def test_natural_gas_still_records_the_plan(
     hass, mock_oeb, enable_custom_integrations
 ):
@@ -123,7 +146,7 @@ async def test_natural_gas_still_records_the_plan(
     )
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
-    assert result["data"][CONF_ULO_ENABLED] is False
+    assert result["data"][CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
 
 
 async def test_same_company_with_different_rate_plans_is_allowed(
@@ -135,7 +158,10 @@ async def test_same_company_with_different_rate_plans_is_allowed(
     result = await _choose_sector(hass, "electricity")
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: True},
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        },
     )
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
@@ -147,7 +173,10 @@ async def test_duplicate_entry_is_rejected(hass, mock_oeb, enable_custom_integra
     result = await _choose_sector(hass, "electricity")
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: False},
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE,
+        },
     )
 
     assert result["type"] is FlowResultType.ABORT
@@ -191,6 +220,23 @@ async def test_only_the_chosen_sectors_document_is_downloaded(
     assert ELECTRICITY_RATES_URL not in requested
 
 
+async def test_the_new_entry_starts_from_the_flows_document(
+    hass, mock_oeb, ontario_timezone, enable_custom_integrations
+):
+    """The document listed in the form is the one the entry is set up from."""
+    result = await _choose_sector(hass, "electricity")
+    await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert len(mock_oeb.mock_calls) == 1
+
+
 async def test_options_flow_changes_the_rate_plan(
     hass, mock_oeb, ontario_timezone, enable_custom_integrations
 ):
@@ -203,22 +249,57 @@ async def test_options_flow_changes_the_rate_plan(
 
     assert result["type"] is FlowResultType.FORM
     assert result["step_id"] == "init"
-    assert result["data_schema"]({})[CONF_ULO_ENABLED] is False
+    assert result["data_schema"]({})[CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
 
     result = await hass.config_entries.options.async_configure(
-        result["flow_id"], {CONF_ULO_ENABLED: True}
+        result["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT}
     )
     await hass.async_block_till_done()
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
-    assert entry.options[CONF_ULO_ENABLED] is True
+    assert entry.options[CONF_RATE_PLAN] == RATE_PLAN_ULTRA_LOW_OVERNIGHT
     # The value chosen at setup is left alone; the option overrides it.
-    assert entry.data[CONF_ULO_ENABLED] is False
+    assert entry.data[CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
+
+
+async def test_options_flow_picks_and_clears_a_consumption_sensor(
+    hass, mock_oeb, ontario_timezone, enable_custom_integrations
+):
+    entry = build_config_entry(ELECTRICITY_COMPANY, ulo_enabled=False)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    hass.states.async_set(
+        "sensor.house_meter",
+        "1000",
+        {"device_class": "energy", "unit_of_measurement": "kWh"},
+    )
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE,
+            CONF_CONSUMPTION_ENTITY: "sensor.house_meter",
+        },
+    )
+    await hass.async_block_till_done()
 
+    assert entry.options[CONF_CONSUMPTION_ENTITY] == "sensor.house_meter"
 
-async def test_options_flow_is_not_offered_for_natural_gas(
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE}
+    )
+    await hass.async_block_till_done()
+
+    assert CONF_CONSUMPTION_ENTITY not in entry.options
+
+
+async def test_natural_gas_options_ask_only_for_a_meter(
     hass, mock_oeb, ontario_timezone, enable_custom_integrations
 ):
+    """Gas has no peak periods, so there is no rate plan to choose."""
     entry = build_config_entry(NATURAL_GAS_COMPANY, ulo_enabled=False)
     entry.add_to_hass(hass)
     await hass.config_entries.async_setup(entry.entry_id)
@@ -226,8 +307,16 @@ async def test_options_flow_is_not_offered_for_natural_gas(
 
     result = await hass.config_entries.options.async_init(entry.entry_id)
 
-    assert result["type"] is FlowResultType.ABORT
-    assert result["reason"] == "no_rate_plan"
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "natural_gas"
+    assert CONF_RATE_PLAN not in result["data_schema"].schema
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_CONSUMPTION_ENTITY: "sensor.gas_meter"}
+    )
+    await hass.async_block_till_done()
+
+    assert entry.options == {CONF_CONSUMPTION_ENTITY: "sensor.gas_meter"}
 
 
 async def test_a_plan_changed_from_the_options_still_blocks_a_duplicate(
@@ -246,14 +335,17 @@ async def test_a_plan_changed_from_the_options_still_blocks_a_duplicate(
 
     options = await hass.config_entries.options.async_init(entry.entry_id)
     await hass.config_entries.options.async_configure(
-        options["flow_id"], {CONF_ULO_ENABLED: True}
+        options["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT}
     )
     await hass.async_block_till_done()
 
     result = await _choose_sector(hass, "electricity")
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: True},
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        },
     )
 
     assert result["type"] is FlowResultType.ABORT
@@ -276,14 +368,17 @@ async def test_the_original_plan_can_be_added_again_after_a_change(
 
     options = await hass.config_entries.options.async_init(entry.entry_id)
     await hass.config_entries.options.async_configure(
-        options["flow_id"], {CONF_ULO_ENABLED: True}
+        options["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT}
     )
     await hass.async_block_till_done()
 
     result = await _choose_sector(hass, "electricity")
     result = await hass.config_entries.flow.async_configure(
         result["flow_id"],
-        {CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: False},
+        {
+            CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+            CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE,
+        },
     )
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
@@ -395,6 +490,33 @@ async def test_reconfigure_refuses_a_company_another_entry_already_has(
     assert entry.data[CONF_ENERGY_COMPANY] == ELECTRICITY_COMPANY
 
 
+async def test_reconfigure_forms_are_served_from_the_entrys_document(
+    hass, mock_oeb, ontario_timezone, enable_custom_integrations
+):
+    """Neither showing the form nor showing it again downloads anything."""
+    other = "Algoma Power Inc. (RESIDENTIAL R1) [Electricity]"
+
+    existing = build_config_entry(other, ulo_enabled=False)
+    existing.add_to_hass(hass)
+    entry = build_config_entry(ELECTRICITY_COMPANY, ulo_enabled=False)
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await entry.start_reconfigure_flow(hass)
+    for _ in range(3):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_ENERGY_COMPANY: other}
+        )
+        assert result["errors"] == {"base": "already_configured"}
+
+    # The only download is the one the entry was set up from.
+    assert len(mock_oeb.mock_calls) == 1
+
+    values = [option["value"] for option in _company_options(result)]
+    assert values == sorted(values)
+
+
 async def test_reconfigure_allows_keeping_the_same_company(
     hass, mock_oeb, ontario_timezone, enable_custom_integrations
 ):
@@ -0,0 +1,25 @@
+"""Tests for the config entry diagnostics."""
+
+from custom_components.ontario_energy_board.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .conftest import ELECTRICITY_COMPANY
+
+
+async def test_diagnostics_report_how_the_document_was_obtained(hass, init_integration):
+    first = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    second = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=True)
+
+    first_diagnostics = await async_get_config_entry_diagnostics(hass, first)
+    second_diagnostics = await async_get_config_entry_diagnostics(hass, second)
+
+    assert first_diagnostics["energy_company"] == ELECTRICITY_COMPANY
+    assert first_diagnostics["last_refresh_outcome"] == "downloaded"
+    # The second entry was served from the document the first downloaded.
+    assert second_diagnostics["last_refresh_outcome"] == "cached"
+    assert second_diagnostics["rates_document"]["outcomes"] == {
+        "downloaded": 1,
+        "cached": 1,
+    }
+    assert second_diagnostics["company_data"]["rate_class"] == "RESIDENTIAL"
@@ -0,0 +1,160 @@
+"""Tests for the Ontario natural gas bill arithmetic.
+
+These run without Home Assistant. The rates are Enbridge Gas's, as published in
+GasBillData.xml, including its overlapping tier starts and its unused fifth
+tier.
+"""
+
+import pytest
+
+from custom_components.ontario_energy_board.gas_billing import GasBill, GasRates
+
+ENBRIDGE = {
+    "monthly_charge": 27.69,
+    "delivery_tier_1_start": 0,
+    "delivery_tier_1_end": 30,
+    "delivery_tier_2_start": 31,
+    "delivery_tier_2_end": 85,
+    "delivery_tier_3_start": 85,
+    "delivery_tier_3_end": 170,
+    "delivery_tier_4_start": 170,
+    "delivery_tier_4_end": 99999,
+    "delivery_tier_5_start": 0,
+    "delivery_tier_5_end": 0,
+    "delivery_charge_tier_1": 0.143745,
+    "delivery_charge_tier_2": 0.135362,
+    "delivery_charge_tier_3": 0.128798,
+    "delivery_charge_tier_4": 0.123904,
+    "delivery_charge_tier_5": 0,
+    "delivery_charge_price_adjustment": 0.007456,
+    "storage_charge": 0,
+    "storage_charge_price_adjustment": 0,
+    "gas_supply_charge": 0.103025,
+    "gas_supply_charge_price_adjustment": -0.012527,
+    "transportation_charge": 0.054267,
+    "transportation_charge_price_adjustment": 0.003385,
+    "federal_carbon_charge": 0,
+    "facility_carbon_charge": 0.000145,
+    "harmonized_sales_tax": 0.13,
+}
+
+TIER_1, TIER_2, TIER_3, TIER_4 = 0.143745, 0.135362, 0.128798, 0.123904
+
+
+def test_bands_run_from_each_tiers_end_to_the_next():
+    rates = GasRates.from_company_data(ENBRIDGE)
+
+    assert rates.band_starts == (0, 30, 85, 170)
+    assert rates.band_prices == (TIER_1, TIER_2, TIER_3, TIER_4)
+
+
+@pytest.mark.parametrize(
+    "volume, expected",
+    [
+        (0, 0),
+        (20, 20 * TIER_1),
+        (30, 30 * TIER_1),
+        (50, 30 * TIER_1 + 20 * TIER_2),
+        (85, 30 * TIER_1 + 55 * TIER_2),
+        (200, 30 * TIER_1 + 55 * TIER_2 + 85 * TIER_3 + 30 * TIER_4),
+        # The last band carries on past its nominal end.
+        (120_000, 30 * TIER_1 + 55 * TIER_2 + 85 * TIER_3 + 119_830 * TIER_4),
+    ],
+)
+def test_delivery_prices_each_band_at_its_own_rate(volume, expected):
+    rates = GasRates.from_company_data(ENBRIDGE)
+
+    assert rates.delivery(volume) == pytest.approx(expected + volume * 0.007456)
+
+
+def test_a_months_bill():
+    """A typical winter month, 316 m³, worked through by hand."""
+    bill = GasRates.from_company_data(ENBRIDGE).bill(316)
+
+    delivery = 30 * TIER_1 + 55 * TIER_2 + 85 * TIER_3 + 146 * TIER_4 + 316 * 0.007456
+    transportation = 316 * (0.054267 + 0.003385)
+    gas_supply = 316 * (0.103025 - 0.012527)
+    carbon = 316 * 0.000145
+    subtotal = 27.69 + delivery + transportation + gas_supply + carbon
+
+    assert bill == GasBill(
+        customer_charge=27.69,
+        delivery=pytest.approx(delivery),
+        transportation=pytest.approx(transportation),
+        storage=0,
+        gas_supply=pytest.approx(gas_supply),
+        carbon=pytest.approx(carbon),
+        subtotal=pytest.approx(subtotal),
+        hst=pytest.approx(subtotal * 0.13),
+        total=pytest.approx(subtotal * 1.13),
+    )
+
+
+def test_a_month_without_gas_still_carries_the_monthly_charge():
+    assert GasRates.from_company_data(ENBRIDGE).bill(0).total == pytest.approx(
+        27.69 * 1.13
+    )
+
+
+def test_totals_prices_many_volumes_as_bill_and_cost_do():
+    rates = GasRates.from_company_data(ENBRIDGE)
+    volumes = [0, 29.5, 30, 419, 404, 354, 252, 158, 69, 51, 54, 58, 91, 174, 316]
+    monthly = rates.monthly_charge * (1 + rates.harmonized_sales_tax)
+
+    assert rates.totals(volumes) == pytest.approx(
+        [rates.bill(volume).total for volume in volumes]
+    )
+    assert rates.totals(volumes) == pytest.approx(
+        [monthly + rates.cost(0, volume) for volume in volumes]
+    )
+
+
+@pytest.mark.parametrize(
+    "volume, band_price",
+    [(0, TIER_1), (29.5, TIER_1), (30, TIER_2), (84, TIER_2), (170, TIER_4)],
+)
+def test_marginal_rate_follows_the_band_the_month_has_reached(volume, band_price):
+    rates = GasRates.from_company_data(ENBRIDGE)
+    flat = 0.007456 + 0.054267 + 0.003385 + 0.103025 - 0.012527 + 0.000145
+
+    assert rates.marginal_rate(volume) == pytest.approx((band_price + flat) * 1.13)
+
+
+def test_marginal_rate_is_the_cost_of_the_next_cubic_metre():
+    rates = GasRates.from_company_data(ENBRIDGE)
+
+    for volume in (10, 40, 100, 300):
+        next_m3 = rates.bill(volume + 1).total - rates.bill(volume).total
+
+        assert rates.marginal_rate(volume) == pytest.approx(next_m3)
+
+
+def test_empty_fields_are_treated_as_zero():
+    """A distributor without tiers delivers by volume for nothing."""
+    rates = GasRates.from_company_data(
+        {"monthly_charge": 20.0, "gas_supply_charge": ""}
+    )
+
+    assert rates.bill(100).total == pytest.approx(20.0)
+
+
+@pytest.mark.parametrize(
+    "month_volume, volume", [(0, 10), (25, 10), (20, 200), (170, 5), (0, 0)]
+)
+def test_cost_is_what_the_months_bill_goes_up_by(month_volume, volume):
+    rates = GasRates.from_company_data(ENBRIDGE)
+
+    assert rates.cost(month_volume, volume) == pytest.approx(
+        rates.bill(month_volume + volume).total - rates.bill(month_volume).total
+    )
+
+
+def test_costs_add_up_to_the_month_however_the_volume_arrives():
+    rates = GasRates.from_company_data(ENBRIDGE)
+    month_volume = total = 0.0
+
+    for volume in [7.5, 31.0, 0.2, 48.3, 90.0, 12.0]:
+        total += rates.cost(month_volume, volume)
+        month_volume += volume
+
+    assert total == pytest.approx(rates.bill(month_volume).total - rates.bill(0).total)
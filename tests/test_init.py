@@ -1,18 +1,50 @@
 """Tests for setup, unload and config entry migration."""
 
+import asyncio
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+
 import aiohttp
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.helpers import entity_registry as er, issue_registry as ir
+from homeassistant.util import dt as dt_util
+import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
+)
 
+from custom_components.ontario_energy_board.common import parse_rates_document
 from custom_components.ontario_energy_board.const import (
+    CONF_CONSUMPTION_ENTITY,
     CONF_ENERGY_COMPANY,
+    CONF_RATE_PLAN,
     CONF_ULO_ENABLED,
     DOMAIN,
     ELECTRICITY_RATES_URL,
+    NATURAL_GAS_RATES_URL,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    REFRESH_RATES_INTERVAL,
+    SECTOR_ELECTRICITY,
+    SNAPSHOT_RETRY_INTERVAL,
+    SNAPSHOT_STORAGE_VERSION,
+    STATE_OFF_PEAK,
+)
+from custom_components.ontario_energy_board.documents import (
+    async_get_rates_documents,
+)
+from custom_components.ontario_energy_board.ontario_holidays import (
+    async_get_holiday_calendar,
 )
 
-from .conftest import ELECTRICITY_COMPANY, build_config_entry
+from .conftest import (
+    ELECTRICITY_COMPANY,
+    NATURAL_GAS_COMPANY,
+    build_config_entry,
+    load_rates_document,
+)
 
 
 async def test_setup_and_unload(hass, init_integration):
@@ -41,6 +73,23 @@ async def test_setup_retries_when_oeb_is_unreachable(
     assert entry.state is ConfigEntryState.SETUP_RETRY
 
 
+async def test_setup_retries_when_oeb_says_not_modified_unasked(
+    hass, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """A 304 to a request without validators carries no document."""
+    aioclient_mock.get(ELECTRICITY_RATES_URL, status=HTTPStatus.NOT_MODIFIED)
+
+    with pytest.raises(aiohttp.ClientError):
+        await async_get_rates_documents(hass).async_get(SECTOR_ELECTRICITY)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
 async def test_two_entries_keep_independent_data(hass, init_integration):
     """Coordinator state must not be shared between entries."""
     electricity = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
@@ -70,8 +119,8 @@ async def test_migration_from_version_1(
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
 
-    assert entry.version == 3
-    assert entry.data[CONF_ULO_ENABLED] is False
+    assert entry.version == 4
+    assert entry.data[CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
     assert entry.state is ConfigEntryState.LOADED
 
 
@@ -185,7 +234,7 @@ async def test_migration_re_keys_entities_without_losing_them(
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
 
-    assert entry.version == 3
+    assert entry.version == 4
     assert entry.unique_id is None
 
     # Same rows, same entity ids.
@@ -222,9 +271,42 @@ async def test_migration_from_version_1_runs_both_steps(
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
 
-    assert entry.version == 3
+    assert entry.version == 4
     assert entry.unique_id is None
-    assert entry.data[CONF_ULO_ENABLED] is False
+    assert entry.data[CONF_RATE_PLAN] == RATE_PLAN_TIME_OF_USE
+    assert entry.state is ConfigEntryState.LOADED
+
+
+async def test_migration_from_version_3_turns_the_switch_into_a_plan(
+    hass, mock_oeb, ontario_timezone, enable_custom_integrations
+):
+    """The Ultra-Low Overnight switch becomes the plan it chose, in both the
+    data and the options, and nothing else changes.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=ELECTRICITY_COMPANY,
+        version=3,
+        data={CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY, CONF_ULO_ENABLED: False},
+        options={
+            CONF_ULO_ENABLED: True,
+            CONF_CONSUMPTION_ENTITY: "sensor.house_meter",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.version == 4
+    assert entry.data == {
+        CONF_ENERGY_COMPANY: ELECTRICITY_COMPANY,
+        CONF_RATE_PLAN: RATE_PLAN_TIME_OF_USE,
+    }
+    assert entry.options == {
+        CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+        CONF_CONSUMPTION_ENTITY: "sensor.house_meter",
+    }
     assert entry.state is ConfigEntryState.LOADED
 
 
@@ -260,3 +342,399 @@ async def test_the_document_is_downloaded_once_when_a_company_is_missing(
     await hass.async_block_till_done()
 
     assert len(mock_oeb.mock_calls) == 1
+
+
+async def test_entries_in_one_sector_share_one_download(
+    hass, init_integration, mock_oeb
+):
+    """Every entry reads its company from the same document."""
+    await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    await init_integration(ELECTRICITY_COMPANY, ulo_enabled=True)
+    await init_integration(
+        "Algoma Power Inc. (RESIDENTIAL R1) [Electricity]", ulo_enabled=False
+    )
+    await init_integration(NATURAL_GAS_COMPANY)
+
+    requested = [str(call[1]) for call in mock_oeb.mock_calls]
+
+    assert sorted(requested) == sorted([ELECTRICITY_RATES_URL, NATURAL_GAS_RATES_URL])
+
+
+async def test_each_entry_gets_its_own_copy_of_the_shared_record(
+    hass, init_integration
+):
+    """Two entries on one company must not be able to disturb each other."""
+    first = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    second = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=True)
+
+    first_data = hass.data[DOMAIN][first.entry_id].company_data
+    second_data = hass.data[DOMAIN][second.entry_id].company_data
+
+    assert first_data == second_data
+    assert first_data is not second_data
+
+
+async def test_entries_share_one_precomputed_holiday_calendar(
+    hass, init_integration, freezer: FrozenDateTimeFactory
+):
+    freezer.move_to("2024-06-15 12:00:00-04:00")
+    electricity = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    gas = await init_integration(NATURAL_GAS_COMPANY)
+
+    calendar = async_get_holiday_calendar(hass)
+    electricity_holidays = hass.data[DOMAIN][electricity.entry_id].ontario_holidays
+
+    assert electricity_holidays is calendar.dates
+    assert hass.data[DOMAIN][gas.entry_id].ontario_holidays is calendar.dates
+    assert isinstance(electricity_holidays, frozenset)
+    assert date(2024, 7, 1) in electricity_holidays
+    assert date(2025, 1, 1) not in electricity_holidays
+
+
+async def test_next_years_holidays_are_built_from_november(
+    hass, init_integration, freezer: FrozenDateTimeFactory
+):
+    """The daily refresh extends the calendar well before New Year."""
+    freezer.move_to("2024-10-31 12:00:00-04:00")
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    assert date(2025, 1, 1) not in coordinator.ontario_holidays
+
+    freezer.tick(REFRESH_RATES_INTERVAL)
+    await coordinator.async_refresh()
+
+    assert date(2024, 12, 25) in coordinator.ontario_holidays
+    assert date(2025, 1, 1) in coordinator.ontario_holidays
+
+
+async def test_december_is_priced_with_its_holidays_in_january(
+    hass, init_integration, freezer: FrozenDateTimeFactory
+):
+    """A reading early in January prices time spent over Christmas."""
+    freezer.move_to("2025-01-02 12:00:00-05:00")
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    christmas = datetime(2024, 12, 25, tzinfo=dt_util.get_default_time_zone())
+
+    cost = coordinator.energy_cost(
+        4.0, christmas + timedelta(hours=10), christmas + timedelta(hours=14)
+    )
+
+    assert date(2024, 12, 25) in coordinator.ontario_holidays
+    # A weekday, but Christmas, so off-peak all day.
+    assert cost == pytest.approx(
+        4.0 * coordinator.electricity_rates.all_in_rates[STATE_OFF_PEAK]
+    )
+
+
+async def test_the_shared_document_expires_with_the_refresh_interval(
+    hass, init_integration, mock_oeb, freezer: FrozenDateTimeFactory
+):
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    freezer.tick(REFRESH_RATES_INTERVAL - timedelta(minutes=1))
+    await coordinator.async_refresh()
+
+    assert len(mock_oeb.mock_calls) == 1
+
+    freezer.tick(timedelta(minutes=1))
+    await coordinator.async_refresh()
+
+    assert len(mock_oeb.mock_calls) == 2
+
+
+async def test_an_unchanged_document_is_revalidated_rather_than_downloaded(
+    hass,
+    aioclient_mock,
+    ontario_timezone,
+    enable_custom_integrations,
+    freezer: FrozenDateTimeFactory,
+):
+    """The OEB documents change a few times a year; most days they have not."""
+    etag = '"5f2a-61b"'
+    last_modified = "Wed, 01 Jul 2026 04:00:00 GMT"
+    aioclient_mock.get(
+        ELECTRICITY_RATES_URL,
+        text=load_rates_document("BillData.xml"),
+        headers={"ETag": etag, "Last-Modified": last_modified},
+    )
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.last_refresh_outcome == "downloaded"
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(ELECTRICITY_RATES_URL, status=HTTPStatus.NOT_MODIFIED)
+
+    freezer.tick(REFRESH_RATES_INTERVAL)
+    await coordinator.async_refresh()
+
+    ((_, _, _, headers),) = aioclient_mock.mock_calls
+    assert headers["If-None-Match"] == etag
+    assert headers["If-Modified-Since"] == last_modified
+
+    # The rates parsed from the first download are still the ones in use.
+    assert coordinator.last_update_success
+    assert coordinator.last_refresh_outcome == "not_modified"
+    assert coordinator.company_data["time_of_use_on_peak_price"] == pytest.approx(0.203)
+
+
+async def test_a_document_without_validators_is_fetched_unconditionally(
+    hass, init_integration, mock_oeb, freezer: FrozenDateTimeFactory
+):
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    freezer.tick(REFRESH_RATES_INTERVAL)
+    await coordinator.async_refresh()
+
+    assert not mock_oeb.mock_calls[-1][3]
+    assert coordinator.last_refresh_outcome == "downloaded"
+
+
+async def test_concurrent_requests_for_a_document_share_one_download(hass, mock_oeb):
+    """At startup every entry, and perhaps the config flow, asks at once."""
+    documents = async_get_rates_documents(hass)
+
+    results = await asyncio.gather(
+        documents.async_get(SECTOR_ELECTRICITY),
+        documents.async_get(SECTOR_ELECTRICITY),
+        documents.async_get(SECTOR_ELECTRICITY),
+    )
+    (first, _), (second, _), (third, _) = results
+
+    assert first is second is third
+    # Each is told how its own request was satisfied, which for all of them
+    # was the one download.
+    assert [outcome for _, outcome in results] == ["downloaded"] * 3
+    assert len(mock_oeb.mock_calls) == 1
+
+    diagnostics = documents.async_diagnostics(SECTOR_ELECTRICITY)
+    assert diagnostics["coalesced"] == 2
+    assert diagnostics["outcomes"] == {"downloaded": 1}
+
+
+async def test_a_request_after_the_shared_one_finishes_is_not_coalesced(
+    hass, mock_oeb, freezer: FrozenDateTimeFactory
+):
+    documents = async_get_rates_documents(hass)
+
+    await documents.async_get(SECTOR_ELECTRICITY)
+    freezer.tick(REFRESH_RATES_INTERVAL)
+    await documents.async_get(SECTOR_ELECTRICITY)
+
+    assert len(mock_oeb.mock_calls) == 2
+    assert documents.async_diagnostics(SECTOR_ELECTRICITY)["coalesced"] == 0
+
+
+def save_snapshot(
+    hass_storage,
+    entry: MockConfigEntry,
+    energy_company: str = ELECTRICITY_COMPANY,
+    etag: str | None = None,
+) -> dict:
+    """Store the rates an earlier run would have saved, and return them."""
+    company_data = parse_rates_document(
+        SECTOR_ELECTRICITY, load_rates_document("BillData.xml")
+    ).get(energy_company)
+    key = f"{DOMAIN}.{entry.entry_id}"
+
+    hass_storage[key] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": key,
+        "data": {
+            "energy_company": energy_company,
+            "company_data": company_data,
+            "validators": {"etag": etag, "last_modified": None},
+        },
+    }
+
+    return company_data
+
+
+async def test_a_snapshot_brings_the_entry_up_without_the_host(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """Restarting while oeb.ca is down starts from the last good rates."""
+    aioclient_mock.get(ELECTRICITY_RATES_URL, exc=aiohttp.ClientError)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    company_data = save_snapshot(hass_storage, entry)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert coordinator.company_data == company_data
+    # The background refresh failed, which leaves the snapshot in use and the
+    # host to be tried again soon.
+    assert len(aioclient_mock.mock_calls) == 1
+    assert coordinator.last_update_success
+    assert coordinator.restored_from_snapshot
+    assert coordinator.update_interval == SNAPSHOT_RETRY_INTERVAL
+
+
+async def test_a_snapshot_for_another_company_is_ignored(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """A reconfigured entry must not start from its previous company's rates."""
+    aioclient_mock.get(ELECTRICITY_RATES_URL, exc=aiohttp.ClientError)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    save_snapshot(
+        hass_storage, entry, "Algoma Power Inc. (RESIDENTIAL R1) [Electricity]"
+    )
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_the_snapshot_is_revalidated_in_the_background(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    etag = '"5f2a-61b"'
+    aioclient_mock.get(ELECTRICITY_RATES_URL, status=HTTPStatus.NOT_MODIFIED)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    company_data = save_snapshot(hass_storage, entry, etag=etag)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    ((_, _, _, headers),) = aioclient_mock.mock_calls
+    assert headers["If-None-Match"] == etag
+
+    assert coordinator.last_refresh_outcome == "not_modified"
+    assert not coordinator.restored_from_snapshot
+    assert coordinator.update_interval == REFRESH_RATES_INTERVAL
+    assert coordinator.company_data == company_data
+
+
+async def test_a_confirmed_snapshot_answers_the_rest_of_the_day(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """The "not modified" refreshes the seeded entry, which then serves."""
+    aioclient_mock.get(ELECTRICITY_RATES_URL, status=HTTPStatus.NOT_MODIFIED)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    company_data = save_snapshot(hass_storage, entry, etag='"5f2a-61b"')
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    documents = async_get_rates_documents(hass)
+    cached, outcome = await documents.async_get(SECTOR_ELECTRICITY, ELECTRICITY_COMPANY)
+
+    assert outcome == "cached"
+    assert cached.document.get(ELECTRICITY_COMPANY) == company_data
+    assert len(aioclient_mock.mock_calls) == 1
+    assert documents.async_diagnostics(SECTOR_ELECTRICITY)["fetched_at"] is not None
+
+
+async def test_seeded_companies_do_not_stand_in_for_the_whole_document(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """The config flow lists every company, so it still downloads them."""
+    aioclient_mock.get(ELECTRICITY_RATES_URL, status=HTTPStatus.NOT_MODIFIED)
+
+    entry = build_config_entry()
+    entry.add_to_hass(hass)
+    save_snapshot(hass_storage, entry, etag='"5f2a-61b"')
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(ELECTRICITY_RATES_URL, text=load_rates_document("BillData.xml"))
+    documents = async_get_rates_documents(hass)
+    cached, outcome = await documents.async_get(SECTOR_ELECTRICITY)
+
+    ((_, _, _, headers),) = aioclient_mock.mock_calls
+    assert not headers
+    assert outcome == "downloaded"
+    assert cached.complete
+    assert len(cached.document) > 1
+
+
+async def test_entries_restarting_together_are_each_confirmed(
+    hass, hass_storage, aioclient_mock, ontario_timezone, enable_custom_integrations
+):
+    """The second entry seeds while the first's "not modified" is still out."""
+    other_company = "Algoma Power Inc. (RESIDENTIAL R1) [Electricity]"
+    answer = asyncio.Event()
+
+    async def not_modified(method, url, data):
+        await answer.wait()
+        return AiohttpClientMockResponse(method, url, status=HTTPStatus.NOT_MODIFIED)
+
+    aioclient_mock.get(ELECTRICITY_RATES_URL, side_effect=not_modified)
+
+    entries = [build_config_entry(), build_config_entry(other_company)]
+    snapshots = []
+
+    for entry, company in zip(
+        entries, (ELECTRICITY_COMPANY, other_company), strict=True
+    ):
+        entry.add_to_hass(hass)
+        snapshots.append(save_snapshot(hass_storage, entry, company, '"5f2a-61b"'))
+        await hass.config_entries.async_setup(entry.entry_id)
+
+    answer.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    for entry, company_data in zip(entries, snapshots, strict=True):
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert coordinator.last_update_success
+        assert coordinator.last_refresh_outcome == "not_modified"
+        assert coordinator.company_data == company_data
+
+    assert not ir.async_get(hass).issues
+    cached, outcome = await async_get_rates_documents(hass).async_get(
+        SECTOR_ELECTRICITY, ELECTRICITY_COMPANY
+    )
+    assert outcome == "cached"
+    assert set(cached.document.companies) == {ELECTRICITY_COMPANY, other_company}
+
+
+async def test_a_good_refresh_is_saved_for_the_next_start(
+    hass, hass_storage, init_integration
+):
+    entry = await init_integration()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    snapshot = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+
+    assert snapshot["energy_company"] == ELECTRICITY_COMPANY
+    assert snapshot["company_data"] == coordinator.company_data
+
+
+async def test_removing_an_entry_deletes_its_snapshot(
+    hass, hass_storage, init_integration
+):
+    entry = await init_integration()
+    key = f"{DOMAIN}.{entry.entry_id}"
+    assert key in hass_storage
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert key not in hass_storage
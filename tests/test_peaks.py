@@ -5,7 +5,7 @@ timezone-aware datetime, so every case is a plain function call. All moments are
 built in America/Toronto, which is what the sensor localises to in production.
 """
 
-from datetime import date, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from zoneinfo import ZoneInfo
 
 from holidays import country_holidays
@@ -24,9 +24,14 @@ from custom_components.ontario_energy_board.const import (
     STATE_ULO_OVERNIGHT,
 )
 from custom_components.ontario_energy_board.peaks import (
+    PEAK_STATES,
     active_peak,
+    active_peaks,
+    classify_peaks,
     is_summer,
     next_peak_change,
+    next_season_change,
+    peak_spans,
     tou_active_peak,
     ulo_active_peak,
 )
@@ -126,6 +131,25 @@ def test_is_summer(moment, expected):
     assert is_summer(moment) is expected
 
 
+@pytest.mark.parametrize(
+    "moment, expected",
+    [
+        (at(date(2024, 1, 15), 12), at(date(2024, 5, 1), 0)),
+        (at(date(2024, 4, 30), 23), at(date(2024, 5, 1), 0)),
+        # At the change itself, the one after it is next.
+        (at(date(2024, 5, 1), 0), at(date(2024, 11, 1), 0)),
+        (at(date(2024, 10, 31), 23), at(date(2024, 11, 1), 0)),
+        (at(date(2024, 11, 1), 0), at(date(2025, 5, 1), 0)),
+        (at(date(2024, 12, 31), 23), at(date(2025, 5, 1), 0)),
+    ],
+)
+def test_next_season_change(moment, expected):
+    change = next_season_change(moment)
+
+    assert change == expected
+    assert is_summer(change) is not is_summer(moment)
+
+
 @pytest.mark.parametrize("day, hours, holidays, expected", TIME_OF_USE_SCENARIOS)
 def test_tou_active_peak(day, hours, holidays, expected):
     for hour in hours:
@@ -190,6 +214,16 @@ def test_ulo_overnight_wins_over_holiday():
     assert ulo_active_peak(at(CHRISTMAS, 2), [CHRISTMAS]) == STATE_ULO_OVERNIGHT
 
 
+def test_the_same_date_is_classified_against_each_holiday_calendar():
+    """Nothing about a date is carried from one call to the next."""
+    with_christmas = [CHRISTMAS]
+    without = []
+
+    for _ in range(2):
+        assert tou_active_peak(at(CHRISTMAS, 12), with_christmas) == STATE_OFF_PEAK
+        assert tou_active_peak(at(CHRISTMAS, 12), without) == STATE_MID_PEAK
+
+
 def test_tou_boundaries_are_half_open():
     """Boundary hours belong to the period that starts on them."""
     weekday = date(2024, 1, 15)  # A Monday in winter
@@ -368,3 +402,252 @@ def test_next_peak_is_always_found_within_the_horizon():
                 ulo_enabled=False,
             )
             assert change is not None, f"Jan {day} {hour}:00"
+
+
+def _probe_next_peak_change(moment, holidays, *, ulo_enabled):
+    """The hour-by-hour search next_peak_change replaced, as a reference."""
+    current = active_peak(
+        moment, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=ulo_enabled
+    )
+    probe = moment.replace(minute=0, second=0, microsecond=0)
+
+    for _ in range(8 * 24):
+        probe = (probe.astimezone(UTC) + timedelta(hours=1)).astimezone(ONTARIO)
+        upcoming = active_peak(
+            probe, holidays, energy_sector=SECTOR_ELECTRICITY, ulo_enabled=ulo_enabled
+        )
+
+        if upcoming != current:
+            return probe, upcoming
+
+    return None
+
+
+@pytest.mark.parametrize("ulo_enabled", [False, True])
+def test_next_peak_change_agrees_with_probing_every_hour(ulo_enabled):
+    """Across a whole year of real holidays, both daylight saving changes and
+    every long weekend, the schedule walk finds what probing hour by hour does.
+    """
+    ontario_holidays = country_holidays(
+        "CA", subdiv="ON", observed=True, categories={"public", "optional"}
+    )
+    moment = datetime(2024, 1, 1, 0, 20, tzinfo=ONTARIO).astimezone(UTC)
+
+    while moment.year == 2024:
+        local = moment.astimezone(ONTARIO)
+
+        assert next_peak_change(
+            local,
+            ontario_holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=ulo_enabled,
+        ) == _probe_next_peak_change(
+            local, ontario_holidays, ulo_enabled=ulo_enabled
+        ), local
+
+        moment += timedelta(hours=1)
+
+
+def test_peak_spans_within_one_period_is_one_span():
+    spans = peak_spans(
+        at(date(2024, 1, 15), 8),
+        at(date(2024, 1, 15), 9).replace(minute=30),
+        [],
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=False,
+    )
+
+    assert spans == [(STATE_ON_PEAK, 90 * 60)]
+
+
+def test_peak_spans_splits_at_each_change():
+    """A winter weekday's on-peak runs 07:00 to 11:00, then mid-peak."""
+    spans = peak_spans(
+        at(date(2024, 1, 15), 6).replace(minute=30),
+        at(date(2024, 1, 15), 11).replace(minute=15),
+        [],
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=False,
+    )
+
+    assert spans == [
+        (STATE_OFF_PEAK, 30 * 60),
+        (STATE_ON_PEAK, 4 * 60 * 60),
+        (STATE_MID_PEAK, 15 * 60),
+    ]
+
+
+def test_peak_spans_counts_real_seconds_across_daylight_saving():
+    """The night the clocks go forward, midnight to 03:00 is two hours long."""
+    spans = peak_spans(
+        at(date(2024, 3, 10), 0),
+        at(date(2024, 3, 10), 3),
+        [],
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=True,
+    )
+
+    assert spans == [(STATE_ULO_OVERNIGHT, 2 * 60 * 60)]
+
+
+def test_peak_spans_for_natural_gas_is_one_span():
+    spans = peak_spans(
+        at(date(2024, 1, 15), 0),
+        at(date(2024, 1, 17), 0),
+        [],
+        energy_sector=SECTOR_NATURAL_GAS,
+        ulo_enabled=False,
+    )
+
+    assert spans == [(STATE_NO_PEAK, 2 * 24 * 60 * 60)]
+
+
+def test_peak_spans_of_nothing_is_empty_time():
+    moment = at(date(2024, 1, 15), 8)
+
+    assert peak_spans(
+        moment,
+        moment - timedelta(minutes=5),
+        [],
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=False,
+    ) == [(STATE_ON_PEAK, 0.0)]
+
+
+@pytest.mark.parametrize("ulo_enabled", [False, True])
+def test_active_peaks_agrees_with_active_peak(ulo_enabled):
+    """Resolving each date once classifies every hour of a year the same."""
+    ontario_holidays = country_holidays(
+        "CA", subdiv="ON", years=2024, observed=True, categories={"public", "optional"}
+    )
+    moments = [
+        datetime.fromtimestamp(instant, ONTARIO)
+        for instant in range(
+            int(datetime(2024, 1, 1, tzinfo=ONTARIO).timestamp()),
+            int(datetime(2025, 1, 1, tzinfo=ONTARIO).timestamp()),
+            60 * 60,
+        )
+    ]
+
+    assert active_peaks(
+        moments,
+        ontario_holidays,
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=ulo_enabled,
+    ) == [
+        active_peak(
+            moment,
+            ontario_holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=ulo_enabled,
+        )
+        for moment in moments
+    ]
+
+
+def test_active_peaks_for_natural_gas_is_all_no_peak():
+    moments = [at(date(2024, 1, 15), hour) for hour in range(24)]
+
+    assert (
+        active_peaks(moments, [], energy_sector=SECTOR_NATURAL_GAS, ulo_enabled=False)
+        == [STATE_NO_PEAK] * 24
+    )
+
+
+def _every_quarter_hour(first_year, last_year):
+    """Every 15 minutes across whole years, as UTC epoch seconds."""
+    start = datetime(first_year, 1, 1, tzinfo=ONTARIO).timestamp()
+    end = datetime(last_year + 1, 1, 1, tzinfo=ONTARIO).timestamp()
+
+    return range(int(start), int(end), 15 * 60)
+
+
+@pytest.mark.parametrize("ulo_enabled", [False, True])
+def test_classify_peaks_agrees_with_active_peak(ulo_enabled):
+    """Across three years of real holidays and six daylight saving changes,
+    bulk classification matches active_peak on every instant.
+    """
+    np = pytest.importorskip("numpy")
+    ontario_holidays = country_holidays(
+        "CA", subdiv="ON", observed=True, categories={"public", "optional"}
+    )
+    instants = _every_quarter_hour(2023, 2025)
+
+    codes = classify_peaks(
+        np.array(instants),
+        ontario_holidays,
+        zone=ONTARIO,
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=ulo_enabled,
+    )
+
+    assert len(codes) == len(instants)
+    for instant, code in zip(instants, codes, strict=True):
+        moment = datetime.fromtimestamp(instant, ONTARIO)
+        expected = active_peak(
+            moment,
+            ontario_holidays,
+            energy_sector=SECTOR_ELECTRICITY,
+            ulo_enabled=ulo_enabled,
+        )
+
+        assert PEAK_STATES[code] == expected, moment
+
+
+def test_classify_peaks_accepts_datetime64():
+    """datetime64 instants, at any resolution, classify as epoch seconds do."""
+    np = pytest.importorskip("numpy")
+    seconds = np.array(_every_quarter_hour(2024, 2024)) + 7
+    expected = classify_peaks(
+        seconds,
+        [CANADA_DAY],
+        zone=ONTARIO,
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=False,
+    )
+
+    for unit in ("s", "ms", "ns"):
+        instants = seconds.astype("datetime64[s]").astype(f"datetime64[{unit}]")
+
+        assert np.array_equal(
+            classify_peaks(
+                instants,
+                [CANADA_DAY],
+                zone=ONTARIO,
+                energy_sector=SECTOR_ELECTRICITY,
+                ulo_enabled=False,
+            ),
+            expected,
+        )
+
+
+def test_classify_peaks_keeps_the_shape_of_its_input():
+    np = pytest.importorskip("numpy")
+    instants = np.array(_every_quarter_hour(2024, 2024)[: 96 * 7]).reshape(7, 96)
+
+    codes = classify_peaks(
+        instants,
+        [],
+        zone=ONTARIO,
+        energy_sector=SECTOR_ELECTRICITY,
+        ulo_enabled=True,
+    )
+
+    assert codes.shape == (7, 96)
+    assert PEAK_STATES[codes[0, 0]] == STATE_ULO_OVERNIGHT
+
+
+@pytest.mark.parametrize("instants", [[], [1_700_000_000, 1_800_000_000]])
+def test_classify_peaks_for_natural_gas_is_all_no_peak(instants):
+    np = pytest.importorskip("numpy")
+
+    codes = classify_peaks(
+        instants,
+        [],
+        zone=ONTARIO,
+        energy_sector=SECTOR_NATURAL_GAS,
+        ulo_enabled=False,
+    )
+
+    assert codes.shape == (len(instants),)
+    assert np.all(codes == PEAK_STATES.index(STATE_NO_PEAK))
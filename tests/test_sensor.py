@@ -1,24 +1,40 @@
 """End-to-end tests for the sensor entities, driven through Home Assistant."""
 
 from datetime import datetime, timedelta
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 from freezegun import freeze_time
+from homeassistant.core import State
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity_component import async_update_entity
 from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.util import dt as dt_util
 import pytest
-from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
 
+from custom_components.ontario_energy_board import advisor, peaks
 from custom_components.ontario_energy_board.const import (
-    CONF_ULO_ENABLED,
+    CONF_CIRCUIT_ENTITIES,
+    CONF_CONSUMPTION_ENTITY,
+    CONF_RATE_PLAN,
     DOMAIN,
     ELECTRICITY_RATE_UNIT_OF_MEASURE,
     NATURAL_GAS_RATE_UNIT_OF_MEASURE,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    REFRESH_RATES_INTERVAL,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
     STATE_MID_PEAK,
     STATE_OFF_PEAK,
     STATE_ON_PEAK,
+    STATE_ULO_MID_PEAK,
     STATE_ULO_ON_PEAK,
     STATE_ULO_OVERNIGHT,
     TOU_PEAK_OPTIONS,
@@ -211,12 +227,12 @@ async def test_utc_instant_is_interpreted_in_ontario_time(hass, init_integration
 
 
 async def test_period_rates_are_enabled_diagnostics(hass, init_integration):
-    """Both plans' rates are published, grouped as diagnostics.
+    """Every plan's rates are published, grouped as diagnostics.
 
     entity_registry_enabled_default only applies the first time an entity is
     registered, so promoting whichever plan is configured could not survive a
     plan changed later from the options: the newly relevant rates would stay
-    disabled. Publishing both, always enabled, sidesteps that and lets the two
+    disabled. Publishing them all, always enabled, sidesteps that and lets the
     plans be compared.
     """
     with freeze_time(ontario_moment(2024, 1, 15, 8)):
@@ -241,6 +257,8 @@ async def test_period_rates_are_enabled_diagnostics(hass, init_integration):
         f"{ELECTRICITY}_ulo_weekend_off_peak_rate",
         f"{ELECTRICITY}_ulo_mid_peak_rate",
         f"{ELECTRICITY}_ulo_on_peak_rate",
+        f"{ELECTRICITY}_lower_tier_price",
+        f"{ELECTRICITY}_higher_tier_price",
     }
 
     for key in ("on_peak_rate", "ulo_overnight_rate"):
@@ -268,7 +286,7 @@ async def test_changing_the_rate_plan_takes_effect(hass, init_integration):
 
         result = await hass.config_entries.options.async_init(entry.entry_id)
         await hass.config_entries.options.async_configure(
-            result["flow_id"], {CONF_ULO_ENABLED: True}
+            result["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT}
         )
         await hass.async_block_till_done()
 
@@ -290,7 +308,7 @@ async def test_changing_the_rate_plan_keeps_the_entities(hass, init_integration)
 
         result = await hass.config_entries.options.async_init(entry.entry_id)
         await hass.config_entries.options.async_configure(
-            result["flow_id"], {CONF_ULO_ENABLED: True}
+            result["flow_id"], {CONF_RATE_PLAN: RATE_PLAN_ULTRA_LOW_OVERNIGHT}
         )
         await hass.async_block_till_done()
 
@@ -360,21 +378,32 @@ def test_every_sensor_has_a_translated_name():
     translated = set(strings["entity"]["sensor"])
 
     class _Coordinator:
-        def __init__(self, energy_sector, ulo_enabled):
+        def __init__(self, energy_sector, rate_plan):
             self.energy_sector = energy_sector
-            self.ulo_enabled = ulo_enabled
+            self.rate_plan = rate_plan
 
     described = {
         description.translation_key
-        for energy_sector, ulo_enabled in (
-            ("electricity", False),
-            ("electricity", True),
-            ("natural_gas", False),
+        for energy_sector, rate_plan in (
+            ("electricity", RATE_PLAN_TIME_OF_USE),
+            ("electricity", RATE_PLAN_ULTRA_LOW_OVERNIGHT),
+            ("electricity", RATE_PLAN_TIERED),
+            ("natural_gas", RATE_PLAN_TIME_OF_USE),
         )
         for description in sensor_module.descriptions_for(
-            _Coordinator(energy_sector, ulo_enabled)
+            _Coordinator(energy_sector, rate_plan)
         )
     }
+    described.update(
+        description.translation_key
+        for description in (
+            *sensor_module.MONTH_TO_DATE_TIERED,
+            sensor_module.CURRENT_ALL_IN_RATE_NATURAL_GAS,
+            sensor_module.ENERGY_COST,
+            sensor_module.CHEAPEST_RATE_PLAN,
+            *sensor_module.PLAN_COMPARISON_SENSORS,
+        )
+    )
 
     assert described, "no descriptions were collected"
     assert described <= translated, f"untranslated: {sorted(described - translated)}"
@@ -640,6 +669,86 @@ async def test_the_peak_still_follows_the_clock_without_refetching(
     assert len(mock_oeb.mock_calls) == 1
 
 
+async def test_the_peak_changes_on_the_exact_instant(hass, init_integration):
+    """Entities wake at the change itself, not on the next minute after it."""
+    start = ontario_moment(2024, 1, 15, 10, 30)
+
+    with freeze_time(start) as frozen:
+        await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+
+        assert hass.states.get(f"{ELECTRICITY}_active_peak").state == STATE_ON_PEAK
+
+        # 11:00 is where winter on-peak becomes mid-peak; then 17:00 back again.
+        for change, expected, following in (
+            (
+                ontario_moment(2024, 1, 15, 11),
+                STATE_MID_PEAK,
+                ontario_moment(2024, 1, 15, 17),
+            ),
+            (
+                ontario_moment(2024, 1, 15, 17),
+                STATE_ON_PEAK,
+                ontario_moment(2024, 1, 15, 19),
+            ),
+        ):
+            frozen.move_to(change - timedelta(seconds=1))
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+
+            assert hass.states.get(f"{ELECTRICITY}_active_peak").state != expected
+
+            frozen.move_to(change)
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+
+            assert hass.states.get(f"{ELECTRICITY}_active_peak").state == expected
+            # Re-armed for the change after this one.
+            assert (
+                hass.states.get(f"{ELECTRICITY}_next_peak_starts").state
+                == dt_util.as_utc(following).isoformat()
+            )
+
+
+async def test_every_sensor_shares_one_computation_per_change(hass, init_integration):
+    """A peak change is worked out once for the entry, not once per sensor."""
+    start = ontario_moment(2024, 1, 15, 10, 30)
+
+    with freeze_time(start) as frozen:
+        await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+
+        with patch.object(
+            peaks, "next_peak_change", wraps=peaks.next_peak_change
+        ) as next_peak_change:
+            frozen.move_to(ontario_moment(2024, 1, 15, 11))
+            async_fire_time_changed(hass, dt_util.utcnow())
+            await hass.async_block_till_done()
+
+    assert next_peak_change.call_count == 1
+    assert hass.states.get(f"{ELECTRICITY}_active_peak").state == STATE_MID_PEAK
+    assert hass.states.get(f"{ELECTRICITY}_next_peak").state == STATE_ON_PEAK
+    assert float(hass.states.get(f"{ELECTRICITY}_current_rate").state) == pytest.approx(
+        0.157
+    )
+    assert float(
+        hass.states.get(f"{ELECTRICITY}_next_peak_rate").state
+    ) == pytest.approx(0.203)
+
+
+async def test_the_season_changes_at_midnight(hass, init_integration):
+    start = ontario_moment(2024, 4, 30, 23, 59)
+
+    with freeze_time(start) as frozen:
+        await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+
+        assert hass.states.get(f"{ELECTRICITY}_season").state == "winter"
+
+        frozen.move_to(ontario_moment(2024, 5, 1, 0))
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+
+        assert hass.states.get(f"{ELECTRICITY}_season").state == "summer"
+
+
 async def test_static_values_are_not_re_rendered_on_the_timer(
     hass, init_integration, enable_all_entities
 ):
@@ -650,5 +759,642 @@ async def test_static_values_are_not_re_rendered_on_the_timer(
     platforms = [p for p in async_get_platforms(hass, DOMAIN) if p.domain == "sensor"]
     entities = [e for p in platforms for e in p.entities.values()]
 
-    # Nothing polls any more; the clock-derived values use a timer instead.
+    # Nothing polls any more; the clock-derived values use timers instead.
     assert not any(e.should_poll for e in entities)
+
+
+def _last_reported(hass):
+    return {state.entity_id: state.last_reported for state in hass.states.async_all()}
+
+
+async def test_a_refresh_with_the_same_rates_writes_nothing(
+    hass, init_integration, enable_all_entities, freezer
+):
+    """The daily refresh usually brings back the record it already had."""
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    before = _last_reported(hass)
+
+    freezer.tick(REFRESH_RATES_INTERVAL)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    after = _last_reported(hass)
+    written = {
+        entity_id for entity_id in after if after[entity_id] != before[entity_id]
+    }
+
+    assert coordinator.last_refresh_outcome == "downloaded"
+    # A day on, the next peak starts a day later; nothing else has moved.
+    assert written == {f"{ELECTRICITY}_next_peak_starts"}
+
+
+async def test_entities_only_write_values_that_changed(
+    hass, init_integration, enable_all_entities, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    entry = await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    before = _last_reported(hass)
+    # Otherwise a write would report the same instant as the one before it.
+    freezer.tick(timedelta(seconds=1))
+
+    coordinator.async_set_updated_data(
+        {**coordinator.data, "time_of_use_on_peak_price": 0.25}
+    )
+    await hass.async_block_till_done()
+
+    after = _last_reported(hass)
+    written = {
+        entity_id for entity_id in after if after[entity_id] != before[entity_id]
+    }
+
+    assert written == {
+        f"{ELECTRICITY}_current_rate",
+        f"{ELECTRICITY}_current_all_in_rate",
+        f"{ELECTRICITY}_on_peak_rate",
+    }
+
+
+METER = "sensor.house_meter"
+COSTED = {CONF_CONSUMPTION_ENTITY: METER}
+
+
+def _read_meter(hass, kwh, unit="kWh"):
+    hass.states.async_set(METER, str(kwh), {"unit_of_measurement": unit})
+
+
+def _energy_cost(hass) -> float:
+    return float(hass.states.get(f"{ELECTRICITY}_energy_cost").state)
+
+
+async def test_energy_cost_needs_a_consumption_sensor(hass, init_integration):
+    await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+
+    assert hass.states.get(f"{ELECTRICITY}_energy_cost") is None
+
+
+async def test_energy_cost_prices_each_increase_at_the_all_in_rate(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    state = hass.states.get(f"{ELECTRICITY}_energy_cost")
+    assert float(state.state) == 0
+    assert state.attributes["device_class"] == "monetary"
+    assert state.attributes["state_class"] == "total"
+    assert state.attributes["unit_of_measurement"] == "CAD"
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    _read_meter(hass, 1001.5)
+    await hass.async_block_till_done()
+
+    assert _energy_cost(hass) == pytest.approx(1.5 * all_in_rates[STATE_ON_PEAK])
+
+
+async def test_energy_cost_splits_an_increase_across_a_peak_change(
+    hass, init_integration, freezer
+):
+    """On a winter weekday the on-peak ends at 11:00, and mid-peak begins."""
+    freezer.move_to(ontario_moment(2024, 1, 15, 10, 30))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 11, 30))
+    _read_meter(hass, 1002)
+    await hass.async_block_till_done()
+
+    assert _energy_cost(hass) == pytest.approx(
+        all_in_rates[STATE_ON_PEAK] + all_in_rates[STATE_MID_PEAK]
+    )
+
+
+async def test_energy_cost_converts_the_meters_unit(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    _read_meter(hass, 1_000_000, "Wh")
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    _read_meter(hass, 1_002_000, "Wh")
+    await hass.async_block_till_done()
+
+    assert _energy_cost(hass) == pytest.approx(2 * all_in_rates[STATE_ON_PEAK])
+
+
+async def test_energy_cost_counts_a_reset_meter_from_zero(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    _read_meter(hass, 3)
+    await hass.async_block_till_done()
+
+    assert _energy_cost(hass) == pytest.approx(3 * all_in_rates[STATE_ON_PEAK])
+
+
+async def test_energy_cost_ignores_an_unavailable_meter(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    hass.states.async_set(METER, "unavailable")
+    await hass.async_block_till_done()
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    _read_meter(hass, 1001)
+    await hass.async_block_till_done()
+
+    assert _energy_cost(hass) == pytest.approx(all_in_rates[STATE_ON_PEAK])
+
+
+async def test_energy_cost_carries_on_after_a_restart(hass, init_integration, freezer):
+    """Both the total and the last reading survive, so the meter's increase
+    while Home Assistant was down is priced from where it was left.
+    """
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(f"{ELECTRICITY}_energy_cost", "12.5"),
+                {
+                    "cost": 12.5,
+                    "reading": 1000.0,
+                    "read_at": ontario_moment(2024, 1, 15, 8).isoformat(),
+                },
+            )
+        ],
+    )
+    _read_meter(hass, 1001)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    assert _energy_cost(hass) == pytest.approx(12.5 + all_in_rates[STATE_ON_PEAK])
+
+
+async def test_natural_gas_has_no_circuits(hass, init_integration):
+    await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CIRCUIT_ENTITIES: [METER]}
+    )
+
+    assert hass.states.get(f"{GAS}_energy_cost") is None
+    assert hass.states.get(f"{GAS}_house_meter_cost") is None
+
+
+CIRCUITS = {
+    "sensor.kitchen_energy": "Kitchen",
+    "sensor.furnace_energy": "Furnace",
+    "sensor.dryer_energy": "Dryer",
+}
+
+
+def _read_circuit(hass, entity_id, kwh):
+    hass.states.async_set(
+        entity_id,
+        str(kwh),
+        {"unit_of_measurement": "kWh", "friendly_name": CIRCUITS[entity_id]},
+    )
+
+
+async def test_each_circuit_gets_a_cost_sensor_named_after_it(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    for entity_id in CIRCUITS:
+        _read_circuit(hass, entity_id, 100)
+    entry = await init_integration(
+        ELECTRICITY_COMPANY, options={CONF_CIRCUIT_ENTITIES: list(CIRCUITS)}
+    )
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    for used, entity_id in enumerate(CIRCUITS, start=1):
+        _read_circuit(hass, entity_id, 100 + used)
+    await hass.async_block_till_done()
+
+    for used, name in enumerate(("kitchen", "furnace", "dryer"), start=1):
+        state = hass.states.get(f"{ELECTRICITY}_{name}_cost")
+
+        assert float(state.state) == pytest.approx(used * all_in_rates[STATE_ON_PEAK])
+        assert state.attributes["consumption_entity"] == f"sensor.{name}_energy"
+
+
+async def test_circuits_are_followed_by_one_listener(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+
+    with patch(
+        "custom_components.ontario_energy_board.consumption."
+        "async_track_state_change_event"
+    ) as track:
+        await init_integration(
+            ELECTRICITY_COMPANY,
+            options={
+                CONF_CONSUMPTION_ENTITY: METER,
+                CONF_CIRCUIT_ENTITIES: list(CIRCUITS),
+            },
+        )
+
+    track.assert_called_once()
+    assert track.call_args.args[1] == [METER, *CIRCUITS]
+
+
+async def test_a_burst_of_readings_writes_each_cost_once(
+    hass, init_integration, freezer
+):
+    """Readings that arrive in the same pass of the event loop are priced as
+    they come, and each cost sensor is written once for them all.
+    """
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    for entity_id in CIRCUITS:
+        _read_circuit(hass, entity_id, 100)
+    entry = await init_integration(
+        ELECTRICITY_COMPANY, options={CONF_CIRCUIT_ENTITIES: list(CIRCUITS)}
+    )
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+    kitchen = f"{ELECTRICITY}_kitchen_cost"
+    writes = []
+    async_track_state_change_event(hass, kitchen, writes.append)
+
+    freezer.move_to(ontario_moment(2024, 1, 15, 8, 30))
+    for kwh in (101, 102, 103):
+        _read_circuit(hass, "sensor.kitchen_energy", kwh)
+    await hass.async_block_till_done()
+
+    assert len(writes) == 1
+    assert float(hass.states.get(kitchen).state) == pytest.approx(
+        3 * all_in_rates[STATE_ON_PEAK]
+    )
+
+
+GAS_METER = "sensor.gas_meter"
+
+
+def _read_gas_meter(hass, m3):
+    hass.states.async_set(GAS_METER, str(m3), {"unit_of_measurement": "m³"})
+
+
+async def test_gas_cost_follows_the_delivery_bands(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 1, 15, 8))
+    _read_gas_meter(hass, 5000)
+    entry = await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: GAS_METER}
+    )
+    rates = hass.data[DOMAIN][entry.entry_id].gas_rates
+
+    assert float(hass.states.get(f"{GAS}_current_all_in_rate").state) == pytest.approx(
+        rates.marginal_rate(0), abs=1e-4
+    )
+
+    freezer.move_to(ontario_moment(2024, 1, 16, 8))
+    _read_gas_meter(hass, 5020)
+    await hass.async_block_till_done()
+    freezer.move_to(ontario_moment(2024, 1, 20, 8))
+    _read_gas_meter(hass, 5100)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(f"{GAS}_energy_cost").state) == pytest.approx(
+        rates.bill(100).total - rates.bill(0).total
+    )
+    state = hass.states.get(f"{GAS}_current_all_in_rate")
+    assert state.attributes["unit_of_measurement"] == NATURAL_GAS_RATE_UNIT_OF_MEASURE
+    assert float(state.state) == pytest.approx(rates.marginal_rate(100), abs=1e-4)
+    assert rates.marginal_rate(100) != rates.marginal_rate(0)
+
+
+async def test_gas_all_in_rate_drops_back_when_a_month_begins(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 1, 30, 8))
+    _read_gas_meter(hass, 5000)
+    entry = await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: GAS_METER}
+    )
+    rates = hass.data[DOMAIN][entry.entry_id].gas_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 30, 9))
+    _read_gas_meter(hass, 5100)
+    await hass.async_block_till_done()
+
+    freezer.move_to(ontario_moment(2024, 2, 1, 0, 0))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(f"{GAS}_current_all_in_rate").state) == pytest.approx(
+        rates.marginal_rate(0), abs=1e-4
+    )
+
+
+async def test_gas_cost_splits_an_increase_across_the_turn_of_the_month(
+    hass, init_integration, freezer
+):
+    """Half the time, and so half the gas, falls in each month."""
+    freezer.move_to(ontario_moment(2024, 1, 30, 8))
+    _read_gas_meter(hass, 5000)
+    entry = await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: GAS_METER}
+    )
+    rates = hass.data[DOMAIN][entry.entry_id].gas_rates
+
+    freezer.move_to(ontario_moment(2024, 1, 31, 0))
+    _read_gas_meter(hass, 5100)
+    await hass.async_block_till_done()
+    freezer.move_to(ontario_moment(2024, 2, 2, 0))
+    _read_gas_meter(hass, 5200)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(f"{GAS}_energy_cost").state) == pytest.approx(
+        rates.cost(0, 100) + rates.cost(100, 50) + rates.cost(0, 50)
+    )
+
+
+async def test_gas_month_to_date_survives_a_restart(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 1, 20, 8))
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(f"{GAS}_energy_cost", "30.0"),
+                {
+                    "cost": 30.0,
+                    "reading": 5090.0,
+                    "read_at": ontario_moment(2024, 1, 19, 8).isoformat(),
+                    "month": "2024-01-01",
+                    "month_volume": 90.0,
+                },
+            )
+        ],
+    )
+    _read_gas_meter(hass, 5100)
+    entry = await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: GAS_METER}
+    )
+    rates = hass.data[DOMAIN][entry.entry_id].gas_rates
+
+    assert float(hass.states.get(f"{GAS}_energy_cost").state) == pytest.approx(
+        30.0 + rates.cost(90, 10)
+    )
+    assert float(hass.states.get(f"{GAS}_current_all_in_rate").state) == pytest.approx(
+        rates.marginal_rate(100), abs=1e-4
+    )
+
+
+TIERED = {CONF_RATE_PLAN: RATE_PLAN_TIERED, CONF_CONSUMPTION_ENTITY: METER}
+
+
+async def test_tiered_entry_has_no_peaks(hass, init_integration):
+    with freeze_time(ontario_moment(2024, 7, 15, 17)):
+        await init_integration(
+            ELECTRICITY_COMPANY, options={CONF_RATE_PLAN: RATE_PLAN_TIERED}
+        )
+
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, hass.config_entries.async_entries(DOMAIN)[0].entry_id)}
+    )
+    assert device.model == "Electricity · Tiered"
+
+    for key in ("active_peak", "next_peak", "next_peak_starts", "current_rate"):
+        assert hass.states.get(f"{ELECTRICITY}_{key}") is None, key
+
+    # The threshold changes with the season, and the prices are published.
+    assert hass.states.get(f"{ELECTRICITY}_season").state == "summer"
+    assert float(hass.states.get(f"{ELECTRICITY}_lower_tier_price").state) == 0.12
+    assert float(hass.states.get(f"{ELECTRICITY}_higher_tier_price").state) == 0.142
+
+
+async def test_tiered_rate_follows_the_months_consumption(
+    hass, init_integration, freezer
+):
+    """In summer the first 600 kWh of the month are at the lower price."""
+    freezer.move_to(ontario_moment(2024, 7, 1, 8))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=TIERED)
+    rates = hass.data[DOMAIN][entry.entry_id].electricity_rates
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_LOWER_TIER
+    assert float(hass.states.get(f"{ELECTRICITY}_current_rate").state) == 0.12
+
+    freezer.move_to(ontario_moment(2024, 7, 10, 8))
+    _read_meter(hass, 1500)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_LOWER_TIER
+
+    freezer.move_to(ontario_moment(2024, 7, 12, 8))
+    _read_meter(hass, 1700)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_HIGHER_TIER
+    assert float(hass.states.get(f"{ELECTRICITY}_current_rate").state) == 0.142
+    assert float(
+        hass.states.get(f"{ELECTRICITY}_current_all_in_rate").state
+    ) == pytest.approx(rates.all_in_rates[STATE_HIGHER_TIER])
+    # The increase that crossed the threshold is priced partly at each price.
+    assert _energy_cost(hass) == pytest.approx(
+        600 * rates.all_in_rates[STATE_LOWER_TIER]
+        + 100 * rates.all_in_rates[STATE_HIGHER_TIER]
+    )
+
+
+async def test_tier_threshold_rises_in_winter(hass, init_integration, freezer):
+    """The published 600 kWh is the summer threshold; winter allows 1,000."""
+    freezer.move_to(ontario_moment(2024, 1, 2, 8))
+    _read_meter(hass, 1000)
+    await init_integration(ELECTRICITY_COMPANY, options=TIERED)
+
+    freezer.move_to(ontario_moment(2024, 1, 20, 8))
+    _read_meter(hass, 1900)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_LOWER_TIER
+
+    freezer.move_to(ontario_moment(2024, 1, 25, 8))
+    _read_meter(hass, 2000)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_HIGHER_TIER
+
+
+async def test_tier_drops_back_when_a_month_begins(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 7, 30, 8))
+    _read_meter(hass, 1000)
+    await init_integration(ELECTRICITY_COMPANY, options=TIERED)
+
+    freezer.move_to(ontario_moment(2024, 7, 30, 9))
+    _read_meter(hass, 1700)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_HIGHER_TIER
+
+    freezer.move_to(ontario_moment(2024, 8, 1, 0, 0))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_LOWER_TIER
+
+
+async def test_tiered_month_to_date_survives_a_restart(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 7, 20, 8))
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(f"{ELECTRICITY}_energy_cost", "80.0"),
+                {
+                    "cost": 80.0,
+                    "reading": 1590.0,
+                    "read_at": ontario_moment(2024, 7, 19, 8).isoformat(),
+                    "month": "2024-07-01",
+                    "month_volume": 590.0,
+                },
+            )
+        ],
+    )
+    _read_meter(hass, 1610)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=TIERED)
+    rates = hass.data[DOMAIN][entry.entry_id].electricity_rates
+
+    assert _energy_cost(hass) == pytest.approx(
+        80.0
+        + 10 * rates.all_in_rates[STATE_LOWER_TIER]
+        + 10 * rates.all_in_rates[STATE_HIGHER_TIER]
+    )
+    assert hass.states.get(f"{ELECTRICITY}_active_tier").state == STATE_HIGHER_TIER
+
+
+async def test_tiered_entry_has_no_circuits(hass, init_integration):
+    """Circuits are priced by the clock, which the tiered plan does not follow."""
+    await init_integration(
+        ELECTRICITY_COMPANY,
+        options={**TIERED, CONF_CIRCUIT_ENTITIES: list(CIRCUITS)},
+    )
+
+    assert hass.states.get(f"{ELECTRICITY}_energy_cost") is not None
+    assert hass.states.get(f"{ELECTRICITY}_kitchen_cost") is None
+
+
+def _plan_cost(hass, rate_plan) -> float:
+    return float(hass.states.get(f"{ELECTRICITY}_30_day_cost_on_{rate_plan}").state)
+
+
+async def test_plans_are_compared_only_with_a_consumption_sensor(
+    hass, init_integration
+):
+    await init_integration(ELECTRICITY_COMPANY, ulo_enabled=False)
+
+    assert hass.states.get(f"{ELECTRICITY}_cheapest_rate_plan") is None
+    assert hass.states.get(f"{ELECTRICITY}_rate_plan_savings") is None
+
+
+async def test_natural_gas_is_not_compared_across_plans(hass, init_integration):
+    await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: GAS_METER}
+    )
+
+    assert hass.states.get(f"{GAS}_cheapest_rate_plan") is None
+
+
+async def test_each_plan_is_priced_from_the_same_kwh(hass, init_integration, freezer):
+    """An hour of a summer weekday afternoon is on-peak on Time-of-Use but only
+    mid-peak on Ultra-Low Overnight, and the lower tier for the first kWh.
+    """
+    freezer.move_to(ontario_moment(2024, 7, 10, 12))
+    _read_meter(hass, 1000)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    freezer.move_to(ontario_moment(2024, 7, 10, 13))
+    _read_meter(hass, 1010)
+    await hass.async_block_till_done()
+
+    assert _plan_cost(hass, RATE_PLAN_TIME_OF_USE) == pytest.approx(
+        10 * all_in_rates[STATE_ON_PEAK]
+    )
+    assert _plan_cost(hass, RATE_PLAN_ULTRA_LOW_OVERNIGHT) == pytest.approx(
+        10 * all_in_rates[STATE_ULO_MID_PEAK]
+    )
+    assert _plan_cost(hass, RATE_PLAN_TIERED) == pytest.approx(
+        10 * all_in_rates[STATE_LOWER_TIER]
+    )
+    # The comparison does not touch the entry's own running cost.
+    assert _energy_cost(hass) == pytest.approx(10 * all_in_rates[STATE_ON_PEAK])
+
+    costs = {
+        rate_plan: _plan_cost(hass, rate_plan)
+        for rate_plan in (
+            RATE_PLAN_TIME_OF_USE,
+            RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+            RATE_PLAN_TIERED,
+        )
+    }
+    cheapest = min(costs, key=costs.__getitem__)
+    assert hass.states.get(f"{ELECTRICITY}_cheapest_rate_plan").state == cheapest
+    assert float(
+        hass.states.get(f"{ELECTRICITY}_rate_plan_savings").state
+    ) == pytest.approx(costs[RATE_PLAN_TIME_OF_USE] - costs[cheapest])
+
+
+async def test_a_day_drops_out_of_the_comparison_after_30_days(
+    hass, init_integration, freezer
+):
+    freezer.move_to(ontario_moment(2024, 7, 10, 12))
+    _read_meter(hass, 1000)
+    await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+
+    freezer.move_to(ontario_moment(2024, 7, 10, 13))
+    _read_meter(hass, 1010)
+    await hass.async_block_till_done()
+
+    assert _plan_cost(hass, RATE_PLAN_TIME_OF_USE) > 0
+
+    for day in range(1, 31):
+        freezer.move_to(ontario_moment(2024, 7, 10, 0) + timedelta(days=day))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert _plan_cost(hass, RATE_PLAN_TIME_OF_USE) == 0
+
+
+async def test_the_comparison_survives_a_restart(hass, init_integration, freezer):
+    freezer.move_to(ontario_moment(2024, 7, 11, 8))
+    daily = {period: [0.0] * 30 for period in advisor.PERIODS}
+    # Saved yesterday, newest first: 20 kWh on the afternoon of that day.
+    daily[STATE_ON_PEAK][0] = 20.0
+    daily[STATE_ULO_MID_PEAK][0] = 20.0
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(f"{ELECTRICITY}_cheapest_rate_plan", RATE_PLAN_TIERED),
+                {
+                    "cost": 0.0,
+                    "reading": 1020.0,
+                    "read_at": ontario_moment(2024, 7, 10, 13).isoformat(),
+                    "rolling": {
+                        "day": "2024-07-10",
+                        "first_day": "2024-07-10",
+                        "daily": daily,
+                    },
+                },
+            )
+        ],
+    )
+    _read_meter(hass, 1020)
+    entry = await init_integration(ELECTRICITY_COMPANY, options=COSTED)
+    all_in_rates = hass.data[DOMAIN][entry.entry_id].electricity_rates.all_in_rates
+
+    # Yesterday is in the window, which has rolled on to today.
+    assert _plan_cost(hass, RATE_PLAN_TIME_OF_USE) == pytest.approx(
+        20 * all_in_rates[STATE_ON_PEAK]
+    )
@@ -0,0 +1,208 @@
+"""Tests for the compare_plans service, over the recorder's statistics."""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util.unit_conversion import EnergyConverter
+import pytest
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.ontario_energy_board.const import (
+    CONF_CONSUMPTION_ENTITY,
+    DOMAIN,
+    RATE_PLAN_TIERED,
+    RATE_PLAN_TIME_OF_USE,
+    RATE_PLAN_ULTRA_LOW_OVERNIGHT,
+    STATE_HIGHER_TIER,
+    STATE_LOWER_TIER,
+    STATE_MID_PEAK,
+    STATE_OFF_PEAK,
+    STATE_ON_PEAK,
+    STATE_ULO_MID_PEAK,
+    STATE_ULO_OFF_PEAK,
+    STATE_ULO_ON_PEAK,
+    STATE_ULO_OVERNIGHT,
+)
+from custom_components.ontario_energy_board.services import SERVICE_COMPARE_PLANS
+
+from .conftest import ELECTRICITY_COMPANY, NATURAL_GAS_COMPANY
+
+ONTARIO = ZoneInfo("America/Toronto")
+METER = "sensor.house_meter"
+
+
+def _import_hours(hass, start: datetime, hours: int, kwh: float) -> None:
+    """Hourly statistics for a kWh meter using ``kwh`` every hour from
+    ``start``, with an hour of nothing before, so the first change is known.
+    """
+    async_import_statistics(
+        hass,
+        {
+            "mean_type": StatisticMeanType.NONE,
+            "has_sum": True,
+            "name": None,
+            "source": "recorder",
+            "statistic_id": METER,
+            "unit_class": EnergyConverter.UNIT_CLASS,
+            "unit_of_measurement": "kWh",
+        },
+        [
+            {
+                "start": start + timedelta(hours=hour - 1),
+                "state": kwh * hour,
+                "sum": kwh * hour,
+            }
+            for hour in range(hours + 1)
+        ],
+    )
+
+
+async def _compare(hass, entry, start: datetime, end: datetime, **data):
+    return await hass.services.async_call(
+        DOMAIN,
+        SERVICE_COMPARE_PLANS,
+        {
+            "config_entry_id": entry.entry_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            **data,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_recorded_hours_are_billed_on_every_plan(
+    recorder_mock, hass, init_integration
+):
+    """A summer Wednesday at 1 kWh an hour, a 31st of July's month."""
+    entry = await init_integration(
+        ELECTRICITY_COMPANY, options={CONF_CONSUMPTION_ENTITY: METER}
+    )
+    start = datetime(2024, 7, 10, tzinfo=ONTARIO)
+    _import_hours(hass, start, 24, 1.0)
+    await async_wait_recording_done(hass)
+
+    response = await _compare(hass, entry, start, start + timedelta(days=1))
+    rates = hass.data[DOMAIN][entry.entry_id].electricity_rates
+    plans = response["plans"]
+
+    assert response["hours"] == 24
+    assert response["kwh"] == 24
+    assert plans[RATE_PLAN_TIME_OF_USE]["usage"] == {
+        STATE_OFF_PEAK: 12,
+        STATE_MID_PEAK: 6,
+        STATE_ON_PEAK: 6,
+    }
+    assert plans[RATE_PLAN_ULTRA_LOW_OVERNIGHT]["usage"] == {
+        STATE_ULO_OVERNIGHT: 8,
+        STATE_ULO_MID_PEAK: 11,
+        STATE_ULO_ON_PEAK: 5,
+        STATE_ULO_OFF_PEAK: 0,
+    }
+    # A day of July carries a 31st of the month's threshold and fixed charges.
+    assert plans[RATE_PLAN_TIERED]["usage"][STATE_LOWER_TIER] == pytest.approx(
+        600 / 31, abs=1e-3
+    )
+    assert plans[RATE_PLAN_TIERED]["usage"][STATE_HIGHER_TIER] == pytest.approx(
+        24 - 600 / 31, abs=1e-3
+    )
+    assert plans[RATE_PLAN_TIME_OF_USE]["total"] == pytest.approx(
+        rates.bill(
+            {STATE_OFF_PEAK: 12, STATE_MID_PEAK: 6, STATE_ON_PEAK: 6}, months=1 / 31
+        ).total,
+        abs=0.005,
+    )
+    assert response["cheapest"] == min(plans, key=lambda plan: plans[plan]["total"])
+
+
+async def test_a_range_is_billed_a_month_at_a_time(
+    recorder_mock, hass, init_integration
+):
+    """Two days either side of a month's end are two part months."""
+    entry = await init_integration(
+        ELECTRICITY_COMPANY, options={CONF_CONSUMPTION_ENTITY: METER}
+    )
+    start = datetime(2024, 6, 30, tzinfo=ONTARIO)
+    _import_hours(hass, start, 48, 2.0)
+    await async_wait_recording_done(hass)
+
+    response = await _compare(hass, entry, start, start + timedelta(days=2))
+    rates = hass.data[DOMAIN][entry.entry_id].electricity_rates
+    tiered = response["plans"][RATE_PLAN_TIERED]
+
+    assert response["hours"] == 48
+    assert response["kwh"] == 96
+    # A 30th of June's threshold, and a 31st of July's.
+    assert tiered["usage"][STATE_LOWER_TIER] == pytest.approx(
+        600 / 30 + 600 / 31, abs=1e-3
+    )
+    assert tiered["total"] == pytest.approx(
+        rates.tiered_bill(48, months=1 / 30).total
+        + rates.tiered_bill(48, months=1 / 31).total,
+        abs=0.005,
+    )
+
+
+async def test_another_meter_can_be_compared(recorder_mock, hass, init_integration):
+    entry = await init_integration(ELECTRICITY_COMPANY)
+    start = datetime(2024, 7, 10, tzinfo=ONTARIO)
+    _import_hours(hass, start, 24, 1.0)
+    await async_wait_recording_done(hass)
+
+    response = await _compare(
+        hass,
+        entry,
+        start,
+        start + timedelta(days=1),
+        **{CONF_CONSUMPTION_ENTITY: METER},
+    )
+
+    assert response[CONF_CONSUMPTION_ENTITY] == METER
+    assert response["kwh"] == 24
+
+
+async def test_comparing_needs_a_consumption_sensor(
+    recorder_mock, hass, init_integration
+):
+    entry = await init_integration(ELECTRICITY_COMPANY)
+    start = datetime(2024, 7, 10, tzinfo=ONTARIO)
+
+    with pytest.raises(ServiceValidationError) as err:
+        await _compare(hass, entry, start, start + timedelta(days=1))
+
+    assert err.value.translation_key == "no_consumption_entity"
+    assert str(err.value) == (
+        f"{entry.title} has no consumption sensor; name one to compare"
+    )
+
+
+async def test_natural_gas_has_no_plans_to_compare(
+    recorder_mock, hass, init_integration
+):
+    entry = await init_integration(
+        NATURAL_GAS_COMPANY, options={CONF_CONSUMPTION_ENTITY: METER}
+    )
+    start = datetime(2024, 7, 10, tzinfo=ONTARIO)
+
+    with pytest.raises(ServiceValidationError) as err:
+        await _compare(hass, entry, start, start + timedelta(days=1))
+
+    assert err.value.translation_key == "no_rate_plans"
+
+
+async def test_a_range_must_end_after_it_starts(recorder_mock, hass, init_integration):
+    entry = await init_integration(
+        ELECTRICITY_COMPANY, options={CONF_CONSUMPTION_ENTITY: METER}
+    )
+    start = datetime(2024, 7, 10, tzinfo=ONTARIO)
+
+    with pytest.raises(ServiceValidationError) as err:
+        await _compare(hass, entry, start, start - timedelta(days=1))
+
+    assert err.value.translation_key == "invalid_range"